@@ -1,4 +1,5 @@
 import { motion } from 'framer-motion'
+import ResponsiveImage from './ResponsiveImage'
 import '../styles/ProjectCard.css'
 
 const ProjectCard = ({ project, isFrench }) => {
@@ -16,14 +17,16 @@ const ProjectCard = ({ project, isFrench }) => {
     >
       <div className="project-image-container">
         {(project.image_url || project.image) ? (
-          <img 
-            src={project.image_url || project.image} 
-            alt={title} 
-            className="project-image" 
+          <ResponsiveImage
+            src={project.image_url || project.image}
+            variants={project.image_variants}
+            sizes="(max-width: 768px) 100vw, 400px"
+            alt={title}
+            className="project-image"
             onError={(e) => {
               // Si l'image ne charge pas, afficher le placeholder
               e.target.style.display = 'none'
-              e.target.nextSibling.style.display = 'flex'
+              if (e.target.nextSibling) e.target.nextSibling.style.display = 'flex'
             }}
           />
         ) : null}
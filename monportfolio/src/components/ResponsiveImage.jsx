@@ -0,0 +1,26 @@
+// Image responsive : sources AVIF / WebP (srcset) quand l'API fournit des variantes,
+// l'image originale sinon
+const FORMATS = ['avif', 'webp']
+
+const ResponsiveImage = ({ src, variants, sizes = '100vw', alt, ...props }) => {
+  const srcset = variants?.srcset || {}
+
+  return (
+    <picture style={{ display: 'contents' }}>
+      {FORMATS.filter((format) => srcset[format]).map((format) => (
+        <source key={format} type={`image/${format}`} srcSet={srcset[format]} sizes={sizes} />
+      ))}
+      <img
+        src={src}
+        alt={alt}
+        width={variants?.width}
+        height={variants?.height}
+        loading="lazy"
+        decoding="async"
+        {...props}
+      />
+    </picture>
+  )
+}
+
+export default ResponsiveImage
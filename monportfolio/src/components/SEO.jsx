@@ -1,6 +1,25 @@
 import { useEffect } from 'react'
+import { useLanguage } from '../hooks/useLanguage'
+import { portfolioAPI } from '../services/api'
+
+// Données structurées JSON-LD, chargées une fois par langue (mises en cache côté API)
+const structuredDataRequests = {}
+
+const loadStructuredData = (language) => {
+  if (!structuredDataRequests[language]) {
+    structuredDataRequests[language] = portfolioAPI.getStructuredData(language)
+      .then((response) => response.data)
+      .catch(() => {
+        delete structuredDataRequests[language]
+        return null
+      })
+  }
+  return structuredDataRequests[language]
+}
 
 const SEO = ({ title, description, keywords }) => {
+  const { language } = useLanguage()
+
   useEffect(() => {
     // Mettre à jour le titre
     if (title) {
@@ -30,6 +49,24 @@ const SEO = ({ title, description, keywords }) => {
     }
   }, [title, description, keywords])
 
+  useEffect(() => {
+    let active = true
+    loadStructuredData(language).then((data) => {
+      if (!active || !data) return
+      let script = document.getElementById('structured-data')
+      if (!script) {
+        script = document.createElement('script')
+        script.setAttribute('type', 'application/ld+json')
+        script.setAttribute('id', 'structured-data')
+        document.head.appendChild(script)
+      }
+      script.textContent = JSON.stringify(data)
+    })
+    return () => {
+      active = false
+    }
+  }, [language])
+
   return null
 }
 
@@ -5,6 +5,7 @@ import { Calendar, ArrowRight } from 'lucide-react'
 import { useLanguage } from '../hooks/useLanguage'
 import { portfolioAPI } from '../services/api'
 import LoadingSpinner from '../components/LoadingSpinner'
+import ResponsiveImage from '../components/ResponsiveImage'
 import SEO from '../components/SEO'
 import '../styles/Blog.css'
 
@@ -80,8 +81,10 @@ const Blog = () => {
                     >
                       <div className="blog-main-image">
                         {article.featured_image_url ? (
-                          <img
+                          <ResponsiveImage
                             src={article.featured_image_url}
+                            variants={article.featured_image_variants}
+                            sizes="(max-width: 768px) 100vw, 60vw"
                             alt={isFrench ? article.title_fr : article.title_en}
                           />
                         ) : (
@@ -133,8 +136,10 @@ const Blog = () => {
                   >
                     <div className="blog-sidebar-image">
                       {article.featured_image_url ? (
-                        <img
+                        <ResponsiveImage
                           src={article.featured_image_url}
+                          variants={article.featured_image_variants}
+                          sizes="100px"
                           alt={isFrench ? article.title_fr : article.title_en}
                         />
                       ) : (
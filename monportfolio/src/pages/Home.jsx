@@ -6,6 +6,7 @@ import { useLanguage } from '../hooks/useLanguage'
 import { portfolioAPI } from '../services/api'
 import LoadingSpinner from '../components/LoadingSpinner'
 import ProjectCard from '../components/ProjectCard'
+import ResponsiveImage from '../components/ResponsiveImage'
 import SEO from '../components/SEO'
 import '../styles/Home.css'
 
@@ -18,19 +19,13 @@ const Home = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [settingsRes, projectsRes] = await Promise.all([
-          portfolioAPI.getSettings().catch((err) => {
-            console.warn('Settings API error:', err.response?.status || err.message)
-            return { data: null }
-          }),
-          portfolioAPI.getFeaturedProjects().catch((err) => {
-            console.warn('Featured Projects API error:', err.response?.status || err.message)
-            return { data: { results: [] } }
-          }),
-        ])
+        const homeRes = await portfolioAPI.getHomeBundle().catch((err) => {
+          console.warn('Home API error:', err.response?.status || err.message)
+          return { data: { settings: null, featured_projects: [] } }
+        })
 
-        setSettings(settingsRes.data)
-        setFeaturedProjects(projectsRes.data.results || projectsRes.data || [])
+        setSettings(homeRes.data.settings)
+        setFeaturedProjects(homeRes.data.featured_projects || [])
       } catch (error) {
         console.error('Error fetching data:', error)
       } finally {
@@ -127,10 +122,14 @@ const Home = () => {
             transition={{ duration: 0.8, delay: 0.2 }}
           >
             {settings?.owner_photo_url ? (
-              <img 
-                src={settings.owner_photo_url} 
-                alt={settings.owner_name || 'Portfolio'} 
+              <ResponsiveImage
+                src={settings.owner_photo_url}
+                variants={settings.owner_photo_variants}
+                sizes="(max-width: 768px) 80vw, 400px"
+                alt={settings.owner_name || 'Portfolio'}
                 className="hero-photo"
+                loading="eager"
+                fetchpriority="high"
               />
             ) : (
               <div className="hero-photo-placeholder">
@@ -34,8 +34,12 @@ api.interceptors.response.use(
 
 // Services API
 export const portfolioAPI = {
+  // Home (paramètres, compétences, expériences, projets et articles vedettes)
+  getHomeBundle: () => api.get('/home/'),
+
   // Settings
   getSettings: () => api.get('/settings/current/'),
+  getStructuredData: (lang) => api.get('/settings/structured-data/', { params: { lang } }),
   
   // Skills
   getSkills: (params) => api.get('/skills/', { params }),
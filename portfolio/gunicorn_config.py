@@ -1,19 +1,125 @@
 """
 Configuration Gunicorn pour le déploiement
+
+Le nombre de workers et de threads est déduit des limites du conteneur
+(quota CPU et mémoire des cgroups v2 ou v1, affinité CPU) et non du nombre
+de cœurs de l'hôte que renvoie os.cpu_count(). Chaque valeur peut être
+imposée par variable d'environnement (voir README).
+
+Voir aussi : python manage.py gunicorn_memory (RSS / PSS par worker)
 """
-import multiprocessing
+import math
+import os
+import tempfile
+
+import decouple
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# Au-delà, une limite cgroup v1 signifie « pas de limite » (valeur proche de 2**63)
+UNLIMITED_MEMORY = 2 ** 60
+
+
+def read_cgroup_file(*parts):
+    try:
+        with open(os.path.join(CGROUP_ROOT, *parts)) as f:
+            return f.read().strip()
+    except (OSError, ValueError):
+        return None
+
+
+def cgroup_cpu_limit():
+    """Quota CPU du conteneur en nombre de cœurs (fractionnaire), ou None"""
+    # cgroup v2 : "max 100000" ou "<quota> <période>"
+    value = read_cgroup_file('cpu.max')
+    if value:
+        quota, _, period = value.partition(' ')
+        if quota != 'max':
+            return int(quota) / int(period or 100000)
+        return None
+    # cgroup v1
+    quota = read_cgroup_file('cpu', 'cpu.cfs_quota_us')
+    period = read_cgroup_file('cpu', 'cpu.cfs_period_us')
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def cgroup_memory_limit():
+    """Limite mémoire du conteneur en octets, ou None"""
+    value = read_cgroup_file('memory.max') or read_cgroup_file('memory', 'memory.limit_in_bytes')
+    if not value or value == 'max' or int(value) >= UNLIMITED_MEMORY:
+        return None
+    return int(value)
+
+
+def available_cpus():
+    """Cœurs réellement utilisables : affinité du processus, plafonnée par le quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS
+        cpus = os.cpu_count() or 1
+    quota = cgroup_cpu_limit()
+    if quota:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def compute_workers(cpus, memory_limit, worker_class):
+    """
+    Nombre de processus : 2 × CPU + 1 en sync (les workers attendent les E/S),
+    CPU + 1 en gthread (les threads couvrent l'attente), puis plafonné par la
+    mémoire disponible
+    """
+    workers = cpus * 2 + 1 if worker_class == 'sync' else cpus + 1
+    if memory_limit:
+        budget = memory_limit - WORKER_MEMORY_RESERVE * 1024 * 1024
+        workers = min(workers, budget // (WORKER_MEMORY * 1024 * 1024))
+    return max(1, int(workers))
 
-# Nombre de workers
-workers = multiprocessing.cpu_count() * 2 + 1
+
+# Mémoire estimée par worker et réservée au master / au reste du conteneur (Mo)
+WORKER_MEMORY = decouple.config('GUNICORN_WORKER_MEMORY_MB', default=80, cast=int)
+WORKER_MEMORY_RESERVE = decouple.config('GUNICORN_MEMORY_RESERVE_MB', default=64, cast=int)
+
+CPUS = available_cpus()
+MEMORY_LIMIT = cgroup_memory_limit()
 
 # Bind
 bind = "0.0.0.0:8000"
 
-# Worker class
-worker_class = "sync"
+# Worker class : gthread (plusieurs threads par processus) ou sync
+worker_class = decouple.config('GUNICORN_WORKER_CLASS', default='gthread')
+
+# Nombre de workers et de threads (WEB_CONCURRENCY est la variable usuelle des hébergeurs)
+workers = decouple.config('WEB_CONCURRENCY', default=compute_workers(CPUS, MEMORY_LIMIT, worker_class), cast=int)
+threads = decouple.config('GUNICORN_THREADS', default=4 if worker_class == 'gthread' else 1, cast=int)
+
+# Charge Django dans le master avant le fork : le code importé est partagé
+# entre workers (copie sur écriture) et une erreur d'import arrête le démarrage
+preload_app = decouple.config('GUNICORN_PRELOAD', default=True, cast=bool)
+
+# Recyclage des workers pour contenir les fuites mémoire ; la gigue évite
+# qu'ils redémarrent tous en même temps
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = decouple.config('GUNICORN_MAX_REQUESTS_JITTER', default=100, cast=int)
+
+# Métriques Prometheus : chaque worker écrit ses valeurs dans ce répertoire,
+# /metrics les agrège. Passé aux processus via raw_env (avant le preload)
+METRICS_DIR = decouple.config(
+    'PROMETHEUS_MULTIPROC_DIR', default=os.path.join(tempfile.gettempdir(), 'portfoapp-metrics')
+)
+# Cache de l'API et compteurs d'invalidation : avec plusieurs workers, un cache
+# locmem est propre à chaque processus et une modification n'invaliderait que
+# celui qui l'a traitée. Le cache fichier partagé est alors le défaut
+CACHE_BACKEND = decouple.config('CACHE_BACKEND', default='file' if workers > 1 else 'locmem')
+
+raw_env = [f'PROMETHEUS_MULTIPROC_DIR={METRICS_DIR}', f'CACHE_BACKEND={CACHE_BACKEND}']
 
 # Timeout
 timeout = 30
+graceful_timeout = 30
+keepalive = 5
 
 # Logging
 accesslog = "-"
@@ -22,3 +128,41 @@ loglevel = "info"
 
 # Process naming
 proc_name = "portfoapp"
+
+
+def on_starting(server):
+    if workers > 1 and CACHE_BACKEND == 'locmem':
+        raise RuntimeError(
+            f"CACHE_BACKEND=locmem avec {workers} workers : les invalidations ne seraient "
+            "pas partagées, utiliser CACHE_BACKEND=file ou WEB_CONCURRENCY=1"
+        )
+    # Les fichiers d'un lancement précédent fausseraient les compteurs
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    for name in os.listdir(METRICS_DIR):
+        if name.endswith('.db'):
+            os.remove(os.path.join(METRICS_DIR, name))
+    server.log.info(
+        "CPU utilisables : %s, limite mémoire : %s, %s workers %s × %s threads",
+        CPUS,
+        f"{MEMORY_LIMIT // (1024 * 1024)} Mo" if MEMORY_LIMIT else "aucune",
+        workers, worker_class, threads,
+    )
+
+
+def pre_fork(server, worker):
+    """Aucune connexion à la base ne doit être héritée du master (preload_app)"""
+    if preload_app:
+        from django.db import connections
+        connections.close_all()
+
+
+def worker_exit(server, worker):
+    """Écrit les vues d'articles encore en tampon avant l'arrêt du worker"""
+    from portfoapp.counters import view_counts
+    view_counts.flush()
+
+
+def child_exit(server, worker):
+    """Retire les séries propres au worker arrêté (jauges « live »)"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
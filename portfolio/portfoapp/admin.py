@@ -1,9 +1,10 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
+from .cache import bump_version
 from .models import (
     SkillCategory, Skill, Experience, ProjectCategory, Technology,
-    Project, ArticleCategory, Tag, Article, ContactMessage, SiteSettings
+    Project, ArticleCategory, Tag, Article, ContactMessage, OutboxEmail, SiteSettings
 )
 
 
@@ -119,17 +120,33 @@ class ContactMessageAdmin(admin.ModelAdmin):
 
     def mark_as_read(self, request, queryset):
         queryset.update(status='read')
+        bump_version(ContactMessage)
     mark_as_read.short_description = _('Marquer comme lu')
 
     def mark_as_replied(self, request, queryset):
         queryset.update(status='replied', replied_at=timezone.now())
+        bump_version(ContactMessage)
     mark_as_replied.short_description = _('Marquer comme répondu')
 
     def mark_as_archived(self, request, queryset):
         queryset.update(status='archived')
+        bump_version(ContactMessage)
     mark_as_archived.short_description = _('Archiver')
 
 
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'last_error']
+    readonly_fields = ['contact_message', 'attempts', 'last_error', 'created_at', 'sent_at']
+    actions = ['retry_now']
+
+    def retry_now(self, request, queryset):
+        queryset.exclude(status='sent').update(status='pending', attempts=0, next_attempt_at=timezone.now())
+    retry_now.short_description = _('Renvoyer maintenant')
+
+
 
 @admin.register(SiteSettings)
 class SiteSettingsAdmin(admin.ModelAdmin):
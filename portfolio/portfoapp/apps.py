@@ -4,4 +4,16 @@ from django.apps import AppConfig
 class PortfolioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portfoapp'
-    verbose_name = 'Portfolio'
\ No newline at end of file
+    verbose_name = 'Portfolio'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+        from . import signals  # noqa: F401
+        from .search import ensure_sqlite_indexes
+        from .timing import install_db_timer
+
+        post_migrate.connect(
+            lambda using, **kwargs: ensure_sqlite_indexes(using), sender=self, weak=False
+        )
+        connection_created.connect(install_db_timer)
@@ -0,0 +1,165 @@
+"""
+Endpoints publics en lecture, en vues asynchrones (ASGI)
+
+Même format de réponse que l'API DRF (`/portfolio/...`), servi sous
+`/portfolio/async/...` avec l'ORM asynchrone (aget, acount, async for) : sous
+un serveur ASGI (uvicorn), un seul processus garde ouvertes de nombreuses
+connexions lentes sans bloquer un thread par requête.
+
+Pris en charge : listes paginées par numéro de page, filtres
+(`filter_fields`), détail par id et `?lang`. La recherche, le tri et la
+pagination par curseur restent sur l'API synchrone.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views import View
+from django_filters.rest_framework import FilterSet
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .i18n import defer_other_languages, get_request_language, is_negotiated
+from .models import Article, Experience, Project, SiteSettings, Skill
+from .serializers import (
+    ArticleSerializer, ExperienceSerializer, ProjectSerializer,
+    SiteSettingsSerializer, SkillSerializer
+)
+from .timing import timed
+
+
+class AsyncReadView(View):
+    # Requête de base (comme `queryset` des viewsets) ; ou get_base_queryset()
+    queryset = None
+    serializer_class = None
+    # Équivalent de `filterset_fields` des viewsets
+    filter_fields = ()
+    page_query_param = 'page'
+    page_size = api_settings.PAGE_SIZE
+
+    def get_base_queryset(self):
+        if self.queryset is None:
+            raise ImproperlyConfigured(
+                f'{type(self).__name__} doit définir `queryset` ou redéfinir get_base_queryset()'
+            )
+        # Nouveau queryset à chaque requête : pas de résultats partagés entre requêtes
+        return self.queryset.all()
+
+    def get_queryset(self):
+        return defer_other_languages(self.get_base_queryset(), self.language)
+
+    def get_serializer(self, instance, many=False):
+        context = {'request': self.request, 'language': self.language}
+        return self.serializer_class(instance, many=many, context=context)
+
+    def serialize(self, instance, many=False):
+        with timed('serialize'):
+            return self.get_serializer(instance, many=many).data
+
+    def render(self, data, status=200):
+        with timed('render'):
+            content = JSONRenderer().render(data)
+        response = HttpResponse(content, status=status, content_type='application/json')
+        if is_negotiated(self.request):
+            patch_vary_headers(response, ['Accept-Language'])
+        return response
+
+    def not_found(self, detail='Pas trouvé.'):
+        return self.render({'detail': detail}, status=404)
+
+    async def get(self, request, pk=None):
+        self.language = get_request_language(request)
+        if pk is not None:
+            return await self.retrieve(pk)
+        return await self.list()
+
+    async def retrieve(self, pk):
+        queryset = self.get_queryset()
+        try:
+            instance = await queryset.aget(pk=pk)
+        except queryset.model.DoesNotExist:
+            return self.not_found()
+        return self.render(self.serialize(instance))
+
+    def get_filterset(self, queryset):
+        """Même FilterSet que celui généré par DjangoFilterBackend pour `filterset_fields`"""
+        class AutoFilterSet(FilterSet):
+            class Meta:
+                model = queryset.model
+                fields = self.filter_fields
+
+        return AutoFilterSet(self.request.GET, queryset=queryset, request=self.request)
+
+    async def filter_queryset(self, queryset):
+        """Applique les filtres demandés ; retourne (queryset, erreurs)"""
+        if not any(self.request.GET.get(name) for name in self.filter_fields):
+            return queryset, None
+        filterset = self.get_filterset(queryset)
+        # La validation des clés étrangères interroge la base
+        if not await sync_to_async(filterset.is_valid)():
+            return queryset, filterset.errors
+        return filterset.qs, None
+
+    async def list(self):
+        queryset, errors = await self.filter_queryset(self.get_queryset())
+        if errors:
+            return self.render(errors, status=400)
+
+        try:
+            number = int(self.request.GET.get(self.page_query_param, 1))
+        except ValueError:
+            return self.not_found('Page non valide.')
+        count = await queryset.acount()
+        num_pages = max(1, -(-count // self.page_size))
+        if not 1 <= number <= num_pages:
+            return self.not_found('Page non valide.')
+
+        offset = (number - 1) * self.page_size
+        results = [obj async for obj in queryset[offset:offset + self.page_size]]
+        return self.render({
+            'count': count,
+            'next': self.get_page_link(number + 1) if number < num_pages else None,
+            'previous': self.get_page_link(number - 1) if number > 1 else None,
+            'results': self.serialize(results, many=True),
+        })
+
+    def get_page_link(self, number):
+        url = self.request.build_absolute_uri()
+        if number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, number)
+
+
+class AsyncSkillView(AsyncReadView):
+    serializer_class = SkillSerializer
+    filter_fields = ('skill_type', 'category')
+    queryset = Skill.objects.for_api()
+
+
+class AsyncExperienceView(AsyncReadView):
+    serializer_class = ExperienceSerializer
+    filter_fields = ('experience_type',)
+    queryset = Experience.objects.all()
+
+
+class AsyncProjectView(AsyncReadView):
+    serializer_class = ProjectSerializer
+    filter_fields = ('category', 'featured', 'technologies')
+    queryset = Project.objects.for_api()
+
+
+class AsyncArticleView(AsyncReadView):
+    serializer_class = ArticleSerializer
+    filter_fields = ('category', 'featured', 'tags')
+    queryset = Article.objects.published().for_api()
+
+
+class AsyncSiteSettingsView(AsyncReadView):
+    serializer_class = SiteSettingsSerializer
+
+    async def get(self, request):
+        self.language = get_request_language(request)
+        # Instance servie depuis le cache du processus dans la plupart des cas
+        site_settings = await sync_to_async(SiteSettings.load)()
+        return self.render(self.serialize(site_settings))
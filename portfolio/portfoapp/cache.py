@@ -0,0 +1,112 @@
+"""
+Cache des réponses de l'API publique, invalidé par compteurs de version
+
+Les clés sont construites à partir du chemin, des paramètres et de la langue.
+Chaque modèle possède une version remplacée par une nouvelle valeur unique
+(horodatage en nanosecondes) par les signaux post_save / post_delete /
+m2m_changed. Les clés de cache incluent les
+versions des modèles dont dépend la réponse : une modification rend les
+anciennes entrées inaccessibles sans jamais parcourir les clés.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+from .i18n import get_request_language
+from .metrics import record_cache_lookup
+
+VERSION_KEY = 'portfoapp:version:%s'
+RESPONSE_KEY = 'portfoapp:response:%s'
+
+
+def get_cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def _new_version():
+    # Horodatée : jamais une valeur déjà utilisée, même si la version a été
+    # évincée du cache
+    return time.time_ns()
+
+
+def get_versions(models):
+    """Retourne les versions courantes des modèles, dans l'ordre"""
+    cache = get_cache()
+    keys = [VERSION_KEY % model._meta.label_lower for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    """Invalide toutes les réponses qui dépendent de ce modèle"""
+    # Écriture d'une nouvelle valeur plutôt que incr() : l'incrément du cache
+    # fichier (lecture puis écriture) n'est pas atomique, deux workers qui
+    # invalident en même temps pourraient aboutir à la même version
+    get_cache().set(VERSION_KEY % model._meta.label_lower, _new_version(), timeout=None)
+
+
+class CachedResponseMixin:
+    """
+    Met en cache les données sérialisées et le validateur des actions en
+    lecture. À combiner avec ConditionalGetMixin : sur un succès de cache,
+    ni le validateur ni les données ne touchent la base.
+    """
+
+    def get_cache_models(self):
+        return (self.queryset.model,) + tuple(self.validator_models)
+
+    def get_cache_key(self):
+        request = self.request
+        params = sorted(request.query_params.lists())
+        parts = [
+            request.path,
+            repr(params),
+            str(get_request_language(request)),
+            request.accepted_renderer.format,
+            repr(get_versions(self.get_cache_models())),
+        ]
+        return RESPONSE_KEY % hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+    def initial(self, request, *args, **kwargs):
+        self.cache_key = None
+        self.cached_entry = None
+        super().initial(request, *args, **kwargs)
+
+    def get_validator(self):
+        if not getattr(settings, 'API_CACHE_ENABLED', True):
+            return super().get_validator()
+        self.cache_key = self.get_cache_key()
+        self.cached_entry = get_cache().get(self.cache_key)
+        record_cache_lookup('api', self.cached_entry is not None)
+        if self.cached_entry is not None:
+            return self.cached_entry['validator']
+        return super().get_validator()
+
+    def get_precomputed_response(self, request):
+        response = super().get_precomputed_response(request)
+        if response is None and self.cached_entry is not None:
+            response = Response(self.cached_entry['data'])
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            getattr(self, 'cache_key', None) is not None
+            and self.cached_entry is None
+            and response.status_code == status.HTTP_200_OK
+            and isinstance(response, Response)
+        ):
+            get_cache().set(
+                self.cache_key,
+                {'data': response.data, 'validator': self.validator},
+                timeout=getattr(settings, 'API_CACHE_TIMEOUT', 600),
+            )
+        return response
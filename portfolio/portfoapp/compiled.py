@@ -0,0 +1,261 @@
+"""
+Sérialisation compilée des lectures (projets, articles, compétences)
+
+Un ModelSerializer appelle, pour chaque objet et chaque champ,
+get_attribute puis to_representation, et build_absolute_uri pour chaque
+image. Ici, les champs du sérialiseur sont analysés une seule fois par
+langue pour en déduire :
+
+- les colonnes à lire avec values() (relations ForeignKey en jointure) ;
+- une fonction par champ qui convertit la valeur brute (identité pour les
+  textes et nombres, préfixe d'URL des médias calculé une fois par requête
+  pour les fichiers et les variantes d'images) ;
+- une requête par relation ManyToMany, sur la table de liaison.
+
+Le résultat est identique à celui du sérialiseur DRF (vérifié par les
+tests) ; API_COMPILED_SERIALIZERS=False revient au chemin DRF.
+"""
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.utils.encoding import filepath_to_uri
+from rest_framework import serializers
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from .images import build_variant_urls
+from .serializers import ImageVariantsField
+from .timing import timed
+
+# Champs dont to_representation ne change pas une valeur lue par values()
+IDENTITY_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.ChoiceField, serializers.ReadOnlyField, serializers.JSONField,
+)
+
+_compiled = {}
+
+
+def get_media_url_builder(storage, request=None):
+    """Nom de fichier -> URL (absolue si `request`), préfixe calculé une seule fois"""
+    if isinstance(storage, FileSystemStorage):
+        # FileSystemStorage.url() : base_url (terminée par /) suivie du chemin encodé
+        prefix = request.build_absolute_uri(storage.base_url) if request else storage.base_url
+        return lambda name: prefix + filepath_to_uri(name).lstrip('/')
+
+    def url(name):
+        location = storage.url(name)
+        return request.build_absolute_uri(location) if request else location
+    return url
+
+
+class SerializeContext:
+    """État d'une sérialisation : constructeurs d'URLs et relations chargées"""
+
+    def __init__(self, request):
+        self.request = request
+        self.url_builders = {}
+        self.related = {}
+
+    def media_url(self, storage, name):
+        builder = self.url_builders.get(storage)
+        if builder is None:
+            builder = self.url_builders[storage] = get_media_url_builder(storage, self.request)
+        return builder(name)
+
+
+class CompiledSerializer:
+    """Plan de sérialisation d'un ModelSerializer en lecture, pour une langue"""
+
+    def __init__(self, serializer, model, prefix=''):
+        self.model = model
+        self.pk_column = model._meta.pk.attname
+        self.columns = []
+        self.relations = []
+        if not prefix:
+            self.add_column(self.pk_column)
+        self.steps = self.compile(serializer, model, prefix)
+
+    @classmethod
+    def for_serializer(cls, serializer_class, language=None):
+        key = (serializer_class, language)
+        compiled = _compiled.get(key)
+        if compiled is None:
+            serializer = serializer_class(context={'language': language})
+            compiled = _compiled[key] = cls(serializer, serializer_class.Meta.model)
+        return compiled
+
+    def add_column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+        return column
+
+    def compile(self, serializer, model, prefix):
+        """Liste de (clé, fonction(ligne, contexte)) dans l'ordre des champs"""
+        steps = []
+        file_url_fields = getattr(serializer, 'file_url_fields', {})
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                if name not in file_url_fields:
+                    raise ImproperlyConfigured(f'{type(serializer).__name__}.{name} : champ calculé non compilable')
+                steps.append((name, self.compile_file(model, prefix, file_url_fields[name])))
+                continue
+            source = field.source
+            if '.' in source or source == '*':
+                raise ImproperlyConfigured(f'{type(serializer).__name__}.{name} : source {source!r} non compilable')
+
+            if isinstance(field, serializers.ListSerializer):
+                if prefix:
+                    raise ImproperlyConfigured(f'{name} : relation multiple imbriquée non compilable')
+                steps.append((name, self.compile_many(model, source, field.child)))
+            elif isinstance(field, serializers.BaseSerializer):
+                steps.append((name, self.compile_nested(model, prefix, source, field)))
+            elif isinstance(field, serializers.FileField):
+                steps.append((name, self.compile_file(model, prefix, source)))
+            elif isinstance(field, ImageVariantsField):
+                steps.append((name, self.compile_variants(prefix + source)))
+            elif isinstance(field, IDENTITY_FIELDS) and not getattr(field, 'binary', False):
+                steps.append((name, self.compile_value(prefix + source)))
+            else:
+                steps.append((name, self.compile_value(prefix + source, field.to_representation)))
+        return steps
+
+    def compile_value(self, column, convert=None):
+        get = itemgetter(self.add_column(column))
+        if convert is None:
+            return lambda row, context: get(row)
+
+        def step(row, context):
+            value = get(row)
+            return None if value is None else convert(value)
+        return step
+
+    def compile_file(self, model, prefix, source):
+        storage = model._meta.get_field(source).storage
+        get = itemgetter(self.add_column(prefix + source))
+
+        def step(row, context):
+            name = get(row)
+            return context.media_url(storage, name) if name else None
+        return step
+
+    def compile_variants(self, column):
+        get = itemgetter(self.add_column(column))
+
+        def step(row, context):
+            return build_variant_urls(
+                get(row), default_storage, url=lambda name: context.media_url(default_storage, name)
+            )
+        return step
+
+    def compile_nested(self, model, prefix, source, serializer):
+        related_model = model._meta.get_field(source).related_model
+        nested_prefix = f'{prefix}{source}__'
+        get_pk = itemgetter(self.add_column(nested_prefix + related_model._meta.pk.attname))
+        steps = self.compile(serializer, related_model, nested_prefix)
+
+        def step(row, context):
+            if get_pk(row) is None:
+                return None
+            return {key: convert(row, context) for key, convert in steps}
+        return step
+
+    def compile_many(self, model, source, serializer):
+        field = model._meta.get_field(source)
+        related_model = field.related_model
+        # Table de liaison : <modèle>_id, puis colonnes de l'objet lié (même ordre que le prefetch)
+        owner, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        nested = CompiledSerializer(serializer, related_model, prefix=f'{target}__')
+        ordering = [
+            f'-{target}__{name[1:]}' if name.startswith('-') else f'{target}__{name}'
+            for name in related_model._meta.ordering
+        ]
+        self.relations.append((source, field.remote_field.through, owner, nested.columns, ordering, nested.steps))
+
+        def step(row, context):
+            return context.related[source].get(row[self.pk_column], [])
+        return step
+
+    def values(self, queryset):
+        """Queryset de lignes (dict) avec les colonnes du plan ; filtres et tri conservés"""
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def load_relations(self, rows, context):
+        pks = [row[self.pk_column] for row in rows]
+        for source, through, owner, columns, ordering, steps in self.relations:
+            owner_column = f'{owner}_id'
+            related = context.related[source] = {}
+            if not pks:
+                continue
+            links = through.objects.filter(**{f'{owner_column}__in': pks}).order_by(*ordering)
+            for link in links.values(owner_column, *columns):
+                related.setdefault(link[owner_column], []).append(
+                    {key: convert(link, context) for key, convert in steps}
+                )
+
+    def serialize(self, rows, request=None):
+        """Liste de représentations pour des lignes issues de values()"""
+        rows = list(rows)
+        with timed('serialize'):
+            context = SerializeContext(request)
+            self.load_relations(rows, context)
+            steps = self.steps
+            return [{key: convert(row, context) for key, convert in steps} for row in rows]
+
+
+def compiled_serializers_enabled():
+    return getattr(settings, 'API_COMPILED_SERIALIZERS', True)
+
+
+def serialize_many(serializer_class, queryset, context):
+    """`serializer_class(queryset, many=True).data`, par le chemin compilé s'il est actif"""
+    if not compiled_serializers_enabled():
+        return serializer_class(queryset, many=True, context=context).data
+    compiled = CompiledSerializer.for_serializer(serializer_class, context.get('language'))
+    return compiled.serialize(compiled.values(queryset), context.get('request'))
+
+
+class CompiledReadMixin:
+    """
+    Sert les actions listées dans `compiled_actions` (list, retrieve, actions
+    GET via `serialize_queryset`) avec le sérialiseur compilé. Endpoints
+    publics seulement : pas de permission par objet.
+    """
+    compiled_actions = ()
+
+    def use_compiled_serializer(self):
+        return compiled_serializers_enabled() and self.action in self.compiled_actions
+
+    def get_compiled_serializer(self):
+        return CompiledSerializer.for_serializer(
+            self.get_serializer_class(), self.get_serializer_context().get('language')
+        )
+
+    def serialize_queryset(self, queryset):
+        if not self.use_compiled_serializer():
+            return self.get_serializer(queryset, many=True).data
+        compiled = self.get_compiled_serializer()
+        return compiled.serialize(compiled.values(queryset), self.request)
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_compiled_serializer():
+            return super().list(request, *args, **kwargs)
+        compiled = self.get_compiled_serializer()
+        queryset = compiled.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(compiled.serialize(page, request))
+        return Response(compiled.serialize(queryset, request))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_compiled_serializer():
+            return super().retrieve(request, *args, **kwargs)
+        compiled = self.get_compiled_serializer()
+        queryset = compiled.values(self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return Response(compiled.serialize([row], request)[0])
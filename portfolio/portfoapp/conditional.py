@@ -0,0 +1,143 @@
+"""
+Requêtes conditionnelles (ETag / Last-Modified) pour l'API en lecture seule
+"""
+import hashlib
+
+from django.db.models import Count, IntegerField, Max, Value
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+
+from .cache import get_versions
+from .i18n import get_request_language
+
+
+def summarize_querysets(querysets):
+    """
+    Retourne pour chaque queryset le couple (date de dernière modification,
+    nombre de lignes), calculé en une seule requête UNION ALL d'agrégats.
+    """
+    parts = [
+        queryset.order_by()
+        .annotate(_position=Value(position, output_field=IntegerField()))
+        .values('_position')
+        .annotate(last_modified=Max('updated_at'), count=Count('pk', distinct=True))
+        .values_list('_position', 'last_modified', 'count')
+        for position, queryset in enumerate(querysets)
+    ]
+    rows = parts[0].union(*parts[1:], all=True) if len(parts) > 1 else parts[0]
+    summaries = [(None, 0)] * len(parts)
+    for position, last_modified, count in rows:
+        summaries[position] = (last_modified, count)
+    return summaries
+
+
+class Validator:
+    """
+    Validateur de cache (ETag faible + Last-Modified) d'une ressource
+
+    Last-Modified (max de `updated_at`) ne voit pas la suppression d'une ligne
+    plus ancienne : pour une collection (`last_modified=False`), seul l'ETag,
+    qui inclut le nombre de lignes, est envoyé et évalué.
+    """
+
+    def __init__(self, summaries, *extra, last_modified=True):
+        timestamps = [date for date, _ in summaries if date]
+        self.last_modified = max(timestamps) if timestamps and last_modified else None
+        fingerprint = '|'.join(
+            [f'{last_modified.isoformat() if last_modified else "-"}:{count}' for last_modified, count in summaries]
+            + [str(value) for value in extra]
+        )
+        self.etag = 'W/"%s"' % hashlib.md5(fingerprint.encode()).hexdigest()
+
+    @property
+    def last_modified_timestamp(self):
+        return int(self.last_modified.timestamp()) if self.last_modified else None
+
+    @classmethod
+    def for_querysets(cls, querysets, *extra, last_modified=True):
+        return cls(summarize_querysets(querysets), *extra, last_modified=last_modified)
+
+    def not_modified_response(self, request):
+        """Retourne une réponse 304 si le client possède déjà cette version"""
+        return get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified_timestamp
+        )
+
+    def apply(self, response):
+        if response.status_code not in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            return response
+        response['ETag'] = self.etag
+        if self.last_modified:
+            response['Last-Modified'] = http_date(self.last_modified_timestamp)
+        # Le client garde la réponse mais la revalide à chaque fois
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Calcule un validateur à partir de `updated_at` et du nombre de lignes,
+    avant toute sérialisation : si le client possède déjà la version
+    courante, la vue répond 304 sans charger les objets.
+    """
+    # Modèles liés dont une modification change la représentation sérialisée
+    validator_models = ()
+    # Modèles dont des colonnes sérialisées changent sans `updated_at` (update()
+    # des compteurs) : leur version de cache entre dans l'ETag
+    versioned_models = ()
+    conditional_actions = ('list', 'retrieve')
+
+    def get_validator_querysets(self):
+        if self.detail:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = self.get_queryset().filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        elif self.action == 'list':
+            queryset = self.filter_queryset(self.get_queryset())
+        else:
+            queryset = self.get_queryset()
+        return [queryset] + [model._default_manager.all() for model in self.validator_models]
+
+    def get_validator(self):
+        return Validator.for_querysets(
+            self.get_validator_querysets(),
+            self.action,
+            self.request.accepted_renderer.format,
+            get_request_language(self.request),
+            *(get_versions(self.versioned_models) if self.versioned_models else ()),
+            # Last-Modified pour un objet seulement, pas pour une liste ; il ne
+            # voit pas non plus les colonnes modifiées sans updated_at
+            last_modified=self.detail and not self.versioned_models,
+        )
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validator = None
+        if request.method in ('GET', 'HEAD') and self.action in self.conditional_actions:
+            self.validator = self.get_validator()
+
+    def get_precomputed_response(self, request):
+        """Réponse disponible sans exécuter la vue (304 si le client est à jour)"""
+        if self.validator is None:
+            return None
+        return self.validator.not_modified_response(request)
+
+    def list(self, request, *args, **kwargs):
+        response = self.get_precomputed_response(request)
+        if response is not None:
+            return response
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        response = self.get_precomputed_response(request)
+        if response is not None:
+            return response
+        return super().retrieve(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'validator', None) is not None:
+            self.validator.apply(response)
+        return response
@@ -0,0 +1,102 @@
+"""
+Comptage des vues d'articles en écriture différée
+
+Les incréments sont agrégés en mémoire dans chaque worker puis écrits
+périodiquement en une seule requête UPDATE atomique
+(views_count = views_count + n), sans verrou de ligne pendant la requête
+HTTP et sans toucher `updated_at`. Une écriture réussie incrémente la
+version de cache d'Article : les réponses en cache et les ETag des articles
+reflètent les nouveaux compteurs.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Value, When
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    def __init__(self):
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._timer = None
+
+    def add(self, article_id, count=1):
+        """
+        Enregistre une vue ; écrit le tampon si l'intervalle est écoulé, sinon
+        programme l'écriture. Retourne les vues de l'article en tampon avant
+        une éventuelle écriture (celle-ci comprise) : à ajouter au compteur lu
+        en base avant l'appel.
+        """
+        interval = getattr(settings, 'ARTICLE_VIEWS_FLUSH_INTERVAL', 10)
+        with self._lock:
+            self._pending[article_id] += count
+            pending = self._pending[article_id]
+            due = time.monotonic() - self._last_flush >= interval
+            if not due and self._timer is None:
+                # Écriture garantie même si le worker ne reçoit plus de vues
+                self._timer = threading.Timer(interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+        return pending
+
+    def pending(self, article_id):
+        """Nombre de vues pas encore écrites en base pour cet article"""
+        with self._lock:
+            return self._pending[article_id]
+
+    def flush(self):
+        """
+        Écrit toutes les vues en attente en une seule requête. En cas d'erreur,
+        les vues sont remises en attente et l'erreur est journalisée, jamais
+        propagée à la requête qui a déclenché l'écriture.
+        """
+        from .cache import bump_version
+        from .models import Article
+
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+
+        increment = Case(
+            *[When(pk=article_id, then=Value(count)) for article_id, count in pending.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        try:
+            updated = Article.objects.filter(pk__in=pending.keys()).update(views_count=F('views_count') + increment)
+        except Exception:
+            # On remet les vues en attente pour la prochaine écriture
+            with self._lock:
+                self._pending.update(pending)
+            logger.exception("Écriture de %s vues d'articles impossible", sum(pending.values()))
+            return 0
+        bump_version(Article)
+        return updated
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # Connexion à la base ouverte par ce thread
+            connections.close_all()
+
+
+view_counts = ViewCountBuffer()
+
+# Écrit les vues restantes à l'arrêt du worker
+atexit.register(view_counts.flush)
@@ -0,0 +1,52 @@
+"""
+Inventaire des endpoints publics en lecture du routeur de l'API
+
+Utilisé par l'export statique et le benchmark : listes, actions GET
+supplémentaires (`featured`, `current`...) et détails des objets que la vue
+expose réellement (ex. articles publiés seulement). Les viewsets qui
+acceptent la création (contact) sont exclus.
+"""
+from django.urls import reverse
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+
+
+def public_viewsets():
+    """(basename, viewset) des endpoints en lecture seule du routeur"""
+    from .urls import router
+
+    for prefix, viewset, basename in router.registry:
+        if not hasattr(viewset, 'create'):
+            yield basename, viewset
+
+
+def get_detail_pks(viewset, request, limit=None):
+    """Clés des objets publics, d'après le queryset de la vue"""
+    view = viewset(action='retrieve', args=(), kwargs={}, format_kwarg=None)
+    view.request = Request(request)
+    queryset = view.get_queryset().order_by('pk').values_list('pk', flat=True)
+    return list(queryset[:limit] if limit else queryset)
+
+
+def get_endpoints(request, detail_limit=None):
+    """
+    Nom de route -> URLs à interroger ; les détails sont regroupés sous
+    `<basename>-detail` (au plus `detail_limit` objets par viewset)
+    """
+    endpoints = {}
+    for basename, viewset in public_viewsets():
+        get_actions = [extra for extra in viewset.get_extra_actions() if 'get' in extra.mapping]
+        if hasattr(viewset, 'list'):
+            endpoints[f'{basename}-list'] = [reverse(f'{basename}-list')]
+        for extra in get_actions:
+            if not extra.detail:
+                name = f'{basename}-{extra.url_name}'
+                endpoints[name] = [reverse(name)]
+        if hasattr(viewset, 'retrieve') and issubclass(viewset, GenericAPIView):
+            pks = get_detail_pks(viewset, request, detail_limit)
+            names = [f'{basename}-detail'] + [f'{basename}-{extra.url_name}' for extra in get_actions if extra.detail]
+            for name in names:
+                urls = [reverse(name, kwargs={'pk': pk}) for pk in pks]
+                if urls:
+                    endpoints[name] = urls
+    return endpoints
@@ -0,0 +1,89 @@
+"""
+Réponses limitées à une seule langue (?lang=fr|en, ou ?lang=auto pour Accept-Language)
+"""
+from django.conf import settings
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
+
+LANGUAGE_PARAM = 'lang'
+
+
+def get_language_codes():
+    return [code for code, _ in settings.LANGUAGES]
+
+
+def get_request_language(request):
+    """
+    Langue demandée par le client, ou None pour renvoyer toutes les traductions
+    (comportement historique de l'API).
+    """
+    requested = request.GET.get(LANGUAGE_PARAM)
+    if not requested:
+        return None
+    if requested == 'auto':
+        requested = translation.get_language_from_request(request)
+    requested = requested.split('-')[0].lower()
+    return requested if requested in get_language_codes() else None
+
+
+def is_negotiated(request):
+    """La langue dépend de l'en-tête Accept-Language"""
+    return request.GET.get(LANGUAGE_PARAM) == 'auto'
+
+
+def translated_field_names(names):
+    """Retourne les noms de base (`title`) dont toutes les variantes (`title_fr`, `title_en`) existent"""
+    names = set(names)
+    bases = {name.rsplit('_', 1)[0] for name in names if '_' in name}
+    return {
+        base for base in bases
+        if all(f'{base}_{code}' in names for code in get_language_codes())
+    }
+
+
+def other_language_columns(model, language, prefix=''):
+    """Colonnes des autres langues que `language`, à exclure du SELECT"""
+    names = [field.name for field in model._meta.concrete_fields]
+    return [
+        f'{prefix}{base}_{code}'
+        for base in sorted(translated_field_names(names))
+        for code in get_language_codes()
+        if code != language
+    ]
+
+
+def defer_other_languages(queryset, language):
+    """Ne charge que les colonnes de la langue demandée, y compris pour les relations jointes"""
+    if not language:
+        return queryset
+    columns = other_language_columns(queryset.model, language)
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        for name in select_related:
+            related_model = queryset.model._meta.get_field(name).related_model
+            columns += other_language_columns(related_model, language, prefix=f'{name}__')
+    return queryset.defer(*columns)
+
+
+class LanguageScopedMixin:
+    """Transmet la langue demandée aux sérialiseurs et allège les requêtes en conséquence"""
+
+    def get_language(self):
+        return get_request_language(self.request)
+
+    def scope_language(self, queryset):
+        return defer_other_languages(queryset, self.get_language())
+
+    def get_queryset(self):
+        return self.scope_language(super().get_queryset())
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['language'] = self.get_language()
+        return context
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if is_negotiated(request):
+            patch_vary_headers(response, ['Accept-Language'])
+        return response
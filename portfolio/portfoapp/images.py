@@ -0,0 +1,273 @@
+"""
+Variantes responsives des images téléversées
+
+À chaque enregistrement d'un modèle, les images modifiées sont déclinées
+avec Pillow en plusieurs largeurs (IMAGE_VARIANT_WIDTHS) et formats modernes
+(IMAGE_VARIANT_FORMATS, parmi ceux que Pillow sait encoder). Le manifeste
+(noms de fichiers et dimensions) est stocké dans un JSONField à côté de
+l'image ; les sérialiseurs en tirent les URLs et un `srcset` par format.
+
+Les GIF animés sont convertis en WebP animé, avec une affiche (première
+image) déclinée comme une image fixe. Plus coûteuse, cette conversion est
+exécutée après le commit dans un thread dédié, hors de la requête.
+
+Les noms des variantes contiennent une empreinte du contenu : une nouvelle
+image produit de nouveaux fichiers, jamais une réécriture des anciens.
+"""
+import hashlib
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, ImageSequence, UnidentifiedImageError, features
+
+logger = logging.getLogger(__name__)
+
+# Champ image -> champ du manifeste, par modèle
+VARIANT_FIELDS = {
+    'portfoapp.project': {'image': 'image_variants'},
+    'portfoapp.article': {'featured_image': 'featured_image_variants'},
+    'portfoapp.sitesettings': {'owner_photo': 'owner_photo_variants'},
+}
+
+# Images animées (GIF) -> WebP animé + affiche
+ANIMATED_FIELDS = {
+    'portfoapp.project': {'gif': 'gif_variants'},
+}
+
+
+def get_variant_fields(model):
+    return VARIANT_FIELDS.get(model._meta.label_lower, {})
+
+
+def get_animated_fields(model):
+    return ANIMATED_FIELDS.get(model._meta.label_lower, {})
+
+
+def get_formats():
+    """Formats configurés que cette installation de Pillow sait encoder"""
+    return [fmt for fmt in settings.IMAGE_VARIANT_FORMATS if features.check(fmt)]
+
+
+def get_widths(width):
+    """Largeurs à produire, sans jamais agrandir l'original"""
+    widths = [w for w in sorted(settings.IMAGE_VARIANT_WIDTHS) if w < width]
+    if width <= max(settings.IMAGE_VARIANT_WIDTHS):
+        widths.append(width)
+    return widths
+
+
+def variant_name(source, digest, width, fmt, label=''):
+    directory, filename = posixpath.split(source)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, 'variants', f'{stem}{label}-{digest}-{width}w.{fmt}')
+
+
+def open_source(fieldfile):
+    """Retourne (image, empreinte du contenu), ou (None, None) si Pillow ne peut pas la lire"""
+    with fieldfile.storage.open(fieldfile.name, 'rb') as source:
+        data = source.read()
+    try:
+        image = Image.open(BytesIO(data))
+        image.load()
+    except (UnidentifiedImageError, OSError) as exc:
+        logger.warning('Variantes impossibles pour %s : %s', fieldfile.name, exc)
+        return None, None
+    return image, hashlib.md5(data).hexdigest()[:8]
+
+
+def encode_variants(image, storage, source, digest, label=''):
+    """Enregistre les largeurs et formats d'une image fixe ; retourne son manifeste"""
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    width, height = image.size
+    manifest = {'width': width, 'height': height, 'formats': {}}
+
+    for fmt in get_formats():
+        variants = []
+        for target_width in get_widths(width):
+            target_height = max(1, round(height * target_width / width))
+            resized = image if target_width == width else image.resize(
+                (target_width, target_height), Image.Resampling.LANCZOS
+            )
+            buffer = BytesIO()
+            resized.save(buffer, format=fmt.upper(), quality=settings.IMAGE_VARIANT_QUALITY.get(fmt, 80))
+            name = storage.save(
+                variant_name(source, digest, target_width, fmt, label), ContentFile(buffer.getvalue())
+            )
+            variants.append({'name': name, 'width': target_width, 'height': target_height})
+        manifest['formats'][fmt] = variants
+    return manifest
+
+
+def generate_variants(fieldfile):
+    """Crée les variantes de `fieldfile` et retourne leur manifeste"""
+    image, digest = open_source(fieldfile)
+    if image is None:
+        # Manifeste vide : on ne retente pas à chaque enregistrement
+        return {'source': fieldfile.name, 'formats': {}}
+    manifest = encode_variants(ImageOps.exif_transpose(image), fieldfile.storage, fieldfile.name, digest)
+    manifest['source'] = fieldfile.name
+    return manifest
+
+
+def generate_animated_variants(fieldfile):
+    """Convertit un GIF en WebP animé (largeur plafonnée) et crée son affiche"""
+    manifest = {'source': fieldfile.name, 'formats': {}}
+    image, digest = open_source(fieldfile)
+    if image is None:
+        return manifest
+
+    storage = fieldfile.storage
+    image.seek(0)
+    manifest['poster'] = encode_variants(image, storage, fieldfile.name, digest, label='-poster')
+
+    width, height = image.size
+    durations = [frame.info.get('duration', 100) for frame in ImageSequence.Iterator(image)]
+    target_width = min(width, settings.IMAGE_ANIMATED_MAX_WIDTH)
+    target_height = max(1, round(height * target_width / width))
+    options = {
+        'format': 'WEBP',
+        'save_all': True,
+        'duration': durations,
+        'loop': image.info.get('loop', 0),
+        'quality': settings.IMAGE_VARIANT_QUALITY.get('webp', 80),
+    }
+    buffer = BytesIO()
+    if target_width == width:
+        # Pillow parcourt les images du GIF sans toutes les garder en mémoire
+        image.seek(0)
+        image.save(buffer, **options)
+    else:
+        frames = [
+            frame.convert('RGBA').resize((target_width, target_height), Image.Resampling.LANCZOS)
+            for frame in ImageSequence.Iterator(image)
+        ]
+        frames[0].save(buffer, append_images=frames[1:], **options)
+    name = storage.save(
+        variant_name(fieldfile.name, digest, target_width, 'webp', label='-anim'), ContentFile(buffer.getvalue())
+    )
+    manifest.update(width=target_width, height=target_height, frames=len(durations))
+    manifest['formats']['webp'] = [{'name': name, 'width': target_width, 'height': target_height}]
+    return manifest
+
+
+def delete_variants(storage, manifest):
+    manifest = manifest or {}
+    for nested in (manifest, manifest.get('poster') or {}):
+        for variants in nested.get('formats', {}).values():
+            for variant in variants:
+                storage.delete(variant['name'])
+
+
+def needs_refresh(fieldfile, manifest):
+    return manifest.get('source') != (fieldfile.name or None)
+
+
+def refresh_variants(instance, fields=None, generate=generate_variants, force=False):
+    """
+    Regénère les manifestes dont l'image source a changé. Écrit directement
+    en base (sans signal post_save) ; retourne les champs modifiés.
+    """
+    if fields is None:
+        fields = get_variant_fields(type(instance))
+    changes = {}
+    for image_field, manifest_field in fields.items():
+        fieldfile = getattr(instance, image_field)
+        manifest = getattr(instance, manifest_field) or {}
+        if not force and not needs_refresh(fieldfile, manifest):
+            continue
+        delete_variants(fieldfile.storage, manifest)
+        changes[manifest_field] = generate(fieldfile) if fieldfile else {}
+
+    if changes:
+        for name, value in changes.items():
+            setattr(instance, name, value)
+        # updated_at change aussi : les ETag et le cache voient les nouvelles variantes
+        changes['updated_at'] = instance.updated_at = timezone.now()
+        type(instance).objects.filter(pk=instance.pk).update(**changes)
+    return changes
+
+
+def refresh_animated_variants(model, pk, force=False):
+    """Conversion des images animées d'une instance (relue en base)"""
+    from .cache import bump_version
+
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return {}
+    changes = refresh_variants(instance, get_animated_fields(model), generate_animated_variants, force=force)
+    if changes:
+        bump_version(model)
+    return changes
+
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-variants')
+    return _executor
+
+
+def schedule_animated_variants(model, pk):
+    """Lance la conversion après le commit, dans un thread si IMAGE_BACKGROUND_CONVERSION"""
+
+    def task():
+        try:
+            refresh_animated_variants(model, pk)
+        except Exception:
+            logger.exception('Conversion des images animées impossible pour %s %s', model._meta.label, pk)
+        finally:
+            connections.close_all()
+
+    def submit():
+        if settings.IMAGE_BACKGROUND_CONVERSION:
+            get_executor().submit(task)
+        else:
+            refresh_animated_variants(model, pk)
+
+    transaction.on_commit(submit)
+
+
+def build_variant_urls(manifest, storage, request=None, url=None):
+    """
+    Représentation API d'un manifeste : URLs, dimensions et srcset par format.
+    `url` (nom -> URL) remplace storage.url + build_absolute_uri.
+    """
+    if not manifest or not manifest.get('formats'):
+        return None
+
+    if url is None:
+        def url(name):
+            location = storage.url(name)
+            return request.build_absolute_uri(location) if request else location
+
+    formats = {
+        fmt: [
+            {'url': url(variant['name']), 'width': variant['width'], 'height': variant['height']}
+            for variant in variants
+        ]
+        for fmt, variants in manifest['formats'].items()
+    }
+    representation = {
+        'width': manifest['width'],
+        'height': manifest['height'],
+        'formats': formats,
+        'srcset': {
+            fmt: ', '.join(f"{variant['url']} {variant['width']}w" for variant in variants)
+            for fmt, variants in formats.items()
+        },
+    }
+    if 'poster' in manifest:
+        # Image animée : nombre d'images et affiche fixe
+        representation['frames'] = manifest.get('frames')
+        representation['poster'] = build_variant_urls(manifest['poster'], storage, request, url)
+    return representation
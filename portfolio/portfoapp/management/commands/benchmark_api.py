@@ -0,0 +1,272 @@
+import json
+import math
+import platform
+import subprocess
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from urllib.parse import urljoin
+
+import django
+import requests
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, models
+from django.test import Client, RequestFactory, override_settings
+from django.urls import reverse
+
+from portfoapp.endpoints import get_endpoints
+from portfoapp.sitemaps import sitemaps
+
+
+def percentile(values, percent):
+    """Percentile au rang le plus proche sur une liste triée"""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, math.ceil(percent * len(values) / 100) - 1))
+    return values[rank]
+
+
+def find_media_url():
+    """URL du premier fichier média référencé en base (image de projet, CV...)"""
+    for model in apps.get_app_config('portfoapp').get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, models.FileField):
+                name = (
+                    model._default_manager.exclude(**{field.name: ''})
+                    .exclude(**{f'{field.name}__isnull': True})
+                    .values_list(field.name, flat=True).first()
+                )
+                if name:
+                    return field.storage.url(name)
+    return None
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure chaque route du routeur de l'API, le sitemap et un média : "
+        "latences p50/p95/p99, req/s, requêtes SQL et octets par réponse. "
+        "Cible l'application WSGI en processus ou un serveur déjà lancé (--url)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url', default=None,
+            help='Serveur à mesurer (ex. http://127.0.0.1:8000) ; application en processus par défaut',
+        )
+        parser.add_argument('--concurrency', type=int, default=4, help='Clients simultanés')
+        parser.add_argument('--requests', type=int, default=200, help='Requêtes par endpoint')
+        parser.add_argument('--details', type=int, default=5, help='Objets interrogés par route de détail')
+        parser.add_argument(
+            '--only', action='append', default=[], metavar='TEXTE',
+            help='Ne mesure que les endpoints dont le nom contient ce texte (répétable)',
+        )
+        parser.add_argument(
+            '--no-cache', action='store_true',
+            help="Désactive le cache des réponses de l'API (application en processus uniquement)",
+        )
+        parser.add_argument('--output', default=None, help='Fichier JSON des résultats')
+        parser.add_argument('--compare', default=None, help='Résultats JSON précédents à comparer')
+        parser.add_argument('--timeout', type=float, default=30, help='Délai maximal par requête (secondes)')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--concurrency et --requests doivent être positifs')
+        self.host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h not in ('*', '')), 'localhost')
+        self.timeout = options['timeout']
+        if options['no_cache'] and options['url']:
+            raise CommandError('--no-cache ne s\'applique qu\'à l\'application en processus')
+        # Sans cache : chemin complet (ORM, sérialisation) à chaque requête, comme au premier accès
+        with override_settings(API_CACHE_ENABLED=False) if options['no_cache'] else nullcontext():
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        fetch = self.remote_fetch(options['url']) if options['url'] else self.local_fetch()
+
+        endpoints = self.get_endpoints(options['details'])
+        if options['only']:
+            endpoints = {
+                name: urls for name, urls in endpoints.items()
+                if any(text in name for text in options['only'])
+            }
+        if not endpoints:
+            raise CommandError('Aucun endpoint à mesurer')
+
+        baseline = {}
+        if options['compare']:
+            try:
+                with open(options['compare']) as f:
+                    baseline = json.load(f)['endpoints']
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f'Résultats illisibles : {options["compare"]} ({e})')
+
+        self.stdout.write(
+            f"{'endpoint':<28} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'SQL':>5} {'octets':>9} {'erreurs':>7}" + (f" {'Δp50':>7} {'Δp95':>7}" if baseline else '')
+        )
+        results = {}
+        for name, urls in endpoints.items():
+            result = results[name] = self.run(fetch, urls, options['concurrency'], options['requests'])
+            line = (
+                f"{name:<28} {result['rps']:>8.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                f"{result['p99_ms']:>8.2f} {self.format_queries(result['queries']):>5} "
+                f"{result['bytes']:>9} {result['errors']:>7}"
+            )
+            if name in baseline:
+                line += ' ' + ' '.join(
+                    self.format_delta(result[key], baseline[name].get(key)) for key in ('p50_ms', 'p95_ms')
+                )
+            self.stdout.write(line)
+
+        if options['output']:
+            report = {
+                'meta': {
+                    'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                    'target': options['url'] or 'wsgi',
+                    'concurrency': options['concurrency'],
+                    'requests': options['requests'],
+                    'revision': git_revision(),
+                    'python': platform.python_version(),
+                    'django': django.get_version(),
+                    'debug': settings.DEBUG,
+                    'api_cache': settings.API_CACHE_ENABLED,
+                },
+                'endpoints': results,
+            }
+            with open(options['output'], 'w') as f:
+                # Clés triées et une ligne par valeur : deux rapports se comparent avec diff
+                json.dump(report, f, indent=2, sort_keys=True)
+                f.write('\n')
+            self.stdout.write(f"Résultats écrits dans {options['output']}")
+
+    def get_endpoints(self, details):
+        """Routes du routeur (listes, actions, détails), sitemap et un fichier média"""
+        request = RequestFactory(HTTP_HOST=self.host).get(reverse('api-root'))
+        endpoints = {'api-root': [reverse('api-root')]}
+        endpoints.update(get_endpoints(request, detail_limit=details))
+        endpoints['sitemap-index'] = [reverse('sitemap-index')]
+        endpoints['sitemap-section'] = [
+            reverse('django.contrib.sitemaps.views.sitemap', kwargs={'section': section}) for section in sitemaps
+        ]
+        media_url = find_media_url()
+        if media_url:
+            endpoints['media'] = [media_url]
+        else:
+            self.stderr.write('Aucun fichier média en base : endpoint media ignoré')
+        return endpoints
+
+    def local_fetch(self):
+        """Requêtes passées au handler WSGI de Django dans ce processus (middlewares compris)"""
+        local = threading.local()
+
+        def fetch(url):
+            if not hasattr(local, 'client'):
+                local.client = Client(HTTP_HOST=self.host, HTTP_ACCEPT='application/json')
+            queries = 0
+
+            def count(execute, sql, params, many, context):
+                nonlocal queries
+                queries += 1
+                return execute(sql, params, many, context)
+
+            started = time.perf_counter()
+            # La connexion est propre au thread : seules ses requêtes sont comptées
+            with connection.execute_wrapper(count):
+                response = local.client.get(url)
+                size = len(b''.join(response.streaming_content) if response.streaming else response.content)
+            elapsed = time.perf_counter() - started
+            response.close()
+            return response.status_code, elapsed, size, queries
+
+        return fetch
+
+    def remote_fetch(self, base_url):
+        """Requêtes HTTP vers un serveur lancé (gunicorn...) ; requêtes SQL non mesurables"""
+        local = threading.local()
+
+        def fetch(url):
+            # Une session keep-alive par client simulé
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+            started = time.perf_counter()
+            try:
+                response = local.session.get(
+                    urljoin(base_url, url), timeout=self.timeout, headers={'Accept': 'application/json'},
+                )
+            except requests.RequestException:
+                return None, time.perf_counter() - started, 0, None
+            return response.status_code, time.perf_counter() - started, len(response.content), None
+
+        return fetch
+
+    def run(self, fetch, urls, concurrency, total):
+        # Une requête d'échauffement par URL (cache de l'API, connexions)
+        for url in urls:
+            fetch(url)
+
+        counter = iter(range(total))
+        lock = threading.Lock()
+        samples = []
+
+        def work():
+            while True:
+                with lock:
+                    index = next(counter, None)
+                if index is None:
+                    return
+                samples.append(fetch(urls[index % len(urls)]))
+
+        def worker():
+            try:
+                work()
+            finally:
+                # Chaque thread a ouvert sa propre connexion à la base
+                connections.close_all()
+
+        started = time.perf_counter()
+        if concurrency == 1:
+            work()
+        else:
+            threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - started
+
+        ok = [sample for sample in samples if sample[0] is not None and sample[0] < 400]
+        latencies = sorted(sample[1] * 1000 for sample in ok)
+        queries = [sample[3] for sample in ok if sample[3] is not None]
+        return {
+            'urls': len(urls),
+            'requests': total,
+            'errors': total - len(ok),
+            'rps': round(total / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'queries': round(sum(queries) / len(queries), 2) if queries else None,
+            'bytes': round(sum(sample[2] for sample in ok) / len(ok)) if ok else 0,
+        }
+
+    @staticmethod
+    def format_queries(value):
+        return '-' if value is None else f'{value:g}'
+
+    @staticmethod
+    def format_delta(value, previous):
+        if not previous:
+            return f"{'-':>7}"
+        return f'{(value - previous) / previous:>+7.0%}'
@@ -0,0 +1,84 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_TARGETS = [
+    'wsgi=http://127.0.0.1:8000/portfolio/projects/',
+    'asgi=http://127.0.0.1:8001/portfolio/async/projects/',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare la tenue en concurrence de plusieurs serveurs déjà lancés "
+        "(ex. gunicorn WSGI et uvicorn ASGI) sur le même endpoint"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', action='append', dest='targets', metavar='NOM=URL',
+            help='Serveur à mesurer (répétable). Par défaut : wsgi sur :8000 et asgi sur :8001',
+        )
+        parser.add_argument(
+            '--concurrency', type=int, nargs='+', default=[1, 10, 50, 100],
+            help='Nombres de clients simultanés à tester',
+        )
+        parser.add_argument(
+            '--requests', type=int, default=500,
+            help='Requêtes envoyées par niveau de concurrence',
+        )
+        parser.add_argument('--timeout', type=float, default=30, help='Délai maximal par requête (secondes)')
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['targets'] or DEFAULT_TARGETS:
+            name, sep, url = target.partition('=')
+            if not sep or not url:
+                raise CommandError(f'Cible invalide : {target!r} (attendu NOM=URL)')
+            targets.append((name, url))
+
+        self.stdout.write(
+            f"{'serveur':<10} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'erreurs':>8}"
+        )
+        for name, url in targets:
+            for concurrency in options['concurrency']:
+                result = self.run(url, concurrency, options['requests'], options['timeout'])
+                self.stdout.write(
+                    f"{name:<10} {concurrency:>7} {result['rps']:>9.1f} {result['p50']:>8.1f} "
+                    f"{result['p95']:>8.1f} {result['max']:>8.1f} {result['errors']:>8}"
+                )
+
+    def run(self, url, concurrency, total, timeout):
+        local = threading.local()
+
+        def fetch(_):
+            # Une session keep-alive par client simulé
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+            started = time.perf_counter()
+            try:
+                response = local.session.get(url, timeout=timeout, headers={'Accept': 'application/json'})
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            return ok, (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(fetch, range(total)))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for ok, latency in results if ok)
+        if len(latencies) < 2:
+            latencies = latencies * 2 or [0.0, 0.0]
+        return {
+            'rps': total / elapsed,
+            'p50': statistics.median(latencies),
+            'p95': statistics.quantiles(latencies, n=20)[-1],
+            'max': latencies[-1],
+            'errors': sum(1 for ok, _ in results if not ok),
+        }
@@ -0,0 +1,79 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from portfoapp.compiled import CompiledSerializer
+from portfoapp.i18n import defer_other_languages
+from portfoapp.models import Article, Project, Skill
+from portfoapp.serializers import ArticleSerializer, ProjectSerializer, SkillSerializer
+
+TARGETS = {
+    'projects': (ProjectSerializer, lambda: Project.objects.for_api()),
+    'articles': (ArticleSerializer, lambda: Article.objects.published().for_api()),
+    'skills': (SkillSerializer, lambda: Skill.objects.for_api()),
+}
+
+
+def best_of(repeat, function):
+    """Meilleure durée (secondes) sur `repeat` exécutions"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le coût par objet du ModelSerializer DRF et de la sérialisation "
+        "compilée (values()) pour les projets, articles et compétences"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=200, help='Objets sérialisés par mesure')
+        parser.add_argument('--repeat', type=int, default=5, help='Mesures par chemin (la meilleure est retenue)')
+        parser.add_argument('--lang', default=None, help='Langue des représentations (toutes par défaut)')
+
+    def handle(self, *args, **options):
+        limit, repeat, language = options['limit'], options['repeat'], options['lang']
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h not in ('*', '')), 'localhost')
+        request = RequestFactory(HTTP_HOST=host).get('/')
+        context = {'request': request, 'language': language}
+
+        self.stdout.write(
+            f"{'modèle':<10} {'objets':>6} {'chemin':<9} {'total µs/obj':>13} {'sérialisation µs/obj':>21}"
+        )
+        for name, (serializer_class, get_queryset) in TARGETS.items():
+            queryset = defer_other_languages(get_queryset(), language)[:limit]
+            instances = list(queryset)
+            if not instances:
+                self.stderr.write(f'{name} : aucune ligne, ignoré (voir seed_dataset)')
+                continue
+            compiled = CompiledSerializer.for_serializer(serializer_class, language)
+            rows = list(compiled.values(queryset))
+            if serializer_class(instances, many=True, context=context).data != compiled.serialize(rows, request):
+                raise CommandError(f'{name} : représentations différentes entre les deux chemins')
+
+            count = len(instances)
+            measures = {
+                'drf': (
+                    # Requêtes (jointure + prefetch) et sérialisation
+                    lambda: serializer_class(list(queryset.all()), many=True, context=context).data,
+                    lambda: serializer_class(instances, many=True, context=context).data,
+                ),
+                'compilé': (
+                    lambda: compiled.serialize(compiled.values(queryset), request),
+                    # Relations ManyToMany comprises (une requête par relation)
+                    lambda: compiled.serialize(rows, request),
+                ),
+            }
+            for path, (total, serialization) in measures.items():
+                self.stdout.write(
+                    f'{name:<10} {count:>6} {path:<9} '
+                    f'{best_of(repeat, total) / count * 1e6:>13.1f} '
+                    f'{best_of(repeat, serialization) / count * 1e6:>21.1f}'
+                )
@@ -0,0 +1,187 @@
+import gzip
+import hashlib
+import json
+import os
+from collections import deque
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from portfoapp.endpoints import get_endpoints
+from portfoapp.i18n import LANGUAGE_PARAM, get_language_codes
+
+try:
+    import brotli
+except ImportError:  # Compression brotli optionnelle (pip install brotli)
+    brotli = None
+
+MANIFEST_NAME = '.manifest.json'
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporte l'API publique en lecture (listes paginées, détails, actions, "
+        "paramètres, chaque langue) en fichiers JSON statiques précompressés. "
+        "Les exports suivants ne réécrivent que les fichiers dont le contenu a changé."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=None,
+            help='Répertoire de sortie (STATIC_API_ROOT par défaut)',
+        )
+        parser.add_argument(
+            '--base-url', default=None,
+            help="URL publique du répertoire exporté, pour les liens de pagination (STATIC_API_BASE_URL par défaut)",
+        )
+        parser.add_argument(
+            '--host', default=None,
+            help='Hôte utilisé pour les URLs absolues des médias (premier ALLOWED_HOSTS par défaut)',
+        )
+        parser.add_argument('--insecure', action='store_true', help='URLs absolues en http au lieu de https')
+        parser.add_argument('--full', action='store_true', help='Ignore le manifeste et réexporte tout')
+
+    def handle(self, *args, **options):
+        self.output = Path(options['output'] or settings.STATIC_API_ROOT)
+        self.base_url = (options['base_url'] or settings.STATIC_API_BASE_URL).rstrip('/')
+        host = options['host'] or next((h for h in settings.ALLOWED_HOSTS if h not in ('*', '')), None)
+        if not host:
+            raise CommandError('Aucun hôte utilisable dans ALLOWED_HOSTS : précisez --host')
+        self.secure = not options['insecure']
+        self.factory = RequestFactory(HTTP_HOST=host.lstrip('.'))
+        self.api_root = reverse('api-root')
+
+        # Les liens et URLs absolues dépendent des options : tout réexporter si elles changent
+        export_options = {'base_url': self.base_url, 'host': host, 'secure': self.secure}
+        previous = self.load_manifest()
+        if options['full'] or previous.get('options') != export_options:
+            previous = {}
+        old_files = previous.get('files', {})
+        files = {}
+        written = unchanged = 0
+
+        queue = deque(self.get_urls())
+        seen = set()
+        while queue:
+            url = queue.popleft()
+            if url in seen:
+                continue
+            seen.add(url)
+            path = self.get_static_path(url)
+            entry = old_files.get(path)
+            response = self.fetch(url, etag=entry['etag'] if entry and (self.output / path).exists() else None)
+
+            if response.status_code == 304:
+                # Validateur inchangé : le fichier (et les pages suivantes) sont à jour
+                files[path] = entry
+                unchanged += 1
+                if entry.get('next'):
+                    queue.append(entry['next'])
+                continue
+            if response.status_code != 200:
+                self.stderr.write(f'{url} : réponse {response.status_code}, ignoré')
+                continue
+
+            next_url = self.rewrite_links(response)
+            response.render()
+            digest = hashlib.sha256(response.content).hexdigest()
+            if not entry or entry['sha256'] != digest or not (self.output / path).exists():
+                self.write(path, response.content)
+                written += 1
+            else:
+                unchanged += 1
+            files[path] = {'etag': response.get('ETag'), 'sha256': digest, 'next': next_url}
+            if next_url:
+                queue.append(next_url)
+
+        removed = 0
+        for path in old_files.keys() - files.keys():
+            for suffix in ('', '.gz', '.br'):
+                target = self.output / (path + suffix)
+                if target.exists():
+                    target.unlink()
+            removed += 1
+
+        self.save_manifest({'options': export_options, 'files': files})
+        self.stdout.write(
+            f'{written} fichier(s) écrit(s), {unchanged} inchangé(s), {removed} supprimé(s) dans {self.output}'
+        )
+
+    def get_urls(self):
+        """URLs de tous les endpoints publics, pour chaque variante de langue"""
+        request = self.factory.get(self.api_root, secure=self.secure)
+        urls = [url for urls in get_endpoints(request).values() for url in urls]
+        languages = [None] + get_language_codes()
+        return [
+            f'{url}?{urlencode({LANGUAGE_PARAM: language})}' if language else url
+            for language in languages
+            for url in urls
+        ]
+
+    def fetch(self, url, etag=None):
+        parsed = urlparse(url)
+        headers = {'HTTP_ACCEPT': 'application/json'}
+        if etag:
+            headers['HTTP_IF_NONE_MATCH'] = etag
+        request = self.factory.get(parsed.path, parse_qs(parsed.query), secure=self.secure, **headers)
+        match = resolve(parsed.path)
+        return match.func(request, *match.args, **match.kwargs)
+
+    def get_static_path(self, url):
+        """
+        /portfolio/projects/?lang=fr&page=2 -> fr/projects/page/2.json ;
+        sans ?lang, les fichiers contiennent toutes les traductions
+        """
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query)
+        parts = []
+        if LANGUAGE_PARAM in query:
+            parts.append(query[LANGUAGE_PARAM][0])
+        parts.append(parsed.path[len(self.api_root):].strip('/'))
+        page = query.get('page', ['1'])[0]
+        if page != '1':
+            parts += ['page', page]
+        return '/'.join(parts) + '.json'
+
+    def rewrite_links(self, response):
+        """Remplace les liens de pagination par les fichiers exportés ; retourne l'URL de la page suivante"""
+        data = response.data
+        if not (isinstance(data, dict) and 'next' in data and 'previous' in data):
+            return None
+        next_url = None
+        if data['next']:
+            parsed = urlparse(data['next'])
+            next_url = f'{parsed.path}?{parsed.query}'
+
+        def link(url):
+            return f'{self.base_url}/{self.get_static_path(url)}' if url else None
+
+        # Nouveau dict : response.data peut aussi avoir été placé dans le cache de l'API
+        response.data = {**data, 'next': link(data['next']), 'previous': link(data['previous'])}
+        return next_url
+
+    def write(self, path, content):
+        target = self.output / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        variants = [('', content), ('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content)))
+        for suffix, data in variants:
+            # Écriture atomique : un hébergement en cours de service ne lit jamais un fichier partiel
+            temporary = target.with_name(target.name + suffix + '.tmp')
+            temporary.write_bytes(data)
+            os.replace(temporary, target.with_name(target.name + suffix))
+
+    def load_manifest(self):
+        try:
+            return json.loads((self.output / MANIFEST_NAME).read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save_manifest(self, manifest):
+        self.output.mkdir(parents=True, exist_ok=True)
+        (self.output / MANIFEST_NAME).write_text(json.dumps(manifest, indent=1, sort_keys=True))
@@ -0,0 +1,31 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from portfoapp.cache import bump_version
+from portfoapp.images import (
+    ANIMATED_FIELDS, VARIANT_FIELDS, generate_animated_variants, generate_variants, refresh_variants
+)
+
+
+class Command(BaseCommand):
+    help = "Génère les variantes responsives et les conversions de GIF manquantes des images déjà téléversées"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Regénère toutes les variantes (après un changement de largeurs ou de formats)',
+        )
+
+    def handle(self, *args, **options):
+        for registry, generate in ((VARIANT_FIELDS, generate_variants), (ANIMATED_FIELDS, generate_animated_variants)):
+            for label, fields in registry.items():
+                model = apps.get_model(label)
+                queryset = model.objects.only('pk', 'updated_at', *fields, *fields.values()).order_by('pk')
+                updated = 0
+                for instance in queryset.iterator():
+                    if refresh_variants(instance, fields, generate, force=options['force']):
+                        updated += 1
+                if updated:
+                    bump_version(model)
+                field_names = ', '.join(fields)
+                self.stdout.write(f'{model._meta.verbose_name_plural} ({field_names}) : {updated} mis à jour')
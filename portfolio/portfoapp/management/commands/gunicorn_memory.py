@@ -0,0 +1,93 @@
+import os
+import runpy
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def read_proc(pid, name):
+    try:
+        with open(f'/proc/{pid}/{name}') as f:
+            return f.read()
+    except OSError:
+        return ''
+
+
+def memory_kb(pid):
+    """RSS, PSS (part des pages partagées) et mémoire privée d'un processus, en Ko"""
+    fields = {}
+    for line in (read_proc(pid, 'smaps_rollup') or read_proc(pid, 'status')).splitlines():
+        key, _, value = line.partition(':')
+        if value.strip().endswith('kB'):
+            fields[key] = int(value.split()[0])
+    rss = fields.get('Rss', fields.get('VmRSS', 0))
+    private = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    return rss, fields.get('Pss', rss), private or rss
+
+
+def parent_pid(pid):
+    for line in read_proc(pid, 'status').splitlines():
+        if line.startswith('PPid:'):
+            return int(line.split()[1])
+    return None
+
+
+def is_gunicorn(pid):
+    # `gunicorn ...`, `python -m gunicorn ...` ou titre « gunicorn: master » (setproctitle)
+    args = read_proc(pid, 'cmdline').split('\0')
+    return args[0].startswith('gunicorn:') or any(os.path.basename(arg) == 'gunicorn' for arg in args[:3])
+
+
+class Command(BaseCommand):
+    help = (
+        "Affiche la configuration calculée par gunicorn_config.py (CPU, mémoire, "
+        "workers, threads) et la mémoire (RSS, PSS, privée) de chaque worker lancé"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pid', type=int, help='PID du master gunicorn (détecté automatiquement sinon)')
+
+    def handle(self, *args, **options):
+        conf = runpy.run_path(str(settings.BASE_DIR / 'gunicorn_config.py'))
+        limit = conf['MEMORY_LIMIT']
+        self.stdout.write(
+            f"CPU utilisables : {conf['CPUS']}, limite mémoire : "
+            f"{f'{limit // 1024 // 1024} Mo' if limit else 'aucune'}"
+        )
+        self.stdout.write(
+            f"Configuration : {conf['workers']} workers {conf['worker_class']} × {conf['threads']} threads, "
+            f"preload_app={conf['preload_app']}, max_requests={conf['max_requests']} "
+            f"(+{conf['max_requests_jitter']})"
+        )
+
+        if not os.path.isdir('/proc'):
+            raise CommandError('/proc indisponible : mesure de la mémoire possible sous Linux uniquement')
+        pids = [int(name) for name in os.listdir('/proc') if name.isdigit()]
+        if options['pid']:
+            masters = [options['pid']]
+        else:
+            masters = [pid for pid in pids if is_gunicorn(pid) and not is_gunicorn(parent_pid(pid) or 0)]
+        if not masters:
+            self.stdout.write('Aucun master gunicorn en cours d\'exécution')
+            return
+
+        for master in masters:
+            workers = sorted(pid for pid in pids if parent_pid(pid) == master)
+            self.stdout.write(f"\n{'processus':<16} {'RSS Mo':>8} {'PSS Mo':>8} {'privée Mo':>10}")
+            totals = [0, 0, 0]
+            for label, pid in [(f'master {master}', master)] + [(f'worker {pid}', pid) for pid in workers]:
+                values = memory_kb(pid)
+                totals = [total + value for total, value in zip(totals, values)]
+                self.stdout.write(f'{label:<16} ' + ' '.join(
+                    f'{value / 1024:>{width}.1f}' for value, width in zip(values, (8, 8, 10))
+                ))
+            # La somme des PSS est l'empreinte réelle : les pages partagées n'y comptent qu'une fois
+            self.stdout.write(
+                f"{'total':<16} {totals[0] / 1024:>8.1f} {totals[1] / 1024:>8.1f} {totals[2] / 1024:>10.1f}"
+            )
+            if workers:
+                per_worker = sum(memory_kb(pid)[1] for pid in workers) / len(workers) / 1024
+                self.stdout.write(
+                    f'PSS moyenne par worker : {per_worker:.1f} Mo '
+                    f'(GUNICORN_WORKER_MEMORY_MB={conf["WORKER_MEMORY"]})'
+                )
@@ -0,0 +1,374 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from portfoapp.cache import bump_version
+from portfoapp.models import (
+    Article, ArticleCategory, ContactMessage, Experience, OutboxEmail, Project, ProjectCategory,
+    SiteSettings, Skill, SkillCategory, Tag, Technology
+)
+
+# Nombre de lignes par modèle pour --scale 1
+BASE_COUNTS = {
+    'skill_categories': 8,
+    'skills': 120,
+    'experiences': 40,
+    'project_categories': 20,
+    'technologies': 500,
+    'projects': 2_000,
+    'article_categories': 30,
+    'tags': 300,
+    'articles': 10_000,
+    'contact_messages': 1_000_000,
+    'outbox_emails': 20_000,
+}
+
+WORDS = {
+    'fr': (
+        'application données performance utilisateur interface serveur requête cache base index '
+        'déploiement conteneur architecture composant service réseau sécurité authentification '
+        'formulaire page rendu navigateur mobile accessibilité design projet équipe client produit '
+        'fonctionnalité test intégration livraison version migration modèle schéma recherche article '
+        'mesure latence débit mémoire processus fichier image format compression optimisation '
+        'rapide simple robuste moderne efficace lisible fiable évolutif léger complet nouveau '
+        'construire améliorer réduire mesurer servir charger afficher publier partager analyser '
+        'le la les un une des du de avec pour sans dans sur par entre chaque notre votre'
+    ).split(),
+    'en': (
+        'application data performance user interface server request cache database index '
+        'deployment container architecture component service network security authentication '
+        'form page rendering browser mobile accessibility design project team client product '
+        'feature test integration delivery release migration model schema search article '
+        'metric latency throughput memory process file image format compression optimization '
+        'fast simple robust modern efficient readable reliable scalable lightweight complete new '
+        'build improve reduce measure serve load display publish share analyze '
+        'the a an of with for without in on by between each our your'
+    ).split(),
+}
+
+TECHNOLOGIES = [
+    'Python', 'Django', 'React', 'TypeScript', 'PostgreSQL', 'SQLite', 'Redis', 'Docker', 'Nginx',
+    'Gunicorn', 'Vite', 'Tailwind', 'Node.js', 'GraphQL', 'Kubernetes', 'AWS', 'Celery', 'Pillow',
+]
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Désactive auto_now / auto_now_add pour insérer des dates réalistes"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un jeu de données volumineux et reproductible (graine fixe) pour les "
+        "tests de charge : tous les modèles, relations M2M et textes bilingues, par insertions groupées"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=float, default=1.0,
+            help='Facteur appliqué aux volumes (1 : 10 000 articles, 2 000 projets, 1 000 000 messages)',
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Graine du générateur aléatoire')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Lignes par INSERT groupé')
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Supprime d\'abord les données existantes (sinon la base doit être vide)',
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.counts = {
+            name: max(1, round(count * options['scale'])) for name, count in BASE_COUNTS.items()
+        }
+        # Réserve de phrases : assembler des phrases existantes est bien plus rapide que
+        # de tirer chaque mot, ce qui compte pour un million de messages
+        self.sentences = {
+            language: [self.make_sentence(words) for _ in range(2000)]
+            for language, words in WORDS.items()
+        }
+
+        models = [
+            OutboxEmail, ContactMessage, Article.tags.through, Article, Tag, ArticleCategory,
+            Project.technologies.through, Project, Technology, ProjectCategory, Experience, Skill, SkillCategory,
+        ]
+        if options['clear']:
+            # DELETE direct : QuerySet.delete() chargerait chaque ligne pour envoyer post_delete
+            with transaction.atomic(), connection.cursor() as cursor:
+                for model in models:
+                    cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+        elif any(model.objects.exists() for model in models):
+            raise CommandError('La base contient déjà des données : relancer avec --clear')
+
+        if connection.vendor == 'sqlite':
+            # Cache de pages plus grand (256 Mo) : les index des grandes tables sont
+            # alimentés dans le désordre (dates aléatoires)
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA cache_size = -262144')
+
+        started = time.perf_counter()
+        with transaction.atomic(), explicit_timestamps(*models):
+            self.seed_site_settings()
+            self.seed_skills()
+            self.seed_experiences()
+            self.seed_projects()
+            self.seed_articles()
+            self.seed_contact_messages()
+
+        # bulk_create n'envoie pas post_save : invalider les caches de l'API à la main
+        for model in models + [SiteSettings]:
+            bump_version(model)
+        SiteSettings.clear_cache()
+        self.stdout.write(f'Terminé en {time.perf_counter() - started:.1f} s')
+
+    # --- Génération de texte et de dates -------------------------------------
+
+    def make_sentence(self, words):
+        sentence = ' '.join(self.random.choices(words, k=self.random.randint(8, 20)))
+        return sentence[0].upper() + sentence[1:] + '.'
+
+    def text(self, language, sentences):
+        return ' '.join(self.random.choices(self.sentences[language], k=sentences))
+
+    def paragraphs(self, language, minimum, maximum):
+        return '\n\n'.join(
+            self.text(language, self.random.randint(3, 8))
+            for _ in range(self.random.randint(minimum, maximum))
+        )
+
+    def title(self, language):
+        return self.random.choice(self.sentences[language])[:-1][:120]
+
+    def past(self, days=5 * 365):
+        return self.now - timedelta(seconds=self.random.randint(0, days * 86400))
+
+    def timestamps(self):
+        created_at = self.past()
+        return {'created_at': created_at, 'updated_at': created_at + (self.now - created_at) * self.random.random() / 4}
+
+    # --- Insertions ------------------------------------------------------------
+
+    def bulk_create(self, model, objects):
+        """Insère par lots sans garder toutes les instances en mémoire ; retourne les clés"""
+        started = time.perf_counter()
+        objects = iter(objects)
+        pks = []
+        total = 0
+        while batch := list(islice(objects, self.batch_size)):
+            pks += [obj.pk for obj in model.objects.bulk_create(batch)]
+            total += len(batch)
+        self.report(model, total, started)
+        return pks
+
+    def insert_rows(self, model, names, rows):
+        """
+        INSERT groupés par executemany, sans instancier de modèles : pour les
+        tables volumineuses (un million de messages), le coût de l'ORM par
+        valeur dominerait le temps d'écriture
+        """
+        started = time.perf_counter()
+        quote = connection.ops.quote_name
+        fields = [model._meta.get_field(name) for name in names]
+        converters = []
+        for field in fields:
+            if field.get_internal_type() == 'DateTimeField':
+                converters.append(connection.ops.adapt_datetimefield_value)
+            elif field.get_internal_type() == 'JSONField':
+                converters.append(lambda value, field=field: field.get_db_prep_save(value, connection))
+            else:
+                converters.append(None)
+        sql = 'INSERT INTO %s (%s) VALUES (%s)' % (
+            quote(model._meta.db_table),
+            ', '.join(quote(field.column) for field in fields),
+            ', '.join(['%s'] * len(fields)),
+        )
+        rows = iter(rows)
+        total = 0
+        with connection.cursor() as cursor:
+            while batch := list(islice(rows, self.batch_size)):
+                cursor.executemany(sql, [
+                    tuple(convert(value) if convert else value for convert, value in zip(converters, row))
+                    for row in batch
+                ])
+                total += len(batch)
+        self.report(model, total, started)
+
+    def report(self, model, total, started):
+        self.stdout.write(
+            f'{model._meta.verbose_name_plural} : {total} en {time.perf_counter() - started:.1f} s'
+        )
+
+    def link(self, through, source, target, pairs):
+        """Relations M2M insérées directement dans la table intermédiaire"""
+        self.bulk_create(through, (
+            through(**{f'{source}_id': source_id, f'{target}_id': target_id})
+            for source_id, target_id in pairs
+        ))
+
+    def fan_out(self, source_pks, target_pks, minimum, maximum):
+        for source_pk in source_pks:
+            count = min(len(target_pks), self.random.randint(minimum, maximum))
+            for target_pk in self.random.sample(target_pks, count):
+                yield source_pk, target_pk
+
+    def seed_site_settings(self):
+        SiteSettings.objects.update_or_create(pk=1, defaults={
+            'owner_name': 'Jean Dupont',
+            'owner_email': 'contact@portfolio.test',
+            'owner_title_fr': 'Développeur Full Stack',
+            'owner_title_en': 'Full Stack Developer',
+            'owner_bio_fr': self.paragraphs('fr', 2, 3),
+            'owner_bio_en': self.paragraphs('en', 2, 3),
+            'site_description_fr': self.text('fr', 2),
+            'site_description_en': self.text('en', 2),
+        })
+
+    def seed_skills(self):
+        category_pks = self.bulk_create(SkillCategory, (
+            SkillCategory(name_fr=self.title('fr')[:100], name_en=self.title('en')[:100], order=i, **self.timestamps())
+            for i in range(self.counts['skill_categories'])
+        ))
+        self.bulk_create(Skill, (
+            Skill(
+                name=f'{self.random.choice(TECHNOLOGIES)} {i}', category_id=self.random.choice(category_pks),
+                skill_type=self.random.choice(('technical', 'technical', 'soft')),
+                level=self.random.randint(1, 10), order=i, **self.timestamps(),
+            )
+            for i in range(self.counts['skills'])
+        ))
+
+    def seed_experiences(self):
+        def experience(i):
+            start = self.past(15 * 365).date()
+            end = None if i % 10 == 0 else min(self.now.date(), start + timedelta(days=self.random.randint(90, 1500)))
+            return Experience(
+                title_fr=self.title('fr'), title_en=self.title('en'),
+                company_fr=self.title('fr')[:60], company_en=self.title('en')[:60],
+                description_fr=self.paragraphs('fr', 1, 3), description_en=self.paragraphs('en', 1, 3),
+                experience_type=self.random.choice(('professional', 'academic')),
+                start_date=start, end_date=end, location_fr='Paris, France', location_en='Paris, France',
+                order=i, **self.timestamps(),
+            )
+
+        self.bulk_create(Experience, (experience(i) for i in range(self.counts['experiences'])))
+
+    def seed_projects(self):
+        category_pks = self.bulk_create(ProjectCategory, (
+            ProjectCategory(
+                name_fr=self.title('fr')[:100], name_en=self.title('en')[:100], slug=f'categorie-{i}',
+                order=i, **self.timestamps(),
+            )
+            for i in range(self.counts['project_categories'])
+        ))
+        technology_pks = self.bulk_create(Technology, (
+            Technology(
+                name=TECHNOLOGIES[i] if i < len(TECHNOLOGIES) else f'{self.random.choice(TECHNOLOGIES)} {i}',
+                icon='code', **self.timestamps(),
+            )
+            for i in range(self.counts['technologies'])
+        ))
+        project_pks = self.bulk_create(Project, (
+            Project(
+                title_fr=self.title('fr'), title_en=self.title('en'), slug=f'projet-{i}',
+                description_fr=self.paragraphs('fr', 2, 5), description_en=self.paragraphs('en', 2, 5),
+                short_description_fr=self.text('fr', 2)[:300], short_description_en=self.text('en', 2)[:300],
+                category_id=self.random.choice(category_pks + [None]),
+                github_url=f'https://github.com/exemple/projet-{i}',
+                demo_url=f'https://projet-{i}.exemple.dev' if i % 3 else '',
+                featured=self.random.random() < 0.05, order=self.random.randint(0, 10),
+                **self.timestamps(),
+            )
+            for i in range(self.counts['projects'])
+        ))
+        self.link(
+            Project.technologies.through, 'project', 'technology', self.fan_out(project_pks, technology_pks, 2, 8)
+        )
+
+    def seed_articles(self):
+        category_pks = self.bulk_create(ArticleCategory, (
+            ArticleCategory(
+                name_fr=self.title('fr')[:100], name_en=self.title('en')[:100], slug=f'rubrique-{i}',
+                description_fr=self.text('fr', 2), description_en=self.text('en', 2), **self.timestamps(),
+            )
+            for i in range(self.counts['article_categories'])
+        ))
+        tag_pks = self.bulk_create(Tag, (
+            Tag(name=f'{self.random.choice(WORDS["en"])}-{i}', slug=f'tag-{i}', **self.timestamps())
+            for i in range(self.counts['tags'])
+        ))
+
+        def article(i):
+            published = self.random.random() < 0.9
+            timestamps = self.timestamps()
+            return Article(
+                title_fr=self.title('fr'), title_en=self.title('en'), slug=f'article-{i}',
+                excerpt_fr=self.text('fr', 2)[:500], excerpt_en=self.text('en', 2)[:500],
+                # 6 à 20 paragraphes : de 500 à 2 000 mots environ
+                content_fr=self.paragraphs('fr', 6, 20), content_en=self.paragraphs('en', 6, 20),
+                category_id=self.random.choice(category_pks + [None]), author='Jean Dupont',
+                published=published, featured=published and self.random.random() < 0.03,
+                views_count=int(self.random.paretovariate(1.2) * 10) if published else 0,
+                published_at=timestamps['created_at'] if published else None, **timestamps,
+            )
+
+        article_pks = self.bulk_create(Article, (article(i) for i in range(self.counts['articles'])))
+        self.link(Article.tags.through, 'article', 'tag', self.fan_out(article_pks, tag_pks, 1, 6))
+
+    def seed_contact_messages(self):
+        statuses = ('new', 'read', 'replied', 'archived')
+        # Corps de messages tirés d'une réserve, comme les phrases
+        bodies = [
+            self.text(language, self.random.randint(2, 8)) for language in ('fr', 'en') for _ in range(5000)
+        ]
+
+        def message(i):
+            created_at = self.past(3 * 365)
+            status = self.random.choice(statuses)
+            return (
+                f'Visiteur {i}', f'visiteur{i}@exemple.test', self.title('fr'), self.random.choice(bodies),
+                status, f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}',
+                'Mozilla/5.0 (X11; Linux x86_64) Firefox/128.0', created_at,
+                created_at + timedelta(days=1) if status == 'replied' else None,
+            )
+
+        self.insert_rows(
+            ContactMessage,
+            ('name', 'email', 'subject', 'message', 'status', 'ip_address', 'user_agent', 'created_at', 'replied_at'),
+            (message(i) for i in range(self.counts['contact_messages'])),
+        )
+
+        def email(i):
+            status = self.random.choice(('sent', 'sent', 'sent', 'pending', 'failed'))
+            created_at = self.past(3 * 365)
+            return (
+                f'Nouveau message de contact : {self.title("fr")[:150]}', self.text('fr', 4),
+                'noreply@portfolio.test', ['contact@portfolio.test'], [], status,
+                1 if status == 'sent' else self.random.randint(0, 5), created_at, '', created_at,
+                created_at if status == 'sent' else None,
+            )
+
+        self.insert_rows(
+            OutboxEmail,
+            ('subject', 'body', 'from_email', 'recipients', 'reply_to', 'status', 'attempts',
+             'next_attempt_at', 'last_error', 'created_at', 'sent_at'),
+            (email(i) for i in range(self.counts['outbox_emails'])),
+        )
@@ -0,0 +1,51 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfoapp.outbox import OutboxWorker
+
+
+class Command(BaseCommand):
+    help = "Envoie les emails de la boîte d'envoi (worker à lancer à côté de gunicorn)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Envoie les emails dus puis s\'arrête (cron, tests)',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Nombre d\'emails réservés par lot (OUTBOX_BATCH_SIZE par défaut)',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=None,
+            help='Secondes entre deux scrutations de la file (OUTBOX_POLL_INTERVAL par défaut)',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or settings.OUTBOX_POLL_INTERVAL
+        worker = OutboxWorker(batch_size=options['batch_size'])
+        self.stopping = False
+        if not options['once']:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+        try:
+            while not self.stopping:
+                if worker.process_batch():
+                    continue
+                if options['once']:
+                    break
+                # File vide : on libère la connexion SMTP en attendant
+                worker.close()
+                time.sleep(interval)
+        finally:
+            worker.close()
+
+        self.stdout.write(f'{worker.sent} email(s) envoyé(s), {worker.failed} échec(s)')
+
+    def stop(self, signum, frame):
+        # Termine le lot en cours avant de s'arrêter
+        self.stopping = True
@@ -0,0 +1,155 @@
+"""
+Service des fichiers média (/media/) en production
+
+Remplace django.views.static.serve :
+- requêtes Range (un seul intervalle) pour le CV et les vidéos ;
+- ETag fort et Last-Modified, réponses 304 sur If-None-Match / If-Modified-Since ;
+- `Cache-Control: immutable` pour les variantes d'images générées (nom avec
+  empreinte du contenu, dans un répertoire variants/), revalidation sinon ;
+- transfert délégué au proxy (MEDIA_OFFLOAD = 'x-accel-redirect' pour nginx,
+  'x-sendfile' pour Apache / lighttpd) : le worker ne fait qu'un stat().
+"""
+import hashlib
+import mimetypes
+import os
+import re
+from stat import S_ISREG
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def get_etag(stat):
+    # Fort : taille, date de modification (ns) et inode identifient le contenu servi
+    key = f'{stat.st_size}-{stat.st_mtime_ns}-{stat.st_ino}'
+    return '"%s"' % hashlib.md5(key.encode()).hexdigest()
+
+
+def is_immutable(path):
+    return re.search(settings.MEDIA_IMMUTABLE_PATTERN, path) is not None
+
+
+def get_cache_control(path):
+    if is_immutable(path):
+        return 'public, max-age=31536000, immutable'
+    return f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+
+
+def parse_range(header, size):
+    """
+    Retourne (début, fin incluse) pour un intervalle unique, None pour servir
+    le fichier entier (en-tête absent, multiple ou invalide), ou False si
+    l'intervalle est hors du fichier.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if start == '':
+        # bytes=-N : les N derniers octets
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def if_range_matches(request, etag, last_modified):
+    """If-Range : l'intervalle ne s'applique que si le fichier n'a pas changé"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    date = parse_http_date_safe(if_range)
+    return date is not None and date >= last_modified
+
+
+def read_range(path, start, end):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def offload_response(path, full_path):
+    response = HttpResponse()
+    if settings.MEDIA_OFFLOAD == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = settings.MEDIA_OFFLOAD_PREFIX + quote(path)
+    else:
+        response['X-Sendfile'] = full_path
+    # Le proxy fixe le type, la taille et gère Range à partir du fichier
+    del response['Content-Type']
+    return response
+
+
+def file_response(request, full_path, size, etag, last_modified):
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    if encoding:
+        content_type = {'gzip': 'application/gzip', 'bzip2': 'application/x-bzip', 'xz': 'application/x-xz'}.get(
+            encoding, content_type
+        )
+
+    header = request.META.get('HTTP_RANGE')
+    byte_range = None
+    if header and if_range_matches(request, etag, last_modified):
+        byte_range = parse_range(header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(read_range(full_path, start, end), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    else:
+        # FileResponse passe par wsgi.file_wrapper (sendfile sous gunicorn)
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, FileNotFoundError, NotADirectoryError):
+        raise Http404('Fichier introuvable')
+    if not S_ISREG(stat.st_mode):
+        raise Http404('Fichier introuvable')
+
+    etag = get_etag(stat)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if settings.MEDIA_OFFLOAD:
+            response = offload_response(path, full_path)
+        else:
+            response = file_response(request, full_path, stat.st_size, etag, last_modified)
+
+    if response.status_code in (200, 206, 304):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = get_cache_control(path)
+    return response
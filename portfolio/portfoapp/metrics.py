@@ -0,0 +1,94 @@
+"""
+Métriques Prometheus de l'application, exposées sur /metrics
+
+- portfolio_http_request_duration_seconds : latence par route (nom d'URL,
+  ex. `project-list`) et méthode ;
+- portfolio_http_responses_total : réponses par route, méthode et statut ;
+- portfolio_db_queries_per_request : requêtes SQL par requête HTTP et route ;
+- portfolio_cache_lookups_total : succès / échecs des caches de l'API et
+  des sitemaps (taux de succès = hit / (hit + miss)) ;
+- portfolio_emails_total : notifications de contact mises en file, ignorées
+  (email du propriétaire non configuré), envoyées ou en échec (send_outbox).
+
+Sous gunicorn, chaque worker écrit ses valeurs dans PROMETHEUS_MULTIPROC_DIR
+(voir gunicorn_config.py) et /metrics agrège tous les processus.
+"""
+import hmac
+import os
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_safe
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    'portfolio_http_request_duration_seconds', 'Durée des requêtes HTTP',
+    ['route', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RESPONSES = Counter(
+    'portfolio_http_responses', 'Réponses HTTP par statut',
+    ['route', 'method', 'status'],
+)
+DB_QUERIES = Histogram(
+    'portfolio_db_queries_per_request', 'Requêtes SQL par requête HTTP',
+    ['route'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+CACHE_LOOKUPS = Counter(
+    'portfolio_cache_lookups', 'Consultations des caches de réponses',
+    ['cache', 'result'],
+)
+EMAILS = Counter(
+    'portfolio_emails', 'Notifications de contact par étape',
+    ['event'],
+)
+
+# Route des requêtes qui ne correspondent à aucune URL (limite la cardinalité)
+UNMATCHED_ROUTE = 'unmatched'
+
+
+def get_route(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None and match.view_name else UNMATCHED_ROUTE
+
+
+def observe_request(request, response, duration, queries):
+    route = get_route(request)
+    REQUEST_LATENCY.labels(route, request.method).observe(duration)
+    RESPONSES.labels(route, request.method, str(response.status_code)).inc()
+    DB_QUERIES.labels(route).observe(queries)
+
+
+def record_cache_lookup(cache, hit):
+    CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def record_email(event):
+    EMAILS.labels(event).inc()
+
+
+def get_registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        # Un registre neuf par collecte : les fichiers de tous les workers sont relus
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+@require_safe
+def metrics_view(request):
+    """
+    Point de collecte Prometheus, protégé par METRICS_TOKEN. Sans jeton, il
+    n'est servi qu'en développement (DEBUG) : 404 en production.
+    """
+    if not settings.METRICS_ENABLED or not (settings.METRICS_TOKEN or settings.DEBUG):
+        raise Http404
+    if settings.METRICS_TOKEN:
+        expected = f'Bearer {settings.METRICS_TOKEN}'
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+            return HttpResponse(status=401, headers={'WWW-Authenticate': 'Bearer'})
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
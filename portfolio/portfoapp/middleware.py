@@ -0,0 +1,146 @@
+"""
+Middlewares de l'application portfolio
+"""
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .metrics import observe_request
+from .timing import ServerTiming, activate_timing, current_timing, deactivate_timing
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise utilisable sous ASGI sans repasser en synchrone : le
+    middleware d'origine ne l'est pas, ce qui ferait exécuter toute la suite
+    de la chaîne (et les vues asynchrones) dans un thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class ServerTimingMiddleware:
+    """
+    Ajoute l'en-tête Server-Timing (SQL, sérialisation, rendu, appels
+    sortants, total) si SERVER_TIMING_ENABLED ; voir portfoapp/timing.py.
+    Compatible WSGI et ASGI sans repasser en synchrone.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.SERVER_TIMING_ENABLED:
+            return self.get_response(request)
+        timing = ServerTiming()
+        token = activate_timing(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            deactivate_timing(token)
+        response['Server-Timing'] = timing.header()
+        return response
+
+    async def __acall__(self, request):
+        if not settings.SERVER_TIMING_ENABLED:
+            return await self.get_response(request)
+        timing = ServerTiming()
+        token = activate_timing(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            deactivate_timing(token)
+        response['Server-Timing'] = timing.header()
+        return response
+
+    def process_template_response(self, request, response):
+        # Appelé juste avant response.render() : le rappel post-rendu clôt la mesure
+        timing = current_timing()
+        if timing is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: timing.add('render', time.perf_counter() - started)
+            )
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Alimente les métriques Prometheus (latence, statut, requêtes SQL par
+    route) ; voir portfoapp/metrics.py. Placé après ServerTimingMiddleware,
+    il en réutilise la mesure des requêtes SQL.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        timing, token = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            self.finish(token)
+        self.observe(request, response, timing)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+        timing, token = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.finish(token)
+        self.observe(request, response, timing)
+        return response
+
+    def start(self):
+        # Sans en-tête Server-Timing, une mesure propre compte les requêtes SQL
+        timing = current_timing()
+        if timing is not None:
+            return timing, None
+        timing = ServerTiming()
+        return timing, activate_timing(timing)
+
+    def finish(self, token):
+        if token is not None:
+            deactivate_timing(token)
+
+    def observe(self, request, response, timing):
+        queries = timing.metrics.get('db', (0.0, 0))[1]
+        observe_request(request, response, time.perf_counter() - timing.started, queries)
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfoapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlecategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Date de mise à jour'),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Date de mise à jour'),
+        ),
+        migrations.AddField(
+            model_name='projectcategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Date de mise à jour'),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Date de mise à jour'),
+        ),
+        migrations.AddField(
+            model_name='skillcategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Date de mise à jour'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Date de mise à jour'),
+        ),
+        migrations.AddField(
+            model_name='technology',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Date de mise à jour'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+from portfoapp import search
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for label, languages in search.SEARCH_INDEXES.items():
+        db_table = apps.get_model(label)._meta.db_table
+        if vendor == 'postgresql':
+            search.create_postgres_index(schema_editor, db_table, languages)
+        elif vendor == 'sqlite':
+            with schema_editor.connection.cursor() as cursor:
+                search.create_sqlite_index(cursor, db_table, languages, rebuild=True)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for label, languages in search.SEARCH_INDEXES.items():
+        db_table = apps.get_model(label)._meta.db_table
+        if vendor == 'postgresql':
+            search.drop_postgres_index(schema_editor, db_table, languages)
+        elif vendor == 'sqlite':
+            with schema_editor.connection.cursor() as cursor:
+                search.drop_sqlite_index(cursor, db_table, languages)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfoapp', '0002_updated_at_timestamps'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:55
+
+from django.db import migrations, models
+
+
+def create_keyset_index(apps, schema_editor):
+    # Sous PostgreSQL, DESC place les NULL en tête : la pagination par curseur
+    # (published_at DESC NULLS LAST) a besoin de son propre index. SQLite place
+    # déjà les NULL en fin de tri descendant et réutilise article_published_idx.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS article_published_keyset_idx ON portfoapp_article '
+            '(published_at DESC NULLS LAST, created_at DESC, id DESC) WHERE published'
+        )
+
+
+def drop_keyset_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS article_published_keyset_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfoapp', '0003_full_text_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('published', True)), fields=['-published_at', '-created_at', '-id'], name='article_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['status', '-created_at'], name='contact_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-created_at'], name='contact_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-featured', '-order', '-created_at', '-id'], name='project_list_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['category', '-featured', '-order', '-created_at'], name='project_category_list_idx'),
+        ),
+        migrations.RunPython(create_keyset_index, drop_keyset_index),
+    ]
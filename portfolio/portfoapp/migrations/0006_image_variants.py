@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfoapp', '0005_outbox_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='featured_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="Variantes de l'image vedette"),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="Variantes de l'image"),
+        ),
+        migrations.AddField(
+            model_name='sitesettings',
+            name='owner_photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Variantes de la photo'),
+        ),
+    ]
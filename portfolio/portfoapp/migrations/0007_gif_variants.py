@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfoapp', '0006_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='gif_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Variantes du GIF'),
+        ),
+    ]
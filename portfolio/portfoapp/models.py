@@ -1,4 +1,9 @@
+import threading
+import time
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError
@@ -11,6 +16,7 @@ class SkillCategory(models.Model):
     icon = models.CharField(_('Icône'), max_length=50, blank=True, help_text="Nom de l'icône Lucide")
     order = models.IntegerField(_('Ordre'), default=0)
     created_at = models.DateTimeField(_('Date de création'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('Date de mise à jour'), auto_now=True)
 
     class Meta:
         verbose_name = _('Catégorie de compétence')
@@ -21,6 +27,14 @@ class SkillCategory(models.Model):
         return self.name_fr
 
 
+class SkillQuerySet(models.QuerySet):
+    def for_api(self):
+        """Charge la catégorie en jointure, sans les colonnes non sérialisées"""
+        return self.select_related('category').defer(
+            'created_at', 'updated_at', 'category__created_at', 'category__updated_at'
+        )
+
+
 class Skill(models.Model):
     """Compétence technique ou soft skill"""
     SKILL_TYPE_CHOICES = [
@@ -35,6 +49,9 @@ class Skill(models.Model):
     icon = models.CharField(_('Icône'), max_length=50, blank=True, help_text="Nom de l'icône Lucide")
     order = models.IntegerField(_('Ordre'), default=0)
     created_at = models.DateTimeField(_('Date de création'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('Date de mise à jour'), auto_now=True)
+
+    objects = SkillQuerySet.as_manager()
 
     class Meta:
         verbose_name = _('Compétence')
@@ -65,6 +82,7 @@ class Experience(models.Model):
     location_en = models.CharField(_('Lieu (EN)'), max_length=200, blank=True)
     order = models.IntegerField(_('Ordre'), default=0)
     created_at = models.DateTimeField(_('Date de création'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('Date de mise à jour'), auto_now=True)
 
     class Meta:
         verbose_name = _('Expérience')
@@ -87,6 +105,7 @@ class ProjectCategory(models.Model):
     color = models.CharField(_('Couleur'), max_length=7, default='#4e598c', help_text="Code couleur hexadécimal")
     order = models.IntegerField(_('Ordre'), default=0)
     created_at = models.DateTimeField(_('Date de création'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('Date de mise à jour'), auto_now=True)
 
     class Meta:
         verbose_name = _('Catégorie de projet')
@@ -103,6 +122,7 @@ class Technology(models.Model):
     icon = models.CharField(_('Icône'), max_length=50, blank=True, help_text="Nom de l'icône Lucide")
     color = models.CharField(_('Couleur'), max_length=7, default='#4e598c', help_text="Code couleur hexadécimal")
     created_at = models.DateTimeField(_('Date de création'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('Date de mise à jour'), auto_now=True)
 
     class Meta:
         verbose_name = _('Technologie')
@@ -113,6 +133,17 @@ class Technology(models.Model):
         return self.name
 
 
+class ProjectQuerySet(models.QuerySet):
+    def for_api(self):
+        """
+        Charge la catégorie en jointure et les technologies en une seule
+        requête supplémentaire, quel que soit le nombre de projets
+        """
+        return self.select_related('category').defer('category__created_at', 'category__updated_at').prefetch_related(
+            models.Prefetch('technologies', queryset=Technology.objects.only('id', 'name', 'icon', 'color'))
+        )
+
+
 class Project(models.Model):
     """Projet portfolio"""
     title_fr = models.CharField(_('Titre (FR)'), max_length=200)
@@ -123,8 +154,10 @@ class Project(models.Model):
     short_description_fr = models.CharField(_('Description courte (FR)'), max_length=300)
     short_description_en = models.CharField(_('Description courte (EN)'), max_length=300)
     image = models.ImageField(_('Image principale'), upload_to='projects/', blank=True, null=True)
+    image_variants = models.JSONField(_('Variantes de l\'image'), default=dict, blank=True, editable=False)
     video_url = models.URLField(_('URL vidéo'), blank=True, help_text="URL YouTube, Vimeo, etc.")
     gif = models.ImageField(_('GIF'), upload_to='projects/gifs/', blank=True, null=True)
+    gif_variants = models.JSONField(_('Variantes du GIF'), default=dict, blank=True, editable=False)
     category = models.ForeignKey(ProjectCategory, on_delete=models.SET_NULL, null=True, blank=True, related_name='projects')
     technologies = models.ManyToManyField(Technology, related_name='projects', blank=True)
     github_url = models.URLField(_('URL GitHub'), blank=True)
@@ -134,10 +167,18 @@ class Project(models.Model):
     created_at = models.DateTimeField(_('Date de création'), auto_now_add=True)
     updated_at = models.DateTimeField(_('Date de mise à jour'), auto_now=True)
 
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Projet')
         verbose_name_plural = _('Projets')
         ordering = ['-featured', '-order', '-created_at']
+        indexes = [
+            # Tri par défaut, filtre `featured` et pagination par curseur
+            models.Index(fields=['-featured', '-order', '-created_at', '-id'], name='project_list_idx'),
+            # Liste filtrée par catégorie
+            models.Index(fields=['category', '-featured', '-order', '-created_at'], name='project_category_list_idx'),
+        ]
 
     def __str__(self):
         return self.title_fr
@@ -155,6 +196,7 @@ class ArticleCategory(models.Model):
     description_fr = models.TextField(_('Description (FR)'), blank=True)
     description_en = models.TextField(_('Description (EN)'), blank=True)
     created_at = models.DateTimeField(_('Date de création'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('Date de mise à jour'), auto_now=True)
 
     class Meta:
         verbose_name = _('Catégorie d\'article')
@@ -170,6 +212,7 @@ class Tag(models.Model):
     name = models.CharField(_('Nom'), max_length=50, unique=True)
     slug = models.SlugField(_('Slug'), unique=True)
     created_at = models.DateTimeField(_('Date de création'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('Date de mise à jour'), auto_now=True)
 
     class Meta:
         verbose_name = _('Tag')
@@ -180,6 +223,20 @@ class Tag(models.Model):
         return self.name
 
 
+class ArticleQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(published=True)
+
+    def for_api(self):
+        """
+        Charge la catégorie en jointure et les tags en une seule requête
+        supplémentaire, quel que soit le nombre d'articles
+        """
+        return self.select_related('category').defer('category__created_at', 'category__updated_at').prefetch_related(
+            models.Prefetch('tags', queryset=Tag.objects.only('id', 'name', 'slug'))
+        )
+
+
 class Article(models.Model):
     """Article de blog"""
     title_fr = models.CharField(_('Titre (FR)'), max_length=200)
@@ -190,6 +247,7 @@ class Article(models.Model):
     content_fr = models.TextField(_('Contenu (FR)'))
     content_en = models.TextField(_('Contenu (EN)'))
     featured_image = models.ImageField(_('Image vedette'), upload_to='articles/', blank=True, null=True)
+    featured_image_variants = models.JSONField(_('Variantes de l\'image vedette'), default=dict, blank=True, editable=False)
     category = models.ForeignKey(ArticleCategory, on_delete=models.SET_NULL, null=True, blank=True, related_name='articles')
     tags = models.ManyToManyField(Tag, related_name='articles', blank=True)
     author = models.CharField(_('Auteur'), max_length=100, default='Portfolio Owner')
@@ -200,10 +258,21 @@ class Article(models.Model):
     updated_at = models.DateTimeField(_('Date de mise à jour'), auto_now=True)
     published_at = models.DateTimeField(_('Date de publication'), null=True, blank=True)
 
+    objects = ArticleQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Article')
         verbose_name_plural = _('Articles')
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            # Seuls les articles publiés sont servis par l'API
+            # (voir aussi l'index NULLS LAST PostgreSQL de la migration 0004)
+            models.Index(
+                fields=['-published_at', '-created_at', '-id'],
+                condition=models.Q(published=True),
+                name='article_published_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title_fr
@@ -232,11 +301,56 @@ class ContactMessage(models.Model):
         verbose_name = _('Message de contact')
         verbose_name_plural = _('Messages de contact')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='contact_status_idx'),
+            models.Index(fields=['-created_at'], name='contact_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.subject}"
 
 
+class OutboxEmail(models.Model):
+    """Email à envoyer par le worker `send_outbox` (hors requête HTTP)"""
+    STATUS_CHOICES = [
+        ('pending', _('En attente')),
+        ('sent', _('Envoyé')),
+        ('failed', _('Échec')),
+    ]
+
+    contact_message = models.ForeignKey(
+        ContactMessage, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='emails', verbose_name=_('Message de contact')
+    )
+    subject = models.CharField(_('Objet'), max_length=255)
+    body = models.TextField(_('Contenu'))
+    from_email = models.CharField(_('Expéditeur'), max_length=254)
+    recipients = models.JSONField(_('Destinataires'), default=list)
+    reply_to = models.JSONField(_('Répondre à'), default=list, blank=True)
+    status = models.CharField(_('Statut'), max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(_('Tentatives'), default=0)
+    next_attempt_at = models.DateTimeField(_('Prochaine tentative'), default=timezone.now)
+    last_error = models.TextField(_('Dernière erreur'), blank=True)
+    created_at = models.DateTimeField(_('Date de création'), auto_now_add=True)
+    sent_at = models.DateTimeField(_('Date d\'envoi'), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('Email sortant')
+        verbose_name_plural = _('Emails sortants')
+        ordering = ['-created_at']
+        indexes = [
+            # File d'attente du worker
+            models.Index(
+                fields=['next_attempt_at'],
+                condition=models.Q(status='pending'),
+                name='outbox_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} ({self.get_status_display()})"
+
+
 class SiteSettings(models.Model):
     """Paramètres du site (singleton)"""
     site_name_fr = models.CharField(_('Nom du site (FR)'), max_length=200, default='Mon Portfolio')
@@ -249,6 +363,7 @@ class SiteSettings(models.Model):
     owner_bio_fr = models.TextField(_('Biographie (FR)'))
     owner_bio_en = models.TextField(_('Biographie (EN)'))
     owner_photo = models.ImageField(_('Photo'), upload_to='profile/', blank=True, null=True)
+    owner_photo_variants = models.JSONField(_('Variantes de la photo'), default=dict, blank=True, editable=False)
     owner_email = models.EmailField(_('Email'))
     owner_phone = models.CharField(_('Téléphone'), max_length=20, blank=True)
     owner_location_fr = models.CharField(_('Localisation (FR)'), max_length=200, blank=True)
@@ -276,24 +391,50 @@ class SiteSettings(models.Model):
     def __str__(self):
         return f"Paramètres - {self.owner_name}"
 
+    # Cache local au processus : (instance, updated_at lu en base, expiration)
+    _cached = None
+    _cache_lock = threading.Lock()
+
     def save(self, *args, **kwargs):
-    # S'assurer qu'il n'y a qu'une seule instance
+        # S'assurer qu'il n'y a qu'une seule instance : c'est toujours pk=1
         if not self.pk:
-            # Si c'est une nouvelle instance, vérifier s'il en existe déjà une
-            existing = SiteSettings.objects.first()
-            if existing:
-                self.pk = existing.pk
+            self.pk = 1
         super().save(*args, **kwargs)
+        # Les autres workers verront le nouvel `updated_at` à l'expiration de leur copie
+        SiteSettings.clear_cache()
 
     @classmethod
-    def load(cls):
-        obj, created = cls.objects.get_or_create(pk=1, defaults={
-            'owner_name': 'Votre Nom',
-            'owner_title_fr': 'Développeur',
-            'owner_title_en': 'Developer',
-            'owner_bio_fr': 'Biographie en français',
-            'owner_bio_en': 'Biography in English',
-            'owner_email': 'email@example.com',
-        })
-        return obj
+    def clear_cache(cls):
+        cls._cached = None
 
+    @classmethod
+    def load(cls):
+        """
+        Retourne l'instance unique depuis un cache local au processus.
+        Après SITE_SETTINGS_CACHE_TTL secondes, `updated_at` est relu en base
+        (une colonne, par clé primaire) : l'instance n'est rechargée que s'il
+        a changé, quel que soit le worker qui a enregistré la modification.
+        """
+        cached = cls._cached
+        now = time.monotonic()
+        if cached is not None and now < cached[2]:
+            return cached[0]
+
+        with cls._cache_lock:
+            ttl = getattr(settings, 'SITE_SETTINGS_CACHE_TTL', 60)
+            if cached is not None:
+                updated_at = cls.objects.filter(pk=1).values_list('updated_at', flat=True).first()
+                if updated_at == cached[1]:
+                    cls._cached = (cached[0], updated_at, now + ttl)
+                    return cached[0]
+
+            obj, created = cls.objects.get_or_create(pk=1, defaults={
+                'owner_name': 'Votre Nom',
+                'owner_title_fr': 'Développeur',
+                'owner_title_en': 'Developer',
+                'owner_bio_fr': 'Biographie en français',
+                'owner_bio_en': 'Biography in English',
+                'owner_email': 'email@example.com',
+            })
+            cls._cached = (obj, obj.updated_at, now + ttl)
+            return obj
@@ -0,0 +1,161 @@
+"""
+Boîte d'envoi transactionnelle des emails
+
+La notification d'un message de contact est enregistrée dans OutboxEmail
+dans la même transaction que le ContactMessage : la requête HTTP répond dès
+le commit, sans attendre le serveur SMTP. La commande `send_outbox` (processus
+séparé) envoie ensuite les emails dus sur une seule connexion SMTP réutilisée
+et retente les échecs avec un délai exponentiel.
+
+Les lignes sont réservées par un bail court (next_attempt_at repoussé) avant
+l'envoi : aucune transaction ne reste ouverte pendant le dialogue SMTP, et un
+worker interrompu voit ses emails repris à l'expiration du bail.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .metrics import record_email
+from .models import OutboxEmail, SiteSettings
+
+logger = logging.getLogger(__name__)
+
+CONTACT_NOTIFICATION_BODY = '''
+Nouveau message de contact reçu:
+
+Nom: {message.name}
+Email: {message.email}
+Objet: {message.subject}
+
+Message:
+{message.message}
+
+---
+Date: {message.created_at}
+IP: {message.ip_address}
+'''
+
+
+def enqueue_contact_notification(message):
+    """Ajoute la notification du propriétaire à la boîte d'envoi (à appeler dans la transaction)"""
+    site_settings = SiteSettings.load()
+    if not site_settings.owner_email or site_settings.owner_email == 'email@example.com':
+        logger.warning(
+            "L'email du propriétaire n'est pas configuré dans SiteSettings "
+            "(/admin/portfoapp/sitesettings/) : aucune notification pour le message %s", message.pk
+        )
+        record_email('skipped')
+        return None
+    record_email('queued')
+    return OutboxEmail.objects.create(
+        contact_message=message,
+        subject=f'[Portfolio] Nouveau message: {message.subject}',
+        body=CONTACT_NOTIFICATION_BODY.format(message=message),
+        from_email=settings.EMAIL_HOST_USER or settings.DEFAULT_FROM_EMAIL,
+        recipients=[site_settings.owner_email],
+        reply_to=[message.email],
+    )
+
+
+def get_retry_delay(attempts):
+    """Délai avant la tentative suivante : OUTBOX_RETRY_DELAY × 2^(n-1), plafonné"""
+    delay = settings.OUTBOX_RETRY_DELAY * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.OUTBOX_RETRY_MAX_DELAY))
+
+
+class OutboxWorker:
+    """Envoie les emails en attente par lots, sur une connexion SMTP conservée entre les lots"""
+
+    def __init__(self, batch_size=None):
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.connection = None
+        self.sent = 0
+        self.failed = 0
+
+    def claim(self):
+        """Réserve les prochains emails dus et retourne leurs instances"""
+        now = timezone.now()
+        with transaction.atomic():
+            ids = list(
+                OutboxEmail.objects
+                .filter(status='pending', next_attempt_at__lte=now)
+                .order_by('next_attempt_at')
+                .select_for_update(skip_locked=True)
+                .values_list('pk', flat=True)[:self.batch_size]
+            )
+            OutboxEmail.objects.filter(pk__in=ids).update(
+                next_attempt_at=now + timedelta(seconds=settings.OUTBOX_LEASE)
+            )
+        return list(OutboxEmail.objects.filter(pk__in=ids).order_by('created_at'))
+
+    def process_batch(self):
+        """Envoie un lot ; retourne le nombre d'emails traités (0 si la file est vide)"""
+        emails = self.claim()
+        for index, email in enumerate(emails):
+            try:
+                self.open()
+            except Exception as exc:
+                # Serveur injoignable : tout le reste du lot est reporté
+                self.close()
+                for pending in emails[index:]:
+                    self.record_failure(pending, exc)
+                break
+            self.deliver(email)
+        return len(emails)
+
+    def open(self):
+        if self.connection is None:
+            self.connection = get_connection(fail_silently=False)
+        # Sans effet si la connexion est déjà ouverte
+        self.connection.open()
+
+    def close(self):
+        """Ferme la connexion SMTP (appelé quand la file est vide et à l'arrêt)"""
+        if self.connection is None:
+            return
+        try:
+            self.connection.close()
+        except Exception:
+            logger.exception('Erreur à la fermeture de la connexion SMTP')
+        self.connection = None
+
+    def deliver(self, email):
+        message = EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            from_email=email.from_email,
+            to=email.recipients,
+            reply_to=email.reply_to,
+            connection=self.connection,
+        )
+        try:
+            message.send()
+        except Exception as exc:
+            # La connexion peut être dans un état incohérent : elle sera rouverte
+            self.close()
+            self.record_failure(email, exc)
+            return
+        email.status = 'sent'
+        email.attempts += 1
+        email.sent_at = timezone.now()
+        email.last_error = ''
+        email.save(update_fields=['status', 'attempts', 'sent_at', 'last_error'])
+        self.sent += 1
+        record_email('sent')
+
+    def record_failure(self, email, exc):
+        email.attempts += 1
+        email.last_error = f'{type(exc).__name__}: {exc}'
+        if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            email.status = 'failed'
+            logger.error('Abandon de l\'email %s après %s tentatives : %s', email.pk, email.attempts, email.last_error)
+        else:
+            email.next_attempt_at = timezone.now() + get_retry_delay(email.attempts)
+            logger.warning('Échec de l\'envoi de l\'email %s (tentative %s) : %s', email.pk, email.attempts, email.last_error)
+        email.save(update_fields=['status', 'attempts', 'next_attempt_at', 'last_error'])
+        self.failed += 1
+        record_email('failed')
@@ -0,0 +1,146 @@
+"""
+Pagination par clé (keyset) pour le défilement infini
+
+Contrairement à PageNumberPagination, aucune requête COUNT(*) n'est
+exécutée et les pages profondes ne parcourent pas les lignes précédentes
+(pas d'OFFSET) : le curseur contient les valeurs de tri de la dernière
+ligne renvoyée, et la page suivante est filtrée avec une comparaison
+lexicographique sur ces colonnes. La dernière colonne (id) départage les
+égalités pour un ordre stable.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Curseur invalide'
+    # Colonnes de tri ; la dernière doit être unique
+    ordering = ('-id',)
+
+    def get_fields(self, model):
+        return [
+            (name.lstrip('-'), name.startswith('-'), model._meta.get_field(name.lstrip('-')))
+            for name in self.ordering
+        ]
+
+    def get_order_by(self, fields):
+        order_by = []
+        for name, descending, field in fields:
+            # Les valeurs NULL sont toujours placées en fin de liste
+            nulls_last = True if field.null else None
+            direction = 'desc' if descending else 'asc'
+            order_by.append(getattr(F(name), direction)(nulls_last=nulls_last))
+        return order_by
+
+    def get_position_filter(self, fields, position):
+        """Lignes situées strictement après `position` dans l'ordre de tri"""
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (name, descending, field), value in zip(fields, position):
+            if value is None:
+                # Rien n'est placé après NULL, seules les égalités continuent
+                after = None
+                same = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+                if field.null:
+                    after |= Q(**{f'{name}__isnull': True})
+                same = Q(**{name: value})
+            if after is not None:
+                condition |= equal & after
+            equal &= same
+        return condition
+
+    def encode_cursor(self, fields, obj):
+        values = []
+        for _, _, field in fields:
+            # Instance de modèle, ou ligne de values() (sérialiseurs compilés)
+            value = obj[field.attname] if isinstance(obj, dict) else getattr(obj, field.attname)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, fields, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [
+                None if value is None else field.to_python(value)
+                for (_, _, field), value in zip(fields, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        fields = self.get_fields(queryset.model)
+        queryset = queryset.order_by(*self.get_order_by(fields))
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.get_position_filter(fields, self.decode_cursor(fields, cursor)))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[:self.page_size]
+        self.next_cursor = self.encode_cursor(fields, results[-1]) if self.has_next else None
+        return results
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class ArticleKeysetPagination(KeysetPagination):
+    ordering = ('-published_at', '-created_at', '-id')
+
+
+class ProjectKeysetPagination(KeysetPagination):
+    ordering = ('-featured', '-order', '-created_at', '-id')
+
+
+class OptionalKeysetPaginationMixin:
+    """
+    Active la pagination par clé quand la requête contient `?cursor=`
+    (vide pour la première page) ; la pagination par numéro de page
+    reste le comportement par défaut.
+    """
+    keyset_pagination_class = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            keyset = self.keyset_pagination_class
+            if keyset is not None and keyset.cursor_query_param in self.request.query_params:
+                self._paginator = keyset()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
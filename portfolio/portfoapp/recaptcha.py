@@ -0,0 +1,147 @@
+"""
+Client de vérification reCAPTCHA
+
+- une session `requests` partagée par processus (connexions keep-alive
+  réutilisées au lieu d'une poignée de main TLS par message) ;
+- des délais de connexion et de lecture stricts ;
+- un cache des jetons déjà vérifiés : un jeton refusé ou déjà accepté une
+  fois est rejeté sans nouvel appel (Google refuserait le doublon), si bien
+  qu'un jeton valide ne permet d'envoyer qu'un seul message ;
+- un disjoncteur : après RECAPTCHA_BREAKER_THRESHOLD échecs consécutifs
+  (délai dépassé, erreur réseau ou HTTP), le vérificateur n'est plus appelé
+  pendant RECAPTCHA_BREAKER_COOLDOWN secondes et la politique
+  RECAPTCHA_FAILURE_POLICY s'applique (`allow` ou `deny`).
+
+L'URL de vérification (RECAPTCHA_VERIFY_URL) peut pointer vers un serveur local.
+"""
+import hashlib
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .cache import get_cache
+from .timing import timed
+
+logger = logging.getLogger(__name__)
+
+VERDICT_KEY = 'portfoapp:recaptcha:%s'
+
+
+class RecaptchaUnavailable(Exception):
+    """Le vérificateur ne répond pas et la politique de repli refuse les messages"""
+
+
+class CircuitBreaker:
+    """Disjoncteur local au processus : fermé, ouvert, puis semi-ouvert après le délai"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+
+    def allow(self):
+        """Indique si un appel peut être tenté ; un seul essai passe en semi-ouvert"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < settings.RECAPTCHA_BREAKER_COOLDOWN:
+                return False
+            # Semi-ouvert : on laisse passer cet appel et on rouvre jusqu'à son résultat
+            self.opened_at = time.monotonic()
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= settings.RECAPTCHA_BREAKER_THRESHOLD:
+                if self.opened_at is None:
+                    logger.warning('Vérification reCAPTCHA suspendue après %s échecs consécutifs', self.failures)
+                self.opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+
+class RecaptchaClient:
+    def __init__(self):
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.breaker = CircuitBreaker()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    # Pas de nouvelle tentative automatique : le délai total reste borné
+                    adapter = HTTPAdapter(pool_maxsize=settings.RECAPTCHA_POOL_SIZE, max_retries=0)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
+
+    def reset(self):
+        """Ferme les connexions et réarme le disjoncteur"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+        self.breaker = CircuitBreaker()
+
+    def verify(self, token, remote_ip=None):
+        """
+        Retourne True si le jeton est valide, False sinon.
+        Si le vérificateur est indisponible, applique RECAPTCHA_FAILURE_POLICY :
+        True pour `allow`, RecaptchaUnavailable pour `deny`.
+        """
+        key = VERDICT_KEY % hashlib.sha256(token.encode()).hexdigest()
+        cache = get_cache()
+        verdict = cache.get(key)
+        if verdict is not None:
+            return verdict
+
+        verdict = self.fetch_verdict(token, remote_ip)
+        if verdict is None:
+            if settings.RECAPTCHA_FAILURE_POLICY == 'deny':
+                raise RecaptchaUnavailable()
+            return True
+        # Jeton à usage unique : accepté cette fois, refusé ensuite
+        cache.set(key, False, timeout=settings.RECAPTCHA_VERDICT_CACHE_TIMEOUT)
+        return verdict
+
+    def fetch_verdict(self, token, remote_ip=None):
+        """Interroge le vérificateur ; None s'il est indisponible ou disjoncté"""
+        if not self.breaker.allow():
+            return None
+        data = {'secret': settings.RECAPTCHA_SECRET_KEY, 'response': token}
+        if remote_ip:
+            data['remoteip'] = remote_ip
+        try:
+            with timed('recaptcha'):
+                response = self.session.post(
+                    settings.RECAPTCHA_VERIFY_URL,
+                    data=data,
+                    timeout=(settings.RECAPTCHA_CONNECT_TIMEOUT, settings.RECAPTCHA_READ_TIMEOUT),
+                )
+                response.raise_for_status()
+                result = response.json()
+        except (requests.RequestException, ValueError) as exc:
+            self.breaker.record_failure()
+            logger.warning('Vérification reCAPTCHA impossible : %s', exc)
+            return None
+        self.breaker.record_success()
+        return bool(result.get('success'))
+
+
+recaptcha_client = RecaptchaClient()
@@ -0,0 +1,235 @@
+"""
+Recherche plein texte pour les projets et les articles
+
+- PostgreSQL : colonnes `tsvector` générées (une par langue, avec
+  stemming français / anglais) et index GIN ;
+- SQLite : tables virtuelles FTS5 à contenu externe, synchronisées par
+  triggers (porter pour l'anglais, sans accents pour le français).
+
+Les index sont créés par la migration 0003 et maintenus par la base à
+chaque écriture. Les autres moteurs retombent sur le SearchFilter de DRF.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from .i18n import get_request_language
+
+# Colonnes indexées par modèle et par langue, de la plus à la moins pondérée
+SEARCH_INDEXES = {
+    'portfoapp.article': {
+        'fr': ('title_fr', 'excerpt_fr', 'content_fr'),
+        'en': ('title_en', 'excerpt_en', 'content_en'),
+    },
+    'portfoapp.project': {
+        'fr': ('title_fr', 'short_description_fr', 'description_fr'),
+        'en': ('title_en', 'short_description_en', 'description_en'),
+    },
+}
+
+POSTGRES_CONFIGS = {'fr': 'french', 'en': 'english'}
+SQLITE_TOKENIZERS = {
+    'fr': 'unicode61 remove_diacritics 2',
+    'en': 'porter unicode61 remove_diacritics 2',
+}
+WEIGHTS = ('A', 'B', 'C')
+BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+
+def search_column(language):
+    return f'search_{language}'
+
+
+def fts_table(db_table, language):
+    return f'{db_table}_fts_{language}'
+
+
+def get_search_columns(model):
+    return SEARCH_INDEXES.get(model._meta.label_lower)
+
+
+# --- Création des index (migrations) -------------------------------------------
+
+def drop_postgres_index(schema_editor, db_table, languages):
+    for language in languages:
+        schema_editor.execute(f'ALTER TABLE {db_table} DROP COLUMN IF EXISTS {search_column(language)}')
+
+
+def drop_sqlite_index(cursor, db_table, languages):
+    for language in languages:
+        table = fts_table(db_table, language)
+        for suffix in ('ai', 'ad', 'au'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {table}_{suffix}')
+        cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+def create_postgres_index(schema_editor, db_table, languages):
+    for language, columns in languages.items():
+        config = POSTGRES_CONFIGS[language]
+        document = ' || '.join(
+            f"setweight(to_tsvector('{config}', coalesce({column}, '')), '{weight}')"
+            for column, weight in zip(columns, WEIGHTS)
+        )
+        column = search_column(language)
+        schema_editor.execute(
+            f'ALTER TABLE {db_table} ADD COLUMN IF NOT EXISTS {column} tsvector '
+            f'GENERATED ALWAYS AS ({document}) STORED'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {db_table}_{column}_gin ON {db_table} USING gin ({column})'
+        )
+
+
+def create_sqlite_index(cursor, db_table, languages, rebuild=False):
+    """Crée (si besoin) les tables FTS5 et leurs triggers de synchronisation"""
+    for language, columns in languages.items():
+        table = fts_table(db_table, language)
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        old_values = ', '.join(f'old.{column}' for column in columns)
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({column_list}, "
+            f"content='{db_table}', content_rowid='id', tokenize='{SQLITE_TOKENIZERS[language]}')"
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {db_table} BEGIN '
+            f'INSERT INTO {table}(rowid, {column_list}) VALUES (new.id, {new_values}); END'
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {db_table} BEGIN '
+            f"INSERT INTO {table}({table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {column_list} ON {db_table} BEGIN '
+            f"INSERT INTO {table}({table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+            f'INSERT INTO {table}(rowid, {column_list}) VALUES (new.id, {new_values}); END'
+        )
+        if rebuild:
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+
+def sqlite_triggers_missing(cursor, db_table):
+    cursor.execute(
+        "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s AND name LIKE %s",
+        [db_table, f'{db_table}_fts_%'],
+    )
+    return cursor.fetchone()[0] < 3 * len(SQLITE_TOKENIZERS)
+
+
+def ensure_sqlite_indexes(using='default'):
+    """
+    Recrée les triggers supprimés lorsque SQLite reconstruit une table
+    pendant une migration (ALTER TABLE émulé), puis réindexe la table.
+    """
+    from django.apps import apps
+    from django.db import connections
+
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        existing = conn.introspection.table_names(cursor)
+        for label, languages in SEARCH_INDEXES.items():
+            db_table = apps.get_model(label)._meta.db_table
+            if fts_table(db_table, 'fr') not in existing:
+                continue
+            if sqlite_triggers_missing(cursor, db_table):
+                create_sqlite_index(cursor, db_table, languages, rebuild=True)
+
+
+# --- Requêtes -----------------------------------------------------------------
+
+def get_terms(search_terms):
+    return [
+        term.lower()
+        for search_term in search_terms
+        for term in re.findall(r'\w+', search_term)
+    ]
+
+
+class PostgresSearchBackend:
+    def search(self, queryset, terms, languages):
+        db_table = queryset.model._meta.db_table
+        matches, ranks, params, rank_params = [], [], [], []
+        query = ' & '.join(f'{term}:*' for term in terms)
+        for language in languages:
+            column = f'{db_table}.{search_column(language)}'
+            tsquery = 'to_tsquery(%s, %s)'
+            matches.append(f'{column} @@ {tsquery}')
+            ranks.append(f'ts_rank_cd({column}, {tsquery})')
+            params += [POSTGRES_CONFIGS[language], query]
+            rank_params += [POSTGRES_CONFIGS[language], query]
+        rank_sql = ranks[0] if len(ranks) == 1 else f'GREATEST({", ".join(ranks)})'
+        return queryset.filter(
+            RawSQL(' OR '.join(matches), params, output_field=BooleanField())
+        ).annotate(search_rank=RawSQL(rank_sql, rank_params, output_field=FloatField()))
+
+
+class SQLiteSearchBackend:
+    def search(self, queryset, terms, languages):
+        db_table = queryset.model._meta.db_table
+        match = ' '.join('"%s"*' % term.replace('"', '""') for term in terms)
+        subqueries, params, ranks, rank_params = [], [], [], []
+        for language in languages:
+            table = fts_table(db_table, language)
+            weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+            subqueries.append(f'SELECT rowid FROM {table} WHERE {table} MATCH %s')
+            params.append(match)
+            # bm25() est négatif : plus il est petit, plus le document est pertinent
+            ranks.append(
+                f'COALESCE((SELECT -bm25({table}, {weights}) FROM {table} '
+                f'WHERE {table} MATCH %s AND {table}.rowid = {db_table}.id), 0)'
+            )
+            rank_params.append(match)
+        rank_sql = ranks[0] if len(ranks) == 1 else f'MAX({", ".join(ranks)})'
+        return queryset.filter(
+            RawSQL(f'{db_table}.id IN ({" UNION ".join(subqueries)})', params, output_field=BooleanField())
+        ).annotate(search_rank=RawSQL(rank_sql, rank_params, output_field=FloatField()))
+
+
+_sqlite_index_available = {}
+
+
+def get_search_backend(model):
+    if get_search_columns(model) is None:
+        return None
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    if connection.vendor == 'sqlite':
+        db_table = model._meta.db_table
+        if db_table not in _sqlite_index_available:
+            _sqlite_index_available[db_table] = (
+                fts_table(db_table, 'fr') in connection.introspection.table_names()
+            )
+        if _sqlite_index_available[db_table]:
+            return SQLiteSearchBackend()
+    return None
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    SearchFilter utilisant l'index plein texte quand le modèle en a un.
+    Sans paramètre `ordering` explicite, les résultats sont triés par pertinence.
+    Doit être placé après OrderingFilter dans les filter_backends.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        backend = get_search_backend(queryset.model)
+        if backend is None:
+            return super().filter_queryset(request, queryset, view)
+
+        terms = get_terms(self.get_search_terms(request))
+        if not terms:
+            return queryset
+
+        language = get_request_language(request)
+        languages = [language] if language else list(get_search_columns(queryset.model))
+        queryset = backend.search(queryset, terms, languages)
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            queryset = queryset.order_by('-search_rank', *ordering)
+        return queryset
@@ -1,11 +1,45 @@
+from django.core.files.storage import default_storage
 from rest_framework import serializers
+from .i18n import translated_field_names
+from .images import build_variant_urls
 from .models import (
     SkillCategory, Skill, Experience, ProjectCategory, Technology,
     Project, ArticleCategory, Tag, Article, ContactMessage, SiteSettings
 )
 
 
-class SkillCategorySerializer(serializers.ModelSerializer):
+class TranslatedFieldsMixin:
+    """
+    Si le contexte contient une langue, remplace chaque paire `<nom>_fr` /
+    `<nom>_en` par un seul champ `<nom>` dans la langue demandée.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        language = self.context.get('language')
+        if not language:
+            return fields
+
+        translated = translated_field_names(fields)
+        resolved = {}
+        for name, field in fields.items():
+            base, _, suffix = name.rpartition('_')
+            if base not in translated:
+                resolved[name] = field
+            elif suffix == language:
+                field.source = name
+                resolved[base] = field
+        return resolved
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """Variantes responsives d'une image : URLs, dimensions et `srcset` par format"""
+
+    def to_representation(self, manifest):
+        return build_variant_urls(manifest, default_storage, self.context.get('request'))
+
+
+class SkillCategorySerializer(TranslatedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = SkillCategory
         fields = ['id', 'name_fr', 'name_en', 'icon', 'order']
@@ -19,7 +53,7 @@ class SkillSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'category', 'skill_type', 'level', 'icon', 'order']
 
 
-class ExperienceSerializer(serializers.ModelSerializer):
+class ExperienceSerializer(TranslatedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Experience
         fields = [
@@ -36,24 +70,29 @@ class TechnologySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'icon', 'color']
 
 
-class ProjectCategorySerializer(serializers.ModelSerializer):
+class ProjectCategorySerializer(TranslatedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ProjectCategory
         fields = ['id', 'name_fr', 'name_en', 'slug', 'color', 'order']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(TranslatedFieldsMixin, serializers.ModelSerializer):
     category = ProjectCategorySerializer(read_only=True)
     technologies = TechnologySerializer(many=True, read_only=True)
     image_url = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField()
     gif_url = serializers.SerializerMethodField()
+    gif_variants = ImageVariantsField()
+
+    # Champs `*_url` : URL absolue du fichier (sérialisation compilée, voir compiled.py)
+    file_url_fields = {'image_url': 'image', 'gif_url': 'gif'}
 
     class Meta:
         model = Project
         fields = [
             'id', 'title_fr', 'title_en', 'slug', 'description_fr', 'description_en',
             'short_description_fr', 'short_description_en', 'image', 'image_url',
-            'video_url', 'gif', 'gif_url', 'category', 'technologies',
+            'image_variants', 'video_url', 'gif', 'gif_url', 'gif_variants', 'category', 'technologies',
             'github_url', 'demo_url', 'featured', 'order', 'created_at', 'updated_at'
         ]
 
@@ -80,22 +119,26 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug']
 
 
-class ArticleCategorySerializer(serializers.ModelSerializer):
+class ArticleCategorySerializer(TranslatedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ArticleCategory
         fields = ['id', 'name_fr', 'name_en', 'slug', 'description_fr', 'description_en']
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(TranslatedFieldsMixin, serializers.ModelSerializer):
     category = ArticleCategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     featured_image_url = serializers.SerializerMethodField()
+    featured_image_variants = ImageVariantsField()
+
+    # Champs `*_url` : URL absolue du fichier (sérialisation compilée, voir compiled.py)
+    file_url_fields = {'featured_image_url': 'featured_image'}
 
     class Meta:
         model = Article
         fields = [
             'id', 'title_fr', 'title_en', 'slug', 'excerpt_fr', 'excerpt_en',
-            'content_fr', 'content_en', 'featured_image', 'featured_image_url',
+            'content_fr', 'content_en', 'featured_image', 'featured_image_url', 'featured_image_variants',
             'category', 'tags', 'author', 'published', 'featured',
             'views_count', 'created_at', 'updated_at', 'published_at'
         ]
@@ -131,8 +174,9 @@ class ContactMessageCreateSerializer(serializers.ModelSerializer):
         return value
 
 
-class SiteSettingsSerializer(serializers.ModelSerializer):
+class SiteSettingsSerializer(TranslatedFieldsMixin, serializers.ModelSerializer):
     owner_photo_url = serializers.SerializerMethodField()
+    owner_photo_variants = ImageVariantsField()
     cv_file_url = serializers.SerializerMethodField()
 
     class Meta:
@@ -140,7 +184,7 @@ class SiteSettingsSerializer(serializers.ModelSerializer):
         fields = [
             'site_name_fr', 'site_name_en', 'site_description_fr', 'site_description_en',
             'owner_name', 'owner_title_fr', 'owner_title_en', 'owner_bio_fr', 'owner_bio_en',
-            'owner_photo', 'owner_photo_url', 'owner_email', 'owner_phone',
+            'owner_photo', 'owner_photo_url', 'owner_photo_variants', 'owner_email', 'owner_phone',
             'owner_location_fr', 'owner_location_en', 'cv_file', 'cv_file_url',
             'github_url', 'linkedin_url', 'twitter_url', 'instagram_url', 'portfolio_url',
             'meta_keywords_fr', 'meta_keywords_en', 'google_analytics_id'
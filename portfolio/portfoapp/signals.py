@@ -0,0 +1,85 @@
+"""
+Signaux de l'application portfolio
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_version
+from .images import (
+    delete_variants, get_animated_fields, get_variant_fields, needs_refresh,
+    refresh_variants, schedule_animated_variants
+)
+from .models import Project, Article
+
+
+def _touch_m2m_owner(model, field_name, instance, action, reverse, pk_set):
+    """
+    Met à jour `updated_at` du côté propriétaire d'une relation M2M :
+    l'ajout d'une technologie à un projet modifie le projet sérialisé.
+    """
+    if action == 'pre_clear' and reverse:
+        # pk_set n'est pas fourni pour clear() : on mémorise les objets liés avant
+        instance._m2m_cleared_pks = list(
+            model.objects.filter(**{field_name: instance}).values_list('pk', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        pks = [instance.pk]
+    elif action == 'post_clear':
+        pks = getattr(instance, '_m2m_cleared_pks', [])
+    else:
+        pks = pk_set or []
+    if pks:
+        # update() n'envoie pas post_save : invalidation explicite
+        model.objects.filter(pk__in=pks).update(updated_at=timezone.now())
+        bump_version(model)
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+def touch_project_on_technologies_change(sender, instance, action, reverse, pk_set, **kwargs):
+    _touch_m2m_owner(Project, 'technologies', instance, action, reverse, pk_set)
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def touch_article_on_tags_change(sender, instance, action, reverse, pk_set, **kwargs):
+    _touch_m2m_owner(Article, 'tags', instance, action, reverse, pk_set)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_cache_version(sender, **kwargs):
+    if sender._meta.app_label == 'portfoapp':
+        bump_version(sender)
+
+
+@receiver(m2m_changed)
+def bump_cache_version_on_m2m_change(sender, instance, action, model, **kwargs):
+    if sender._meta.app_label == 'portfoapp' and action.startswith('post_'):
+        bump_version(type(instance))
+        bump_version(model)
+
+
+@receiver(post_save)
+def refresh_image_variants(sender, instance, raw=False, **kwargs):
+    """Décline les images nouvellement téléversées (largeurs et formats)"""
+    if raw:
+        return
+    if get_variant_fields(sender) and refresh_variants(instance):
+        bump_version(sender)
+    # Conversion des GIF, plus lente : hors de la requête
+    if any(
+        needs_refresh(getattr(instance, image_field), getattr(instance, manifest_field) or {})
+        for image_field, manifest_field in get_animated_fields(sender).items()
+    ):
+        schedule_animated_variants(sender, instance.pk)
+
+
+@receiver(post_delete)
+def delete_image_variants(sender, instance, **kwargs):
+    fields = {**get_variant_fields(sender), **get_animated_fields(sender)}
+    for image_field, manifest_field in fields.items():
+        delete_variants(getattr(instance, image_field).storage, getattr(instance, manifest_field))
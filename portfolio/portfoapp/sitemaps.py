@@ -1,5 +1,30 @@
+"""
+Sitemaps du portfolio
+
+Un index (/sitemap.xml) renvoie vers une page par section
+(/sitemap-<section>.xml, paginée avec ?p=). Les sections ne lisent que le
+slug et la date de mise à jour (values()). Le XML rendu est mis en cache
+avec les compteurs de version des modèles : il n'est regénéré qu'après une
+modification, et les robots reçoivent ETag / Last-Modified / 304 sans
+requête SQL.
+"""
+import hashlib
+import time
+from functools import cached_property, wraps
+
+from django.conf import settings
 from django.contrib.sitemaps import Sitemap
-from .models import Project, Article
+from django.contrib.sitemaps import views as sitemap_views
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .cache import get_cache, get_versions
+from .metrics import record_cache_lookup
+from .models import Article, Experience, Project, SiteSettings, Skill
+
+SITEMAP_KEY = 'portfoapp:sitemap:%s'
 
 
 class StaticViewSitemap(Sitemap):
@@ -8,33 +33,126 @@ class StaticViewSitemap(Sitemap):
     changefreq = 'monthly'
 
     def items(self):
-        # Les pages statiques sont gérées par le frontend React
-        # On retourne des chemins relatifs qui seront utilisés par le frontend
-        return ['/', '/about', '/projects', '/contact', '/blog']
+        # Routes du frontend React (monportfolio/src/App.jsx)
+        return ['/', '/a_propos', '/mes-projects', '/contact', '/blog']
 
     def location(self, item):
         return item
 
+    @cached_property
+    def content_lastmod(self):
+        # Les pages affichent les paramètres du site, les compétences, les
+        # expériences, les projets et les articles
+        dates = [
+            model.objects.order_by('-updated_at').values_list('updated_at', flat=True).first()
+            for model in (SiteSettings, Skill, Experience, Project)
+        ]
+        dates.append(ArticleSitemap.queryset.order_by('-updated_at').values_list('updated_at', flat=True).first())
+        return max(filter(None, dates), default=None)
 
-class ProjectSitemap(Sitemap):
-    """Sitemap pour les projets"""
-    changefreq = 'monthly'
-    priority = 0.8
+    def lastmod(self, item):
+        return self.content_lastmod
+
+
+class ValuesSitemap(Sitemap):
+    """
+    Section construite à partir de values() : pas d'instances, pas de
+    contenu, seulement les colonnes utiles aux URLs
+    """
+    queryset = None
+    location_template = None
+
+    @property
+    def limit(self):
+        return settings.SITEMAP_PAGE_SIZE
 
     def items(self):
-        return Project.objects.all()
+        return self.queryset.values('slug', 'updated_at').order_by('id')
 
-    def lastmod(self, obj):
-        return obj.updated_at
+    def location(self, item):
+        return self.location_template.format(**item)
 
+    def lastmod(self, item):
+        return item['updated_at']
 
-class ArticleSitemap(Sitemap):
+    def get_latest_lastmod(self):
+        # Une seule ligne au lieu de parcourir tous les éléments
+        return self.queryset.order_by('-updated_at').values_list('updated_at', flat=True).first()
+
+
+class ProjectSitemap(ValuesSitemap):
+    """Sitemap pour les projets"""
+    changefreq = 'monthly'
+    priority = 0.8
+    queryset = Project.objects.all()
+    location_template = '/mes-projects/{slug}'
+
+
+class ArticleSitemap(ValuesSitemap):
     """Sitemap pour les articles"""
     changefreq = 'weekly'
     priority = 0.7
+    queryset = Article.objects.filter(published=True)
+    location_template = '/blog/{slug}'
+
+
+sitemaps = {
+    'static': StaticViewSitemap,
+    'projects': ProjectSitemap,
+    'articles': ArticleSitemap,
+}
+
+# Modèles dont dépend le contenu des sitemaps
+SITEMAP_MODELS = (SiteSettings, Skill, Experience, Project, Article)
+
+
+def cached_sitemap(view):
+    """
+    Sert le XML depuis le cache (clé : hôte, chemin, page et versions des
+    modèles) et répond 304 aux requêtes conditionnelles. L'ETag dérive de la
+    clé ; Last-Modified est la date de génération de l'entrée (au moins le
+    plus récent lastmod), qui avance aussi quand une URL dont le lastmod
+    n'est pas le plus récent est retirée.
+    """
+
+    @require_safe
+    @wraps(view)
+    def wrapper(request, **kwargs):
+        parts = [
+            request.scheme,
+            request.get_host(),
+            request.path,
+            request.GET.get('p', ''),
+            repr(get_versions(SITEMAP_MODELS)),
+        ]
+        digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+        key = SITEMAP_KEY % digest
+        cache = get_cache()
+        entry = cache.get(key)
+        record_cache_lookup('sitemap', entry is not None)
+        if entry is None:
+            response = view(request, sitemaps=sitemaps, **kwargs).render()
+            entry = {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'last_modified': max(
+                    int(time.time()), parse_http_date_safe(response.get('Last-Modified', '')) or 0
+                ),
+            }
+            cache.set(key, entry, timeout=settings.SITEMAP_CACHE_TIMEOUT)
+
+        etag = f'"{digest}"'
+        last_modified = entry['last_modified']
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['X-Robots-Tag'] = 'noindex, noodp, noarchive'
+        return response
+
+    return wrapper
 
-    def items(self):
-        return Article.objects.filter(published=True)
 
-    def lastmod(self, obj):
-        return obj.updated_at
\ No newline at end of file
+sitemap_index = cached_sitemap(sitemap_views.index)
+sitemap_section = cached_sitemap(sitemap_views.sitemap)
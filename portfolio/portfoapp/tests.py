@@ -1,15 +1,53 @@
-from django.test import TestCase
+import json
+import os
+import runpy
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from smtplib import SMTPServerDisconnected
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
+from PIL import Image
+from prometheus_client import REGISTRY
+from .async_views import AsyncReadView
+from .cache import bump_version, get_cache, get_versions
+from .counters import view_counts
+from .management.commands.benchmark_api import percentile
+from .recaptcha import recaptcha_client
 from .models import (
     SiteSettings, Project, ProjectCategory, Technology,
-    Skill, SkillCategory, Experience, Article, ArticleCategory
+    Skill, SkillCategory, Experience, Article, ArticleCategory, ContactMessage,
+    OutboxEmail, Tag
 )
 
 
 class SiteSettingsTestCase(TestCase):
     def setUp(self):
+        cache.clear()
+        SiteSettings.clear_cache()
         SiteSettings.load()
 
     def test_site_settings_singleton(self):
@@ -19,9 +57,75 @@ class SiteSettingsTestCase(TestCase):
         self.assertEqual(settings1.pk, settings2.pk)
         self.assertEqual(SiteSettings.objects.count(), 1)
 
+    def test_site_settings_cached_in_process(self):
+        """Test que load() ne relit pas la base tant que les paramètres n'ont pas changé"""
+        with self.assertNumQueries(0):
+            SiteSettings.load()
+        with override_settings(SITE_SETTINGS_CACHE_TTL=0):
+            SiteSettings.clear_cache()
+            SiteSettings.load()
+            # Copie expirée : seul updated_at est relu
+            with self.assertNumQueries(1):
+                SiteSettings.load()
+
+            # Sauvegarde par un autre worker : la copie locale n'est pas vidée
+            SiteSettings.objects.filter(pk=1).update(owner_name='Nouveau Nom', updated_at=timezone.now())
+            with self.assertNumQueries(2):
+                self.assertEqual(SiteSettings.load().owner_name, 'Nouveau Nom')
+
+        # Sauvegarde dans ce worker : copie vidée immédiatement
+        site_settings = SiteSettings.objects.get(pk=1)
+        site_settings.owner_name = 'Autre Nom'
+        site_settings.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(SiteSettings.load().owner_name, 'Autre Nom')
+
+
+class StructuredDataAPITestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        SiteSettings.clear_cache()
+        SiteSettings.objects.create(
+            pk=1, owner_name='Jean Dupont', owner_email='jean@dupont.dev',
+            owner_title_fr='Développeur', owner_title_en='Developer',
+            owner_bio_fr='Bio', owner_bio_en='Bio',
+            site_description_fr='Mon site', site_description_en='My site',
+            github_url='https://github.com/jean',
+        )
+        self.url = reverse('settings-structured-data')
+
+    def test_language_cache_and_invalidation(self):
+        """Test le JSON-LD par langue, servi du cache avec validateurs, puis invalidé"""
+        response = self.client.get(self.url, {'lang': 'en'}, HTTP_ACCEPT='application/json')
+        person, website = response.data
+        self.assertEqual(person['jobTitle'], 'Developer')
+        self.assertEqual(person['sameAs'], ['https://github.com/jean'])
+        self.assertEqual((website['description'], website['inLanguage']), ('My site', 'en'))
+        self.assertIn('ETag', response)
+
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.data[0]['jobTitle'], 'Développeur')
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(
+                self.url, {'lang': 'en'}, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH='"autre"'
+            )
+        self.assertEqual(cached.data[0]['jobTitle'], 'Developer')
+        response = self.client.get(
+            self.url, {'lang': 'en'}, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=cached['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        site_settings = SiteSettings.objects.get(pk=1)
+        site_settings.owner_title_en = 'Engineer'
+        site_settings.save()
+        response = self.client.get(self.url, {'lang': 'en'}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.data[0]['jobTitle'], 'Engineer')
+
 
 class ProjectAPITestCase(APITestCase):
     def setUp(self):
+        cache.clear()
         self.category = ProjectCategory.objects.create(
             name_fr='Web',
             name_en='Web',
@@ -65,6 +169,1027 @@ class ProjectAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
 
+    def test_list_projects_query_count_is_constant(self):
+        """Test que le nombre de requêtes ne dépend pas du nombre de projets"""
+        for i in range(5):
+            project = Project.objects.create(
+                title_fr=f'Projet {i}', title_en=f'Project {i}', slug=f'projet-{i}',
+                description_fr='Description', description_en='Description',
+                short_description_fr='Court', short_description_en='Short',
+                category=self.category, featured=i % 2 == 0
+            )
+            project.technologies.add(self.technology)
+        # Validateur + COUNT + projets (catégorie jointe) + technologies préchargées
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('project-list'), HTTP_ACCEPT='application/json')
+        self.assertEqual(len(response.data['results']), 6)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('project-featured'), HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class HomeBundleAPITestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        SiteSettings.clear_cache()
+        SiteSettings.load()
+        category = SkillCategory.objects.create(name_fr='Backend', name_en='Backend')
+        Skill.objects.create(name='Django', category=category)
+        technology = Technology.objects.create(name='Django')
+        project = Project.objects.create(
+            title_fr='Projet', title_en='Project', slug='projet',
+            description_fr='Description', description_en='Description',
+            short_description_fr='Court', short_description_en='Short',
+            featured=True
+        )
+        project.technologies.add(technology)
+        Article.objects.create(
+            title_fr='Article', title_en='Article', slug='article',
+            excerpt_fr='Extrait', excerpt_en='Excerpt',
+            content_fr='Contenu', content_en='Content',
+            published=True, featured=True
+        )
+
+    def test_home_bundle(self):
+        """Test que le bundle de la page d'accueil tient en un nombre fixe de requêtes"""
+        url = reverse('home-list')
+        # Validateur + paramètres + 5 listes + 2 préchargements
+        with self.assertNumQueries(9):
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['featured_projects']), 1)
+        self.assertEqual(len(response.data['featured_articles']), 1)
+        self.assertEqual(len(response.data['skills']), 1)
+
+        response = self.client.get(
+            url, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_settings_change_from_another_worker(self):
+        """Test qu'une modification enregistrée ailleurs apparaît malgré la copie locale encore valide"""
+        urls = (reverse('settings-current'), reverse('home-list'))
+        for url in urls:
+            self.client.get(url, HTTP_ACCEPT='application/json')
+
+        # Sauvegarde par un autre worker : updated_at et version changent, la copie locale reste
+        SiteSettings.objects.filter(pk=1).update(owner_name='Nouveau Nom', updated_at=timezone.now())
+        bump_version(SiteSettings)
+        self.assertNotEqual(SiteSettings.load().owner_name, 'Nouveau Nom')
+
+        response = self.client.get(urls[0], HTTP_ACCEPT='application/json')
+        self.assertEqual(response.data['owner_name'], 'Nouveau Nom')
+        response = self.client.get(urls[1], HTTP_ACCEPT='application/json')
+        self.assertEqual(response.data['settings']['owner_name'], 'Nouveau Nom')
+
+
+@override_settings(API_CACHE_ENABLED=False)
+class ConditionalGetTestCase(APITestCase):
+    def setUp(self):
+        self.technology = Technology.objects.create(name='Django')
+        self.project = Project.objects.create(
+            title_fr='Projet', title_en='Project', slug='projet',
+            description_fr='Description', description_en='Description',
+            short_description_fr='Court', short_description_en='Short'
+        )
+
+    def test_not_modified_without_serialization(self):
+        """Test qu'un ETag connu renvoie 304 avec une seule requête"""
+        url = reverse('project-list')
+        response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_m2m_change_invalidates_validator(self):
+        """Test qu'un ajout de technologie change l'ETag du projet"""
+        url = reverse('project-detail', kwargs={'pk': self.project.pk})
+        etag = self.client.get(url, HTTP_ACCEPT='application/json')['ETag']
+        self.project.technologies.add(self.technology)
+        response = self.client.get(url, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['technologies']), 1)
+
+    def test_collection_without_last_modified(self):
+        """Test qu'une liste n'a que l'ETag : la suppression d'un projet ancien le change"""
+        newer = Project.objects.create(
+            title_fr='Récent', title_en='Recent', slug='recent',
+            description_fr='Description', description_en='Description',
+            short_description_fr='Court', short_description_en='Short'
+        )
+        url = reverse('project-list')
+        response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+
+        self.project.delete()
+        response = self.client.get(url, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        # If-Modified-Since seul n'est pas évalué pour une liste
+        response = self.client.get(
+            url, HTTP_ACCEPT='application/json',
+            HTTP_IF_MODIFIED_SINCE=http_date(newer.updated_at.timestamp() + 60),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        detail = self.client.get(reverse('project-detail', kwargs={'pk': newer.pk}), HTTP_ACCEPT='application/json')
+        self.assertIn('Last-Modified', detail)
+
+
+class ResponseCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(
+            title_fr='Projet', title_en='Project', slug='projet',
+            description_fr='Description', description_en='Description',
+            short_description_fr='Court', short_description_en='Short'
+        )
+
+    def test_cache_hit_and_invalidation(self):
+        """Test que la réponse est servie du cache puis invalidée par une modification"""
+        url = reverse('project-list')
+        self.client.get(url, HTTP_ACCEPT='application/json')
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.data['results'][0]['title_fr'], 'Projet')
+
+        self.project.title_fr = 'Projet modifié'
+        self.project.save()
+        response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.data['results'][0]['title_fr'], 'Projet modifié')
+
+    def test_versions_are_replaced_not_incremented(self):
+        """Test que chaque invalidation écrit une version jamais utilisée (sans incr())"""
+        versions = {get_versions([Project])[0]}
+        with mock.patch.object(type(get_cache()), 'incr', side_effect=AssertionError):
+            for _ in range(3):
+                bump_version(Project)
+                versions.add(get_versions([Project])[0])
+        self.assertEqual(len(versions), 4)
+
+    def test_related_model_change_invalidates(self):
+        """Test qu'une modification de catégorie invalide la liste des projets"""
+        url = reverse('project-list')
+        self.client.get(url, HTTP_ACCEPT='application/json')
+        category = ProjectCategory.objects.create(name_fr='Web', name_en='Web', slug='web')
+        Project.objects.filter(pk=self.project.pk).update(category=category)
+        category.name_fr = 'Web modifié'
+        category.save()
+        response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.data['results'][0]['category']['name_fr'], 'Web modifié')
+
+
+class ArticleViewsTestCase(APITestCase):
+    def setUp(self):
+        self.article = Article.objects.create(
+            title_fr='Article', title_en='Article', slug='article',
+            excerpt_fr='Extrait', excerpt_en='Excerpt',
+            content_fr='Contenu', content_en='Content',
+            published=True
+        )
+
+    @override_settings(ARTICLE_VIEWS_FLUSH_INTERVAL=3600)
+    def test_increment_views_is_buffered(self):
+        """Test que les vues sont agrégées puis écrites sans modifier updated_at"""
+        url = reverse('article-increment-views', kwargs={'pk': self.article.pk})
+        view_counts.flush()
+        for expected in (1, 2, 3):
+            response = self.client.post(url, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.data['views_count'], expected)
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views_count, 0)
+
+        updated_at = self.article.updated_at
+        with self.assertNumQueries(1):
+            view_counts.flush()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views_count, 3)
+        self.assertEqual(self.article.updated_at, updated_at)
+
+    @override_settings(ARTICLE_VIEWS_FLUSH_INTERVAL=0)
+    def test_flush_invalidates_cached_responses(self):
+        """Test qu'une écriture des vues change les réponses en cache et l'ETag"""
+        cache.clear()
+        list_url = reverse('article-list')
+        response = self.client.get(list_url, HTTP_ACCEPT='application/json')
+        etag = response['ETag']
+        self.assertEqual(response.data['results'][0]['views_count'], 0)
+
+        # L'écriture immédiate ne fait pas disparaître la vue de la réponse
+        response = self.client.post(
+            reverse('article-increment-views', kwargs={'pk': self.article.pk}), HTTP_ACCEPT='application/json'
+        )
+        self.assertEqual(response.data['views_count'], 1)
+        self.assertEqual(view_counts.pending(self.article.pk), 0)
+
+        response = self.client.get(list_url, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['views_count'], 1)
+
+    @override_settings(ARTICLE_VIEWS_FLUSH_INTERVAL=0.05)
+    def test_flush_on_timer(self):
+        """Test que les vues sont écrites sans nouvelle requête une fois l'intervalle écoulé"""
+        view_counts.flush()
+        with mock.patch.object(view_counts, '_flush_from_timer') as flush_from_timer:
+            view_counts.add(self.article.pk)
+            time.sleep(0.2)
+        flush_from_timer.assert_called_once_with()
+        view_counts.flush()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views_count, 1)
+
+    def test_flush_error_is_logged(self):
+        """Test qu'une erreur d'écriture est journalisée et les vues conservées"""
+        view_counts.flush()
+        with override_settings(ARTICLE_VIEWS_FLUSH_INTERVAL=3600):
+            view_counts.add(self.article.pk)
+        with mock.patch('django.db.models.QuerySet.update', side_effect=RuntimeError('base indisponible')):
+            with self.assertLogs('portfoapp.counters', 'ERROR'):
+                self.assertEqual(view_counts.flush(), 0)
+        self.assertEqual(view_counts.pending(self.article.pk), 1)
+        view_counts.flush()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views_count, 1)
+
+    def test_increment_views_unknown_article(self):
+        url = reverse('article-increment-views', kwargs={'pk': 999})
+        response = self.client.post(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class LanguageScopedAPITestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        category = ArticleCategory.objects.create(name_fr='Tutoriels', name_en='Tutorials', slug='tutoriels')
+        self.article = Article.objects.create(
+            title_fr='Article', title_en='Article EN', slug='article',
+            excerpt_fr='Extrait', excerpt_en='Excerpt',
+            content_fr='Contenu', content_en='Content',
+            category=category, published=True
+        )
+
+    def test_lang_param_returns_single_translation(self):
+        """Test que ?lang=en ne renvoie que les champs anglais"""
+        url = reverse('article-detail', kwargs={'pk': self.article.pk})
+        response = self.client.get(url, {'lang': 'en'}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.data['title'], 'Article EN')
+        self.assertEqual(response.data['content'], 'Content')
+        self.assertEqual(response.data['category']['name'], 'Tutorials')
+        self.assertNotIn('content_fr', response.data)
+        self.assertNotIn('title_en', response.data)
+
+    def test_lang_auto_uses_accept_language(self):
+        url = reverse('article-list')
+        response = self.client.get(
+            url, {'lang': 'auto'}, HTTP_ACCEPT='application/json', HTTP_ACCEPT_LANGUAGE='en-US,en;q=0.9'
+        )
+        self.assertEqual(response.data['results'][0]['excerpt'], 'Excerpt')
+        self.assertIn('Accept-Language', response['Vary'])
+
+    def test_other_language_columns_not_loaded(self):
+        url = reverse('article-list')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, {'lang': 'fr'}, HTTP_ACCEPT='application/json')
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertIn('"content_fr"', sql)
+        self.assertNotIn('"content_en"', sql)
+
+    def test_without_lang_returns_all_translations(self):
+        url = reverse('article-detail', kwargs={'pk': self.article.pk})
+        response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertIn('title_fr', response.data)
+        self.assertIn('title_en', response.data)
+
+
+class FullTextSearchTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.relevant = Article.objects.create(
+            title_fr='Déployer Django', title_en='Deploying Django', slug='deployer-django',
+            excerpt_fr='Mise en production', excerpt_en='Going live',
+            content_fr='Gunicorn et Nginx', content_en='Gunicorn and Nginx',
+            published=True
+        )
+        self.other = Article.objects.create(
+            title_fr='React', title_en='React', slug='react',
+            excerpt_fr='Interface', excerpt_en='Interface',
+            content_fr='Un mot sur Django', content_en='A word about Django',
+            published=True
+        )
+        Article.objects.create(
+            title_fr='CSS', title_en='CSS', slug='css',
+            excerpt_fr='Styles', excerpt_en='Styles',
+            content_fr='Grilles', content_en='Grids',
+            published=True
+        )
+
+    def search(self, **params):
+        response = self.client.get(reverse('article-list'), params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [article['slug'] for article in response.data['results']]
+
+    def test_search_ranks_title_matches_first(self):
+        """Test que la recherche est classée par pertinence"""
+        self.assertEqual(self.search(search='django'), ['deployer-django', 'react'])
+
+    def test_search_uses_stemming_and_prefix(self):
+        """Test du stemming anglais et de la recherche par préfixe"""
+        self.assertEqual(self.search(search='deploy', lang='en'), ['deployer-django'])
+        self.assertEqual(self.search(search='grill', lang='fr'), ['css'])
+
+    def test_index_follows_updates(self):
+        self.other.content_fr = 'Plus rien'
+        self.other.content_en = 'Nothing'
+        self.other.save()
+        self.assertEqual(self.search(search='django'), ['deployer-django'])
+        self.relevant.delete()
+        self.assertEqual(self.search(search='django'), [])
+
+
+class KeysetPaginationTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        published_at = timezone.now()
+        for i in range(30):
+            Article.objects.create(
+                title_fr=f'Article {i}', title_en=f'Article {i}', slug=f'article-{i}',
+                excerpt_fr='Extrait', excerpt_en='Excerpt',
+                content_fr='Contenu', content_en='Content',
+                published=True,
+                # Dates égales et NULL pour vérifier le départage
+                published_at=None if i % 5 == 0 else published_at - timedelta(days=i // 3),
+            )
+
+    def test_cursor_pages_cover_all_rows_once(self):
+        """Test que les pages par curseur couvrent toutes les lignes sans COUNT(*)"""
+        url = reverse('article-list')
+        params = {'cursor': ''}
+        slugs = []
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any('COUNT(*)' in query['sql'] for query in queries.captured_queries))
+            slugs += [article['slug'] for article in response.data['results']]
+            if not response.data['next']:
+                break
+            params = {'cursor': parse_qs(urlparse(response.data['next']).query)['cursor'][0]}
+
+        expected = list(
+            Article.objects.order_by(
+                F('published_at').desc(nulls_last=True), '-created_at', '-id'
+            ).values_list('slug', flat=True)
+        )
+        self.assertEqual(slugs, expected)
+
+    def test_page_number_pagination_is_default(self):
+        response = self.client.get(reverse('article-list'), HTTP_ACCEPT='application/json')
+        self.assertEqual(response.data['count'], 30)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('article-list'), {'cursor': 'abc'}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ListIndexTestCase(TestCase):
+    """Vérifie avec EXPLAIN que les listes de l'API utilisent les index composites"""
+
+    def assertUsesIndex(self, queryset, index_name):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Plan vérifié sous SQLite uniquement')
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index_name}', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_article_list_uses_partial_index(self):
+        self.assertUsesIndex(Article.objects.published()[:12], 'article_published_idx')
+        self.assertUsesIndex(Article.objects.published().filter(featured=True)[:3], 'article_published_idx')
+
+    def test_project_list_uses_composite_index(self):
+        self.assertUsesIndex(Project.objects.all()[:12], 'project_list_idx')
+        self.assertUsesIndex(Project.objects.filter(category=1)[:12], 'project_category_list_idx')
+
+    def test_contact_messages_use_status_index(self):
+        self.assertUsesIndex(ContactMessage.objects.filter(status='new')[:20], 'contact_status_idx')
+
+
+class AsyncReadAPITestCase(APITestCase):
+    """Les vues asynchrones renvoient exactement les mêmes données que l'API DRF"""
+
+    def setUp(self):
+        cache.clear()
+        SiteSettings.clear_cache()
+        category = ProjectCategory.objects.create(name_fr='Web', name_en='Web', slug='web')
+        technology = Technology.objects.create(name='React', icon='react', color='#61DAFB')
+        for i in range(15):
+            project = Project.objects.create(
+                title_fr=f'Projet {i}', title_en=f'Project {i}', slug=f'projet-{i}',
+                description_fr='Description', description_en='Description',
+                short_description_fr='Court', short_description_en='Short',
+                category=category, featured=i % 4 == 0, order=i,
+            )
+            project.technologies.add(technology)
+        self.project = project
+
+    def assertSameAsSync(self, sync_url, async_url, params=None):
+        expected = self.client.get(sync_url, params, HTTP_ACCEPT='application/json')
+        response = self.client.get(async_url, params)
+        self.assertEqual(response.status_code, expected.status_code)
+        # Seul le préfixe des liens de pagination diffère
+        self.assertEqual(response.content.decode().replace('/async/', '/'), expected.content.decode())
+
+    def test_project_list_matches_sync_api(self):
+        for params in ({}, {'page': 2}, {'lang': 'en'}, {'featured': 'true'}, {'technologies': 0}):
+            with self.subTest(params=params):
+                self.assertSameAsSync(reverse('project-list'), reverse('async-project-list'), params)
+
+    def test_project_detail_matches_sync_api(self):
+        self.assertSameAsSync(
+            reverse('project-detail', kwargs={'pk': self.project.pk}),
+            reverse('async-project-detail', kwargs={'pk': self.project.pk}),
+            {'lang': 'fr'},
+        )
+
+    def test_settings_match_sync_api(self):
+        self.assertSameAsSync(reverse('settings-current'), reverse('async-settings-current'))
+
+    async def test_async_client(self):
+        response = await self.async_client.get(reverse('async-project-list'), {'page': 3})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = await self.async_client.get(reverse('async-article-list'))
+        self.assertEqual(response.json()['count'], 0)
+
+    def test_queryset_is_required(self):
+        view = AsyncReadView()
+        with self.assertRaisesMessage(ImproperlyConfigured, 'AsyncReadView doit définir `queryset`'):
+            view.get_base_queryset()
+
+
+def make_image(name, size, color='red', format='PNG'):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, format=format)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f'image/{format.lower()}')
+
+
+@override_settings(IMAGE_VARIANT_WIDTHS=(320, 640, 1280), IMAGE_VARIANT_FORMATS=('webp',))
+class ImageVariantsTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_variants_are_generated_on_upload(self):
+        """Test que l'image est déclinée sans agrandissement et exposée en srcset"""
+        project = Project.objects.create(
+            title_fr='Projet', title_en='Project', slug='projet',
+            description_fr='D', description_en='D',
+            short_description_fr='C', short_description_en='S',
+            image=make_image('capture.png', (800, 400)),
+        )
+        variants = Project.objects.get(pk=project.pk).image_variants['formats']['webp']
+        self.assertEqual([(v['width'], v['height']) for v in variants], [(320, 160), (640, 320), (800, 400)])
+        with default_storage.open(variants[0]['name']) as variant:
+            self.assertEqual(Image.open(variant).size, (320, 160))
+
+        response = self.client.get(
+            reverse('project-detail', kwargs={'pk': project.pk}), HTTP_ACCEPT='application/json'
+        )
+        image_variants = response.data['image_variants']
+        self.assertEqual((image_variants['width'], image_variants['height']), (800, 400))
+        self.assertTrue(image_variants['srcset']['webp'].startswith('http://testserver/media/projects/variants/'))
+        self.assertIn(' 640w, ', image_variants['srcset']['webp'])
+
+    @override_settings(IMAGE_ANIMATED_MAX_WIDTH=200, IMAGE_BACKGROUND_CONVERSION=False)
+    def test_gif_is_converted_after_commit(self):
+        """Test la conversion d'un GIF en WebP animé avec affiche, après le commit"""
+        frames = [Image.new('RGB', (400, 200), color) for color in ('red', 'green', 'blue')]
+        buffer = BytesIO()
+        frames[0].save(buffer, format='GIF', save_all=True, append_images=frames[1:], duration=80, loop=0)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            project = Project.objects.create(
+                title_fr='Projet', title_en='Project', slug='projet',
+                description_fr='D', description_en='D',
+                short_description_fr='C', short_description_en='S',
+                gif=SimpleUploadedFile('demo.gif', buffer.getvalue(), content_type='image/gif'),
+            )
+            self.assertEqual(Project.objects.get(pk=project.pk).gif_variants, {})
+        self.assertEqual(len(callbacks), 1)
+
+        manifest = Project.objects.get(pk=project.pk).gif_variants
+        self.assertEqual(manifest['frames'], 3)
+        animated = manifest['formats']['webp'][0]
+        self.assertEqual((animated['width'], animated['height']), (200, 100))
+        with default_storage.open(animated['name']) as webp:
+            self.assertEqual(Image.open(webp).n_frames, 3)
+        self.assertEqual([v['width'] for v in manifest['poster']['formats']['webp']], [320, 400])
+
+        response = self.client.get(
+            reverse('project-detail', kwargs={'pk': project.pk}), HTTP_ACCEPT='application/json'
+        )
+        gif_variants = response.data['gif_variants']
+        self.assertTrue(gif_variants['formats']['webp'][0]['url'].endswith('w.webp'))
+        self.assertIn(' 400w', gif_variants['poster']['srcset']['webp'])
+        self.assertTrue(response.data['gif_url'].endswith('.gif'))
+
+    def test_replacing_image_replaces_variants(self):
+        article = Article.objects.create(
+            title_fr='Article', title_en='Article', slug='article',
+            excerpt_fr='E', excerpt_en='E', content_fr='C', content_en='C', published=True,
+            featured_image=make_image('photo.jpg', (400, 300), format='JPEG'),
+        )
+        old_names = [v['name'] for v in article.featured_image_variants['formats']['webp']]
+
+        article.featured_image = make_image('photo.jpg', (300, 200), color='blue', format='JPEG')
+        article.save()
+        article.refresh_from_db()
+        self.assertEqual(
+            [v['width'] for v in article.featured_image_variants['formats']['webp']], [300]
+        )
+        self.assertFalse(any(default_storage.exists(name) for name in old_names))
+
+
+class SitemapTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(
+            title_fr='Projet', title_en='Project', slug='projet',
+            description_fr='Description', description_en='Description',
+            short_description_fr='Court', short_description_en='Short'
+        )
+        for slug, published in (('publie', True), ('brouillon', False)):
+            Article.objects.create(
+                title_fr=slug, title_en=slug, slug=slug,
+                excerpt_fr='Extrait', excerpt_en='Excerpt',
+                content_fr='Contenu', content_en='Content',
+                published=published
+            )
+
+    def test_index_and_sections(self):
+        """Test l'index des sitemaps et le contenu des sections"""
+        response = self.client.get('/sitemap.xml')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for section in ('static', 'projects', 'articles'):
+            self.assertContains(response, f'http://testserver/sitemap-{section}.xml')
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get('/sitemap-projects.xml')
+        self.assertContains(response, '<loc>http://testserver/mes-projects/projet</loc>')
+        response = self.client.get('/sitemap-articles.xml')
+        self.assertContains(response, '/blog/publie</loc>')
+        self.assertNotContains(response, 'brouillon')
+        self.assertEqual(self.client.get('/sitemap-inconnue.xml').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cached_until_change_and_conditional_get(self):
+        """Test que le XML est servi du cache, avec 304, puis regénéré après une modification"""
+        response = self.client.get('/sitemap-projects.xml')
+        last_modified = response['Last-Modified']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/sitemap-projects.xml').content, response.content)
+            response = self.client.get('/sitemap-projects.xml', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.project.slug = 'projet-renomme'
+        self.project.save()
+        response = self.client.get('/sitemap-projects.xml')
+        self.assertContains(response, '/mes-projects/projet-renomme</loc>')
+
+    def test_removing_older_url_changes_validators(self):
+        """Test qu'un article ancien dépublié donne 200 à une requête conditionnelle"""
+        older = Article.objects.create(
+            title_fr='ancien', title_en='old', slug='ancien',
+            excerpt_fr='Extrait', excerpt_en='Excerpt',
+            content_fr='Contenu', content_en='Content',
+            published=True
+        )
+        Article.objects.filter(pk=older.pk).update(updated_at=timezone.now() - timedelta(days=30))
+        response = self.client.get('/sitemap-articles.xml')
+        self.assertContains(response, '/blog/ancien</loc>')
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        older.published = False
+        older.save()
+        # Regénération plus tard dans le temps (les dates HTTP sont à la seconde)
+        with mock.patch('portfoapp.sitemaps.time.time', return_value=time.time() + 5):
+            response = self.client.get('/sitemap-articles.xml', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotContains(response, '/blog/ancien</loc>')
+        response = self.client.get('/sitemap-articles.xml', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get('/sitemap-articles.xml', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(SITEMAP_PAGE_SIZE=1)
+    def test_sections_are_paginated(self):
+        """Test la pagination des sections listée dans l'index"""
+        Project.objects.create(
+            title_fr='Autre', title_en='Other', slug='autre',
+            description_fr='D', description_en='D',
+            short_description_fr='C', short_description_en='S'
+        )
+        response = self.client.get('/sitemap.xml')
+        self.assertContains(response, '/sitemap-projects.xml?p=2</loc>')
+        response = self.client.get('/sitemap-projects.xml?p=2')
+        self.assertContains(response, '/mes-projects/autre</loc>')
+        self.assertNotContains(response, '/mes-projects/projet<')
+        self.assertEqual(self.client.get('/sitemap-projects.xml?p=3').status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(API_CACHE_ENABLED=False)
+class ServerTimingTestCase(TestCase):
+    def setUp(self):
+        Project.objects.create(
+            title_fr='Projet', title_en='Project', slug='projet',
+            description_fr='Description', description_en='Description',
+            short_description_fr='Court', short_description_en='Short'
+        )
+
+    def get_metrics(self, url):
+        response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return {
+            entry.split(';')[0]: entry for entry in response['Server-Timing'].split(', ')
+        }
+
+    def test_breakdown(self):
+        """Test le détail SQL / sérialisation / rendu, synchrone et asynchrone"""
+        with CaptureQueriesContext(connection) as queries:
+            metrics = self.get_metrics(reverse('project-list'))
+        self.assertEqual(set(metrics), {'db', 'serialize', 'render', 'total'})
+        self.assertIn(f'desc="{len(queries)} queries"', metrics['db'])
+        self.assertTrue(all(value.isascii() for value in metrics.values()))
+
+        metrics = self.get_metrics(reverse('async-project-list'))
+        self.assertEqual(set(metrics), {'db', 'serialize', 'render', 'total'})
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get(reverse('project-list'), HTTP_ACCEPT='application/json')
+        self.assertNotIn('Server-Timing', response)
+
+
+@override_settings(API_CACHE_ENABLED=False)
+class CompiledSerializerTestCase(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        category = ProjectCategory.objects.create(name_fr='Web', name_en='Web', slug='web')
+        technologies = [Technology.objects.create(name=name) for name in ('Vue', 'Django')]
+        project = Project.objects.create(
+            title_fr='Projet', title_en='Project', slug='projet',
+            description_fr='D', description_en='D', short_description_fr='C', short_description_en='S',
+            image=make_image('capture été.png', (800, 400)), category=category, featured=True,
+        )
+        project.technologies.set(technologies)
+        Project.objects.create(
+            title_fr='Sans image', title_en='No image', slug='sans-image',
+            description_fr='D', description_en='D', short_description_fr='C', short_description_en='S',
+        )
+        article = Article.objects.create(
+            title_fr='Article', title_en='Article', slug='article', excerpt_fr='E', excerpt_en='E',
+            content_fr='C', content_en='C', published=True, featured=True, published_at=timezone.now(),
+            category=ArticleCategory.objects.create(name_fr='Blog', name_en='Blog', slug='blog'),
+        )
+        article.tags.set([Tag.objects.create(name='python', slug='python')])
+        Skill.objects.create(
+            name='Python', skill_type='technical', level=90,
+            category=SkillCategory.objects.create(name_fr='Langages', name_en='Languages'),
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_same_representation_as_drf(self):
+        """Test que le chemin compilé produit exactement le JSON du ModelSerializer"""
+        urls = [reverse(name) for name in (
+            'project-list', 'project-featured', 'article-list', 'article-featured', 'skill-list', 'home-list',
+        )]
+        urls += [reverse('project-detail', kwargs={'pk': pk}) for pk in Project.objects.values_list('pk', flat=True)]
+        urls += [reverse('article-detail', kwargs={'pk': Article.objects.get().pk})]
+        urls += [reverse('skill-detail', kwargs={'pk': Skill.objects.get().pk})]
+        for url in urls:
+            for params in ({}, {'lang': 'en'}, {'cursor': ''}):
+                responses = []
+                for enabled in (False, True):
+                    with self.settings(API_COMPILED_SERIALIZERS=enabled):
+                        responses.append(self.client.get(url, params, HTTP_ACCEPT='application/json'))
+                self.assertEqual(responses[0].status_code, 200, url)
+                self.assertEqual(responses[0].content, responses[1].content, (url, params))
+
+        data = self.client.get(reverse('project-featured'), HTTP_ACCEPT='application/json').json()[0]
+        self.assertEqual([tech['name'] for tech in data['technologies']], ['Django', 'Vue'])
+        self.assertTrue(data['image_url'].startswith('http://testserver/media/projects/capture_%C3%A9t%C3%A9'))
+        self.assertIn(' 640w', data['image_variants']['srcset']['webp'])
+
+    def test_json_is_the_default_renderer(self):
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        Project.objects.create(
+            title_fr='Projet', title_en='Project', slug='projet',
+            description_fr='Description', description_en='Description',
+            short_description_fr='Court', short_description_en='Short'
+        )
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_request_and_cache_metrics(self):
+        """Test les compteurs par route, les requêtes SQL et les succès de cache"""
+        responses = self.sample('portfolio_http_responses_total', route='project-list', method='GET', status='200')
+        requests = self.sample('portfolio_db_queries_per_request_count', route='project-list')
+        hits = self.sample('portfolio_cache_lookups_total', cache='api', result='hit')
+        misses = self.sample('portfolio_cache_lookups_total', cache='api', result='miss')
+
+        for _ in range(2):
+            self.client.get(reverse('project-list'), HTTP_ACCEPT='application/json')
+
+        self.assertEqual(
+            self.sample('portfolio_http_responses_total', route='project-list', method='GET', status='200'),
+            responses + 2,
+        )
+        self.assertEqual(self.sample('portfolio_db_queries_per_request_count', route='project-list'), requests + 2)
+        self.assertEqual(self.sample('portfolio_cache_lookups_total', cache='api', result='miss'), misses + 1)
+        self.assertEqual(self.sample('portfolio_cache_lookups_total', cache='api', result='hit'), hits + 1)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_scrape_endpoint(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'portfolio_http_request_duration_seconds', response.content)
+        with self.settings(METRICS_ENABLED=False):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+
+    def test_scrape_endpoint_requires_token_in_production(self):
+        """Test que /metrics sans jeton n'est servi qu'avec DEBUG"""
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+
+class BenchmarkAPITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        Project.objects.create(
+            title_fr='Projet', title_en='Project', slug='projet',
+            description_fr='Description', description_en='Description',
+            short_description_fr='Court', short_description_en='Short'
+        )
+
+    def test_benchmark_writes_results(self):
+        """Test le benchmark en processus : routes du routeur, sitemap et résultats JSON"""
+        handle, output = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        self.addCleanup(os.remove, output)
+        call_command(
+            'benchmark_api', requests=4, concurrency=1, no_cache=True, output=output,
+            stdout=StringIO(), stderr=StringIO(),
+        )
+        with open(output) as f:
+            results = json.load(f)['endpoints']
+        for name in ('project-list', 'project-detail', 'settings-current', 'home-list', 'sitemap-index'):
+            self.assertIn(name, results)
+            self.assertEqual(results[name]['errors'], 0, name)
+        self.assertNotIn('contact-list', results)
+        self.assertGreater(results['project-list']['queries'], 0)
+        self.assertGreater(results['project-detail']['bytes'], 0)
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual([percentile(values, p) for p in (50, 95, 99, 100)], [50, 95, 99, 100])
+        values = list(range(1, 21))
+        self.assertEqual([percentile(values, p) for p in (50, 95, 99)], [10, 19, 20])
+        self.assertEqual(percentile([], 95), 0.0)
+
+
+class ExportStaticAPITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output)
+        self.project = Project.objects.create(
+            title_fr='Projet', title_en='Project', slug='projet',
+            description_fr='Description', description_en='Description',
+            short_description_fr='Court', short_description_en='Short', featured=True
+        )
+        self.article = Article.objects.create(
+            title_fr='Article', title_en='Article', slug='article',
+            excerpt_fr='Extrait', excerpt_en='Excerpt',
+            content_fr='Contenu', content_en='Content', published=True
+        )
+        for index in range(13):
+            Technology.objects.create(name=f'Techno {index:02}')
+        SiteSettings.load()
+
+    def export(self):
+        out = StringIO()
+        call_command('export_static_api', output=self.output, base_url='/api', host='testserver', stdout=out)
+        return out.getvalue()
+
+    def read(self, path):
+        with open(f'{self.output}/{path}', 'rb') as f:
+            return json.loads(f.read())
+
+    def test_export_and_incremental_rebuild(self):
+        """Test l'export complet, puis la réécriture des seuls fichiers modifiés"""
+        self.assertIn('0 inchangé(s)', self.export())
+        api = self.client.get(reverse('project-detail', kwargs={'pk': self.project.pk}), {'lang': 'en'},
+                              HTTP_ACCEPT='application/json')
+        self.assertEqual(self.read(f'en/projects/{self.project.pk}.json'), api.json())
+        for path in ('projects/featured.json', 'settings/current.json', 'home.json', 'fr/articles.json'):
+            self.assertTrue(os.path.exists(f'{self.output}/{path}.gz'), path)
+        self.assertFalse(os.path.exists(f'{self.output}/contact.json'))
+
+        # Pagination : liens vers les fichiers exportés
+        self.assertEqual(self.read('technologies.json')['next'], '/api/technologies/page/2.json')
+        self.assertEqual(len(self.read('technologies/page/2.json')['results']), 1)
+
+        self.assertIn('0 fichier(s) écrit(s)', self.export())
+
+        technologies_mtime = os.stat(f'{self.output}/technologies.json').st_mtime_ns
+        article_pk = self.article.pk
+        self.project.title_en = 'Renamed'
+        self.project.save()
+        self.article.delete()
+        output = self.export()
+        self.assertEqual(self.read(f'en/projects/{self.project.pk}.json')['title'], 'Renamed')
+        self.assertFalse(os.path.exists(f'{self.output}/articles/{article_pk}.json'))
+        self.assertIn('3 supprimé(s)', output)
+        self.assertEqual(os.stat(f'{self.output}/technologies.json').st_mtime_ns, technologies_mtime)
+
+
+class GunicornConfigTestCase(TestCase):
+    def setUp(self):
+        self.conf = runpy.run_path(str(settings.BASE_DIR / 'gunicorn_config.py'))
+        self.cgroup = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cgroup)
+        # run_path renvoie une copie : on modifie les globales vues par les fonctions
+        self.conf['read_cgroup_file'].__globals__['CGROUP_ROOT'] = self.cgroup
+
+    def write_cgroup(self, name, value):
+        path = os.path.join(self.cgroup, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(value)
+
+    def test_cgroup_limits(self):
+        """Test la lecture des quotas cgroup v2 et v1 et le plafonnement par la mémoire"""
+        self.assertIsNone(self.conf['cgroup_cpu_limit']())
+        self.assertIsNone(self.conf['cgroup_memory_limit']())
+
+        self.write_cgroup('cpu/cpu.cfs_quota_us', '50000')
+        self.write_cgroup('cpu/cpu.cfs_period_us', '100000')
+        self.write_cgroup('memory/memory.limit_in_bytes', str(2 ** 63 - 4096))
+        self.assertEqual(self.conf['cgroup_cpu_limit'](), 0.5)
+        self.assertIsNone(self.conf['cgroup_memory_limit']())
+
+        self.write_cgroup('cpu.max', '150000 100000')
+        self.write_cgroup('memory.max', str(256 * 1024 * 1024))
+        self.assertEqual(self.conf['cgroup_cpu_limit'](), 1.5)
+        self.assertLessEqual(self.conf['available_cpus'](), 2)
+
+        compute_workers = self.conf['compute_workers']
+        self.assertEqual(compute_workers(4, None, 'sync'), 9)
+        self.assertEqual(compute_workers(4, None, 'gthread'), 5)
+        # (256 - 64 Mo réservés) // 80 Mo par worker
+        self.assertEqual(compute_workers(4, 256 * 1024 * 1024, 'gthread'), 2)
+        self.assertEqual(compute_workers(4, 64 * 1024 * 1024, 'sync'), 1)
+
+    def test_shared_cache_with_several_workers(self):
+        """Test que plusieurs workers imposent un cache partagé (locmem refusé)"""
+        path = str(settings.BASE_DIR / 'gunicorn_config.py')
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '3'}):
+            os.environ.pop('CACHE_BACKEND', None)
+            conf = runpy.run_path(path)
+        self.assertIn('CACHE_BACKEND=file', conf['raw_env'])
+
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '3', 'CACHE_BACKEND': 'locmem'}):
+            conf = runpy.run_path(path)
+        with self.assertRaisesMessage(RuntimeError, 'CACHE_BACKEND=locmem'):
+            conf['on_starting'](mock.Mock())
+
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '1'}):
+            os.environ.pop('CACHE_BACKEND', None)
+            conf = runpy.run_path(path)
+        self.assertIn('CACHE_BACKEND=locmem', conf['raw_env'])
+
+
+class SeedDatasetTestCase(APITestCase):
+    def seed(self, **options):
+        call_command('seed_dataset', scale=0.001, stdout=StringIO(), **options)
+
+    def test_reproducible_bulk_dataset(self):
+        """Test le jeu de données : volumes, relations, dates réalistes, graine et invalidation du cache"""
+        cache.clear()
+        url = reverse('project-list')
+        self.assertEqual(self.client.get(url, HTTP_ACCEPT='application/json').data['count'], 0)
+
+        self.seed(seed=7)
+        self.assertEqual(Article.objects.count(), 10)
+        self.assertEqual(Project.objects.count(), 2)
+        self.assertEqual(ContactMessage.objects.count(), 1000)
+        self.assertEqual(OutboxEmail.objects.filter(recipients=['contact@portfolio.test']).count(), 20)
+        self.assertTrue(Project.technologies.through.objects.exists())
+        self.assertTrue(Article.tags.through.objects.exists())
+        self.assertGreater(len(set(ContactMessage.objects.values_list('created_at', flat=True))), 900)
+        self.assertGreater(len(Article.objects.first().content_en.split()), 300)
+        # Réponse en cache invalidée malgré bulk_create
+        self.assertEqual(self.client.get(url, HTTP_ACCEPT='application/json').data['count'], 2)
+
+        titles = list(Article.objects.order_by('slug').values_list('title_fr', 'content_en'))
+        with self.assertRaises(CommandError):
+            self.seed(seed=7)
+        self.seed(seed=7, clear=True)
+        self.assertEqual(list(Article.objects.order_by('slug').values_list('title_fr', 'content_en')), titles)
+
+        # auto_now est rétabli après la génération
+        tag = Tag.objects.create(name='nouveau', slug='nouveau')
+        self.assertLess(timezone.now() - tag.created_at, timedelta(minutes=1))
+
+
+class MediaServingTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.content = bytes(range(256)) * 4
+        default_storage.save('cv/cv.pdf', BytesIO(self.content))
+        default_storage.save('projects/variants/capture-0123abcd-320w.webp', BytesIO(b'webp'))
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_full_response_and_conditional_get(self):
+        response = self.client.get('/media/cv/cv.pdf')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertFalse(response['ETag'].startswith('W/'))
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+        response = self.client.get('/media/cv/cv.pdf', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_range_requests(self):
+        """Test les intervalles simples, suffixes, If-Range et hors fichier"""
+        response = self.client.get('/media/cv/cv.pdf', HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(response['Content-Length'], '10')
+
+        response = self.client.get('/media/cv/cv.pdf', HTTP_RANGE='bytes=-4')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-4:])
+
+        response = self.client.get('/media/cv/cv.pdf', HTTP_RANGE='bytes=0-0', HTTP_IF_RANGE='"ancien"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get('/media/cv/cv.pdf', HTTP_RANGE='bytes=2000-')
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_content_hashed_files_are_immutable(self):
+        response = self.client.get('/media/projects/variants/capture-0123abcd-320w.webp')
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertIn('immutable', response['Cache-Control'])
+
+        # Fichiers téléversés dont le nom ressemble à une empreinte : remplaçables
+        for name in ('cv/cv-20250101.pdf', 'projects/photo-deadbeef.jpg', 'projects/photo-deadbeef-320w.jpg'):
+            default_storage.save(name, BytesIO(b'contenu'))
+            with self.subTest(name=name):
+                response = self.client.get(f'/media/{name}')
+                self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_path_traversal_is_rejected(self):
+        self.assertEqual(self.client.get('/media/../manage.py').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get('/media/cv/').status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(MEDIA_OFFLOAD='x-accel-redirect')
+    def test_offload_to_proxy(self):
+        response = self.client.get('/media/cv/cv.pdf')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/cv/cv.pdf')
+        self.assertEqual(response.content, b'')
+        self.assertIn('ETag', response)
+
 
 class ContactMessageAPITestCase(APITestCase):
     def test_create_contact_message(self):
@@ -77,5 +1202,169 @@ class ContactMessageAPITestCase(APITestCase):
             'message': 'Test message',
             'honeypot': ''
         }
-        response = self.client.post(url, data, format='json')
+        with self.assertLogs('portfoapp.outbox', 'WARNING'):
+            response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class FailingEmailBackend(LocmemEmailBackend):
+    def send_messages(self, messages):
+        raise SMTPServerDisconnected('Connexion perdue')
+
+
+class OutboxTestCase(APITestCase):
+    def setUp(self):
+        SiteSettings.clear_cache()
+        SiteSettings.objects.create(
+            owner_name='Test', owner_title_fr='Dev', owner_title_en='Dev',
+            owner_bio_fr='Bio', owner_bio_en='Bio', owner_email='owner@example.com',
+        )
+        self.data = {
+            'name': 'Test User',
+            'email': 'test@example.com',
+            'subject': 'Test Subject',
+            'message': 'Test message',
+            'honeypot': ''
+        }
+
+    def send_outbox(self):
+        call_command('send_outbox', '--once', stdout=StringIO())
+
+    def test_contact_message_is_queued_not_sent(self):
+        """Test que la requête enregistre la notification sans contacter le serveur SMTP"""
+        response = self.client.post(reverse('contact-list'), self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(email.recipients, ['owner@example.com'])
+        self.assertEqual(email.contact_message, ContactMessage.objects.get())
+
+    def test_worker_delivers_pending_emails(self):
+        for i in range(3):
+            self.client.post(reverse('contact-list'), dict(self.data, subject=f'Sujet {i}'), format='json')
+        self.send_outbox()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].to, ['owner@example.com'])
+        self.assertEqual(mail.outbox[0].reply_to, ['test@example.com'])
+        self.assertFalse(OutboxEmail.objects.exclude(status='sent').exists())
+
+        # Rien n'est renvoyé au passage suivant
+        self.send_outbox()
+        self.assertEqual(len(mail.outbox), 3)
+
+    @override_settings(EMAIL_BACKEND='portfoapp.tests.FailingEmailBackend')
+    def test_failed_delivery_is_retried_with_backoff(self):
+        self.client.post(reverse('contact-list'), self.data, format='json')
+        with self.assertLogs('portfoapp.outbox', 'WARNING'):
+            self.send_outbox()
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(email.attempts, 1)
+        self.assertIn('Connexion perdue', email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+
+        # Tentative due mais nombre maximal atteint : abandon
+        with self.settings(OUTBOX_MAX_ATTEMPTS=2):
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            with self.assertLogs('portfoapp.outbox', 'ERROR'):
+                self.send_outbox()
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'failed')
+        self.assertEqual(email.attempts, 2)
+
+
+class StubRecaptchaHandler(BaseHTTPRequestHandler):
+    """Vérificateur local : le jeton `valid` est accepté, `slow` dépasse le délai"""
+    calls = 0
+
+    def do_POST(self):
+        type(self).calls += 1
+        params = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode())
+        token = params['response'][0]
+        if token == 'slow':
+            # Le client a abandonné entre-temps : inutile de répondre
+            time.sleep(0.5)
+            return
+        body = json.dumps({'success': token == 'valid'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecaptchaTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubRecaptchaHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.settings_override = override_settings(
+            RECAPTCHA_SECRET_KEY='secret',
+            RECAPTCHA_VERIFY_URL=f'http://127.0.0.1:{cls.server.server_port}/siteverify',
+            RECAPTCHA_READ_TIMEOUT=0.1,
+            RECAPTCHA_BREAKER_THRESHOLD=2,
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        recaptcha_client.reset()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        recaptcha_client.reset()
+        StubRecaptchaHandler.calls = 0
+        SiteSettings.clear_cache()
+        SiteSettings.objects.create(
+            owner_name='Test', owner_title_fr='Dev', owner_title_en='Dev',
+            owner_bio_fr='Bio', owner_bio_en='Bio', owner_email='owner@example.com',
+        )
+
+    def post(self, token):
+        data = {
+            'name': 'Test User',
+            'email': 'test@example.com',
+            'subject': 'Test Subject',
+            'message': 'Test message',
+            'recaptcha_token': token,
+        }
+        return self.client.post(reverse('contact-list'), data, format='json')
+
+    def test_tokens_are_single_use(self):
+        """Test qu'un jeton accepté ne peut pas être rejoué et qu'un refus est mémorisé"""
+        self.assertEqual(self.post('valid').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.post('valid').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post('invalid').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post('invalid').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(StubRecaptchaHandler.calls, 2)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_circuit_breaker_applies_failure_policy(self):
+        """Test qu'un vérificateur lent est court-circuité après plusieurs délais dépassés"""
+        for _ in range(2):
+            with self.assertLogs('portfoapp.recaptcha', 'WARNING'):
+                self.assertEqual(self.post('slow').status_code, status.HTTP_201_CREATED)
+        self.assertTrue(recaptcha_client.breaker.is_open)
+
+        calls = StubRecaptchaHandler.calls
+        with self.settings(RECAPTCHA_FAILURE_POLICY='deny'):
+            response = self.post('other')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(StubRecaptchaHandler.calls, calls)
+        self.assertEqual(ContactMessage.objects.count(), 2)
+
+    def test_server_timing_includes_verification(self):
+        response = self.post('valid')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        metrics = [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+        self.assertIn('recaptcha', metrics)
+        self.assertIn('serialize', metrics)
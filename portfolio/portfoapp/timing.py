@@ -0,0 +1,109 @@
+"""
+Mesure du temps passé par requête, exposée dans l'en-tête Server-Timing
+
+Le middleware ServerTimingMiddleware (portfoapp/middleware.py) ouvre une
+mesure par requête (variable de contexte, donc propre au thread ou à la
+tâche asynchrone) ; les étapes y ajoutent leur durée :
+
+- db : requêtes SQL (nombre en description, ex. `desc="3 queries"`), via un execute_wrapper posé
+  sur chaque connexion ;
+- serialize : to_representation / validation des sérialiseurs des vues
+  (SQL déclenché pendant la sérialisation compris) ;
+- render : rendu de la réponse DRF (JSON ou API navigable) ;
+- recaptcha : appel HTTP sortant de vérification ;
+- total : durée de la requête vue par le middleware.
+
+Hors requête (commandes, worker send_outbox) ou si SERVER_TIMING_ENABLED est
+faux, les mesures ne coûtent qu'une lecture de variable de contexte.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar('portfoapp_server_timing', default=None)
+
+
+class ServerTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.metrics = {}
+
+    def add(self, name, duration):
+        total, calls = self.metrics.get(name, (0.0, 0))
+        self.metrics[name] = (total + duration, calls + 1)
+
+    def header(self):
+        parts = []
+        for name, (duration, calls) in self.metrics.items():
+            entry = f'{name};dur={duration * 1000:.1f}'
+            if name == 'db':
+                # Valeur d'en-tête HTTP : ASCII uniquement
+                entry += f';desc="{calls} {"queries" if calls > 1 else "query"}"'
+            parts.append(entry)
+        parts.append(f'total;dur={(time.perf_counter() - self.started) * 1000:.1f}')
+        return ', '.join(parts)
+
+
+def current_timing():
+    return _current.get()
+
+
+def activate_timing(timing):
+    """Rend la mesure courante ; retourne le jeton à passer à deactivate_timing"""
+    return _current.set(timing)
+
+
+def deactivate_timing(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """Ajoute la durée du bloc à la mesure de la requête en cours, s'il y en a une"""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
+
+
+def db_timer(execute, sql, params, many, context):
+    """execute_wrapper : durée et nombre des requêtes SQL de la requête en cours"""
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.add('db', time.perf_counter() - started)
+
+
+def install_db_timer(sender, connection, **kwargs):
+    """Récepteur de connection_created ; le wrapper survit aux reconnexions"""
+    if db_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_timer)
+
+
+class ServerTimingMixin:
+    """Mesure la sérialisation dans les viewsets DRF"""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if _current.get() is not None:
+            # Méthodes de l'instance racine seulement : les enfants d'une liste
+            # et les champs imbriqués sont couverts par son to_representation
+            for method in ('to_representation', 'run_validation'):
+                setattr(serializer, method, _timed_method(getattr(serializer, method), 'serialize'))
+        return serializer
+
+
+def _timed_method(method, name):
+    def wrapper(*args, **kwargs):
+        with timed(name):
+            return method(*args, **kwargs)
+    return wrapper
@@ -1,10 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .async_views import (
+    AsyncArticleView, AsyncExperienceView, AsyncProjectView,
+    AsyncSiteSettingsView, AsyncSkillView
+)
 from .views import (
     SkillCategoryViewSet, SkillViewSet, ExperienceViewSet,
     ProjectCategoryViewSet, TechnologyViewSet, ProjectViewSet,
     ArticleCategoryViewSet, TagViewSet, ArticleViewSet,
-    ContactMessageViewSet, SiteSettingsViewSet
+    ContactMessageViewSet, SiteSettingsViewSet, HomeBundleViewSet
 )
 
 router = DefaultRouter()
@@ -19,7 +23,22 @@ router.register(r'tags', TagViewSet, basename='tag')
 router.register(r'articles', ArticleViewSet, basename='article')
 router.register(r'contact', ContactMessageViewSet, basename='contact')
 router.register(r'settings', SiteSettingsViewSet, basename='settings')
+router.register(r'home', HomeBundleViewSet, basename='home')
+
+# Lecture asynchrone (ASGI), même format que l'API ci-dessus
+async_urlpatterns = [
+    path('skills/', AsyncSkillView.as_view(), name='async-skill-list'),
+    path('skills/<int:pk>/', AsyncSkillView.as_view(), name='async-skill-detail'),
+    path('experiences/', AsyncExperienceView.as_view(), name='async-experience-list'),
+    path('experiences/<int:pk>/', AsyncExperienceView.as_view(), name='async-experience-detail'),
+    path('projects/', AsyncProjectView.as_view(), name='async-project-list'),
+    path('projects/<int:pk>/', AsyncProjectView.as_view(), name='async-project-detail'),
+    path('articles/', AsyncArticleView.as_view(), name='async-article-list'),
+    path('articles/<int:pk>/', AsyncArticleView.as_view(), name='async-article-detail'),
+    path('settings/current/', AsyncSiteSettingsView.as_view(), name='async-settings-current'),
+]
 
 urlpatterns = [
+    path('async/', include(async_urlpatterns)),
     path('', include(router.urls)),
 ]
\ No newline at end of file
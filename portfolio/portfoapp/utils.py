@@ -1,44 +1,44 @@
 """
 Utilitaires pour l'application portfolio
 """
-import json
-from django.http import JsonResponse
-from django.core.serializers.json import DjangoJSONEncoder
+from django.conf import settings as django_settings
 
 
-def generate_structured_data(request):
+def generate_structured_data(request, site_settings=None, language=None):
     """
-    Génère les données structurées JSON-LD pour le SEO
+    Génère les données structurées JSON-LD pour le SEO, dans la langue
+    demandée (langue par défaut du site sinon)
     """
     from .models import SiteSettings
-    
-    settings = SiteSettings.load()
-    
+
+    settings = site_settings or SiteSettings.load()
+    language = language or django_settings.LANGUAGE_CODE.split('-')[0]
+
     # Person schema
     person_schema = {
         "@context": "https://schema.org",
         "@type": "Person",
         "name": settings.owner_name,
-        "jobTitle": settings.owner_title_fr,
+        "jobTitle": getattr(settings, f'owner_title_{language}'),
         "email": settings.owner_email,
         "url": request.build_absolute_uri('/'),
     }
-    
+
     if settings.owner_photo:
         person_schema["image"] = request.build_absolute_uri(settings.owner_photo.url)
-    
-    if settings.linkedin_url:
-        person_schema["sameAs"] = [settings.linkedin_url]
-        if settings.github_url:
-            person_schema["sameAs"].append(settings.github_url)
-    
+
+    same_as = [url for url in (settings.linkedin_url, settings.github_url) if url]
+    if same_as:
+        person_schema["sameAs"] = same_as
+
     # Website schema
     website_schema = {
         "@context": "https://schema.org",
         "@type": "WebSite",
-        "name": settings.site_name_fr,
+        "name": getattr(settings, f'site_name_{language}'),
         "url": request.build_absolute_uri('/'),
-        "description": settings.site_description_fr,
+        "description": getattr(settings, f'site_description_{language}'),
+        "inLanguage": language,
     }
-    
+
     return [person_schema, website_schema]
@@ -1,18 +1,28 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.utils import timezone
 from django.conf import settings
-from django.core.mail import send_mail
+from django.db import transaction
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-import requests
 
 from .models import (
     SkillCategory, Skill, Experience, ProjectCategory, Technology,
     Project, ArticleCategory, Tag, Article, ContactMessage, SiteSettings
 )
+from .cache import CachedResponseMixin
+from .compiled import CompiledReadMixin, serialize_many
+from .conditional import ConditionalGetMixin
+from .counters import view_counts
+from .i18n import LanguageScopedMixin
+from .outbox import enqueue_contact_notification
+from .utils import generate_structured_data
+from .recaptcha import RecaptchaUnavailable, recaptcha_client
+from .timing import ServerTimingMixin, timed
+from .pagination import ArticleKeysetPagination, OptionalKeysetPaginationMixin, ProjectKeysetPagination
 from .serializers import (
     SkillCategorySerializer, SkillSerializer, ExperienceSerializer,
     ProjectCategorySerializer, TechnologySerializer, ProjectSerializer,
@@ -21,39 +31,54 @@ from .serializers import (
 )
 
 
-class SkillCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicReadOnlyModelViewSet(
+    ServerTimingMixin, CachedResponseMixin, ConditionalGetMixin, LanguageScopedMixin,
+    CompiledReadMixin, viewsets.ReadOnlyModelViewSet
+):
+    """
+    Base des endpoints publics : mesures, cache, requêtes conditionnelles,
+    langue et sérialisation compilée (`compiled_actions`)
+    """
+
+
+class SkillCategoryViewSet(PublicReadOnlyModelViewSet):
     queryset = SkillCategory.objects.all()
     serializer_class = SkillCategorySerializer
     permission_classes = [AllowAny]
 
 
-class SkillViewSet(viewsets.ReadOnlyModelViewSet):
+class SkillViewSet(PublicReadOnlyModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [AllowAny]
     filterset_fields = ['skill_type', 'category']
+    validator_models = (SkillCategory,)
+    compiled_actions = ('list', 'retrieve')
+
+    def get_queryset(self):
+        return self.scope_language(Skill.objects.for_api())
 
 
-class ExperienceViewSet(viewsets.ReadOnlyModelViewSet):
+class ExperienceViewSet(PublicReadOnlyModelViewSet):
     queryset = Experience.objects.all()
     serializer_class = ExperienceSerializer
     permission_classes = [AllowAny]
     filterset_fields = ['experience_type']
 
 
-class ProjectCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class ProjectCategoryViewSet(PublicReadOnlyModelViewSet):
     queryset = ProjectCategory.objects.all()
     serializer_class = ProjectCategorySerializer
     permission_classes = [AllowAny]
 
 
-class TechnologyViewSet(viewsets.ReadOnlyModelViewSet):
+class TechnologyViewSet(PublicReadOnlyModelViewSet):
     queryset = Technology.objects.all()
     serializer_class = TechnologySerializer
     permission_classes = [AllowAny]
 
 
-class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
+class ProjectViewSet(OptionalKeysetPaginationMixin, PublicReadOnlyModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [AllowAny]
@@ -61,6 +86,17 @@ class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['title_fr', 'title_en', 'description_fr', 'description_en']
     ordering_fields = ['created_at', 'order', 'title_fr']
     ordering = ['-featured', '-order', '-created_at']
+    validator_models = (ProjectCategory, Technology)
+    keyset_pagination_class = ProjectKeysetPagination
+    conditional_actions = ('list', 'retrieve', 'featured')
+    compiled_actions = ('list', 'retrieve', 'featured')
+
+    def get_queryset(self):
+        # Nombre de requêtes fixe pour list, retrieve et featured
+        queryset = Project.objects.for_api()
+        if self.action == 'featured':
+            queryset = queryset.filter(featured=True)
+        return self.scope_language(queryset)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -70,24 +106,26 @@ class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Retourne uniquement les projets vedettes"""
-        featured_projects = self.queryset.filter(featured=True)
-        serializer = self.get_serializer(featured_projects, many=True)
-        return Response(serializer.data)
+        response = self.get_precomputed_response(request)
+        if response is not None:
+            return response
+        featured_projects = self.get_queryset()
+        return Response(self.serialize_queryset(featured_projects))
 
 
-class ArticleCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class ArticleCategoryViewSet(PublicReadOnlyModelViewSet):
     queryset = ArticleCategory.objects.all()
     serializer_class = ArticleCategorySerializer
     permission_classes = [AllowAny]
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(PublicReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [AllowAny]
 
 
-class ArticleViewSet(viewsets.ReadOnlyModelViewSet):
+class ArticleViewSet(OptionalKeysetPaginationMixin, PublicReadOnlyModelViewSet):
     queryset = Article.objects.filter(published=True)
     serializer_class = ArticleSerializer
     permission_classes = [AllowAny]
@@ -95,6 +133,22 @@ class ArticleViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['title_fr', 'title_en', 'content_fr', 'content_en', 'excerpt_fr', 'excerpt_en']
     ordering_fields = ['published_at', 'created_at', 'views_count']
     ordering = ['-published_at', '-created_at']
+    validator_models = (ArticleCategory, Tag)
+    # views_count est écrit sans toucher updated_at (portfoapp/counters.py)
+    versioned_models = (Article,)
+    keyset_pagination_class = ArticleKeysetPagination
+    conditional_actions = ('list', 'retrieve', 'featured')
+    compiled_actions = ('list', 'retrieve', 'featured')
+
+    def get_queryset(self):
+        # Nombre de requêtes fixe pour list, retrieve et featured
+        queryset = Article.objects.published()
+        if self.action == 'increment_views':
+            return queryset
+        queryset = queryset.for_api()
+        if self.action == 'featured':
+            queryset = queryset.filter(featured=True)
+        return self.scope_language(queryset)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -103,21 +157,24 @@ class ArticleViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=True, methods=['post'])
     def increment_views(self, request, pk=None):
-        """Incrémente le compteur de vues"""
-        article = self.get_object()
-        article.views_count += 1
-        article.save()
-        return Response({'views_count': article.views_count})
+        """Incrémente le compteur de vues (écriture différée, sans verrou)"""
+        article_id, views_count = get_object_or_404(
+            self.get_queryset().values_list('pk', 'views_count'), pk=pk
+        )
+        # Vues en tampon lues avant une éventuelle écriture déclenchée par add()
+        return Response({'views_count': views_count + view_counts.add(article_id)})
 
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Retourne uniquement les articles vedettes"""
-        featured_articles = self.queryset.filter(featured=True)
-        serializer = self.get_serializer(featured_articles, many=True)
-        return Response(serializer.data)
+        response = self.get_precomputed_response(request)
+        if response is not None:
+            return response
+        featured_articles = self.get_queryset()
+        return Response(self.serialize_queryset(featured_articles))
 
 
-class ContactMessageViewSet(viewsets.ModelViewSet):
+class ContactMessageViewSet(ServerTimingMixin, viewsets.ModelViewSet):
     queryset = ContactMessage.objects.all()
     permission_classes = [AllowAny]
 
@@ -130,109 +187,38 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
+        # Récupération des informations de la requête
+        ip_address = self.get_client_ip(request)
+        user_agent = request.META.get('HTTP_USER_AGENT', '')
+
         # Vérification reCAPTCHA si configuré
         recaptcha_token = serializer.validated_data.pop('recaptcha_token', None)
         if settings.RECAPTCHA_SECRET_KEY and recaptcha_token:
-            recaptcha_response = requests.post(
-                'https://www.google.com/recaptcha/api/siteverify',
-                data={
-                    'secret': settings.RECAPTCHA_SECRET_KEY,
-                    'response': recaptcha_token
-                }
-            )
-            recaptcha_data = recaptcha_response.json()
-            if not recaptcha_data.get('success'):
+            try:
+                is_human = recaptcha_client.verify(recaptcha_token, ip_address)
+            except RecaptchaUnavailable:
+                return Response(
+                    {'error': 'Vérification reCAPTCHA indisponible, veuillez réessayer plus tard'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+            if not is_human:
                 return Response(
                     {'error': 'Échec de la vérification reCAPTCHA'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-        # Récupération des informations de la requête
-        ip_address = self.get_client_ip(request)
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
-
-        # Création du message
-        message = ContactMessage.objects.create(
-            name=serializer.validated_data['name'],
-            email=serializer.validated_data['email'],
-            subject=serializer.validated_data['subject'],
-            message=serializer.validated_data['message'],
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
-
-        # Envoi de l'email de notification
-        email_sent = False
-        email_error = None
-        
-        try:
-            site_settings = SiteSettings.load()
-            
-            # Vérifier que l'email du propriétaire est défini
-            if not site_settings.owner_email or site_settings.owner_email == 'email@example.com':
-                email_error = "L'email du propriétaire n'est pas configuré dans SiteSettings"
-                print(f"⚠️ ATTENTION: {email_error}")
-                print(f"⚠️ Allez dans /admin/portfoapp/sitesettings/ pour le définir.")
-            elif not settings.EMAIL_HOST_USER:
-                email_error = "EMAIL_HOST_USER n'est pas configuré dans .env"
-                print(f"⚠️ ATTENTION: {email_error}")
-            elif not settings.EMAIL_HOST_PASSWORD:
-                email_error = "EMAIL_HOST_PASSWORD n'est pas configuré dans .env"
-                print(f"⚠️ ATTENTION: {email_error}")
-            else:
-                print(f"\n{'='*60}")
-                print(f"📧 TENTATIVE D'ENVOI D'EMAIL")
-                print(f"{'='*60}")
-                print(f"📧 Destinataire: {site_settings.owner_email}")
-                print(f"📧 Expéditeur: {settings.EMAIL_HOST_USER}")
-                print(f"📧 Serveur SMTP: {settings.EMAIL_HOST}:{settings.EMAIL_PORT}")
-                print(f"📧 TLS: {settings.EMAIL_USE_TLS}")
-                print(f"📧 Backend: {settings.EMAIL_BACKEND}")
-                print(f"{'='*60}\n")
-                
-                send_mail(
-                    subject=f'[Portfolio] Nouveau message: {message.subject}',
-                    message=f'''
-Nouveau message de contact reçu:
-
-Nom: {message.name}
-Email: {message.email}
-Objet: {message.subject}
-
-Message:
-{message.message}
-
----
-Date: {message.created_at}
-IP: {ip_address}
-                    ''',
-                    from_email=settings.EMAIL_HOST_USER or settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[site_settings.owner_email],
-                    fail_silently=False,
-                )
-                email_sent = True
-                print(f"\n{'='*60}")
-                print(f"✅ EMAIL ENVOYÉ AVEC SUCCÈS")
-                print(f"✅ Destinataire: {site_settings.owner_email}")
-                print(f"{'='*60}\n")
-        except Exception as e:
-            # Log l'erreur mais ne bloque pas la création du message
-            import traceback
-            email_error = str(e)
-            print(f"\n{'='*60}")
-            print(f"❌ ERREUR LORS DE L'ENVOI DE L'EMAIL")
-            print(f"{'='*60}")
-            print(f"❌ Erreur: {e}")
-            print(f"❌ Type: {type(e).__name__}")
-            print(f"\n❌ Détails complets:")
-            print(f"{traceback.format_exc()}")
-            print(f"{'='*60}\n")
-        
-        # Avertir dans les logs si l'email n'a pas été envoyé
-        if not email_sent:
-            print(f"\n⚠️ Le message de contact a été enregistré mais l'email n'a pas été envoyé.")
-            if email_error:
-                print(f"⚠️ Raison: {email_error}\n")
+        # Création du message et de sa notification dans la même transaction :
+        # l'email est envoyé par le worker `send_outbox`, hors de la requête
+        with transaction.atomic():
+            message = ContactMessage.objects.create(
+                name=serializer.validated_data['name'],
+                email=serializer.validated_data['email'],
+                subject=serializer.validated_data['subject'],
+                message=serializer.validated_data['message'],
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+            enqueue_contact_notification(message)
 
         return Response(
             {'message': 'Votre message a été envoyé avec succès!'},
@@ -266,14 +252,15 @@ IP: {ip_address}
         return super().retrieve(request, *args, **kwargs)
 
 
-class SiteSettingsViewSet(viewsets.ReadOnlyModelViewSet):
+class SiteSettingsViewSet(PublicReadOnlyModelViewSet):
     queryset = SiteSettings.objects.all()
     serializer_class = SiteSettingsSerializer
     permission_classes = [AllowAny]
+    conditional_actions = ('list', 'retrieve', 'current', 'structured_data')
 
     def get_queryset(self):
         # Retourne toujours l'instance unique
-        return SiteSettings.objects.filter(pk=1)
+        return self.scope_language(SiteSettings.objects.filter(pk=1).order_by('pk'))
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -283,7 +270,83 @@ class SiteSettingsViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def current(self, request):
         """Retourne les paramètres actuels du site"""
-        settings_obj = SiteSettings.load()
+        response = self.get_precomputed_response(request)
+        if response is not None:
+            return response
+        # Lu en base comme structured_data : la réponse est mise en cache sous
+        # la version courante, pas depuis une copie locale peut-être périmée
+        settings_obj = self.get_queryset().first() or SiteSettings.load()
         serializer = self.get_serializer(settings_obj)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], url_path='structured-data')
+    def structured_data(self, request):
+        """
+        Données structurées JSON-LD (Person, WebSite) dans la langue demandée
+        (?lang=fr|en|auto), mises en cache jusqu'à la prochaine modification
+        """
+        response = self.get_precomputed_response(request)
+        if response is not None:
+            return response
+        # Lu en base (colonnes de la langue demandée) : le document est mis en
+        # cache sous la version courante, il ne doit pas venir d'une copie locale périmée
+        settings_obj = self.get_queryset().first() or SiteSettings.load()
+        return Response(generate_structured_data(request, settings_obj, self.get_language()))
+
+
+class HomeBundleViewSet(CachedResponseMixin, ConditionalGetMixin, LanguageScopedMixin, viewsets.ViewSet):
+    """
+    Agrège en une seule réponse tout ce dont la page d'accueil a besoin
+    (paramètres, compétences, expériences, projets et articles vedettes)
+    """
+    permission_classes = [AllowAny]
+    validator_models = (SiteSettings, ProjectCategory, Technology, ArticleCategory, Tag)
+    versioned_models = (Article,)
+    conditional_actions = ('list',)
+
+    def get_querysets(self):
+        querysets = {
+            'skill_categories': SkillCategory.objects.all(),
+            'skills': Skill.objects.for_api(),
+            'experiences': Experience.objects.all(),
+            'featured_projects': Project.objects.for_api().filter(featured=True),
+            'featured_articles': Article.objects.published().for_api().filter(featured=True),
+        }
+        return {name: self.scope_language(queryset) for name, queryset in querysets.items()}
+
+    def get_cache_models(self):
+        return [queryset.model for queryset in self.get_querysets().values()] + list(self.validator_models)
+
+    def get_validator_querysets(self):
+        # Un seul validateur pour tout le bundle
+        return list(self.get_querysets().values()) + [
+            model._default_manager.all() for model in self.validator_models
+        ]
+
+    def list(self, request):
+        response = self.get_precomputed_response(request)
+        if response is not None:
+            return response
+
+        context = {'request': request, 'language': self.get_language()}
+        querysets = self.get_querysets()
+        with timed('serialize'):
+            data = self.serialize_bundle(querysets, context)
+        return Response(data)
+
+    def serialize_bundle(self, querysets, context):
+        # Paramètres lus en base (pas la copie locale de SiteSettings.load()) :
+        # le bundle est mis en cache sous la version courante
+        site_settings = self.scope_language(SiteSettings.objects.filter(pk=1)).first() or SiteSettings.load()
+        return {
+            'settings': SiteSettingsSerializer(site_settings, context=context).data,
+            'skill_categories': SkillCategorySerializer(
+                querysets['skill_categories'], many=True, context=context
+            ).data,
+            'skills': serialize_many(SkillSerializer, querysets['skills'], context),
+            'experiences': ExperienceSerializer(
+                querysets['experiences'], many=True, context=context
+            ).data,
+            'featured_projects': serialize_many(ProjectSerializer, querysets['featured_projects'], context),
+            'featured_articles': serialize_many(ArticleSerializer, querysets['featured_articles'], context),
+        }
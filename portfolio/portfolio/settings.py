@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     'rest_framework',
     'corsheaders',
     'django_filters',
@@ -48,8 +49,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'portfoapp.middleware.ServerTimingMiddleware',  # en-tête Server-Timing (SERVER_TIMING_ENABLED)
+    'portfoapp.middleware.MetricsMiddleware',  # métriques Prometheus (METRICS_ENABLED)
     'django.contrib.sessions.middleware.SessionMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  #pour les staticfils css js et images
+    'portfoapp.middleware.AsyncWhiteNoiseMiddleware',  #pour les staticfils css js et images (WhiteNoise, compatible ASGI)
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -150,6 +153,15 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Fichiers média : durée de cache des fichiers ordinaires (revalidés par ETag) ;
+# seules les variantes générées (répertoire variants/, nom avec l'empreinte du
+# contenu et la largeur) sont servies `immutable`
+MEDIA_CACHE_MAX_AGE = config('MEDIA_CACHE_MAX_AGE', default=3600, cast=int)
+MEDIA_IMMUTABLE_PATTERN = r'(^|/)variants/[^/]+-[0-9a-f]{8}-\d+w\.\w+$'
+# Transfert délégué au proxy : '' (Django envoie le fichier), 'x-accel-redirect'
+# (nginx, location interne MEDIA_OFFLOAD_PREFIX) ou 'x-sendfile' (Apache)
+MEDIA_OFFLOAD = config('MEDIA_OFFLOAD', default='')
+MEDIA_OFFLOAD_PREFIX = config('MEDIA_OFFLOAD_PREFIX', default='/protected-media/')
 
 # WhiteNoise configuration
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
@@ -162,6 +174,12 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
 # REST Framework configuration
+# API navigable (HTML) de DRF : en développement seulement par défaut
+API_BROWSABLE = config('API_BROWSABLE', default=DEBUG, cast=bool)
+
+# Sérialisation compilée (values()) des projets, articles et compétences en lecture
+API_COMPILED_SERIALIZERS = config('API_COMPILED_SERIALIZERS', default=True, cast=bool)
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
@@ -170,13 +188,14 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 12,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
+        # Index plein texte pour les projets et articles, SearchFilter sinon
+        'portfoapp.search.FullTextSearchFilter',
     ],
+    # JSON en premier : un client sans en-tête Accept précis reçoit du JSON
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.BrowsableAPIRenderer',
         'rest_framework.renderers.JSONRenderer',
-    ],
+    ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if API_BROWSABLE else []),
 }
 
 
@@ -196,6 +215,78 @@ if cors_origins_env:
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Cache
+# locmem par défaut (un cache par processus, pour le développement) ; "file"
+# partage le cache et les compteurs d'invalidation entre les workers gunicorn
+# (choisi par gunicorn_config.py dès qu'il y a plusieurs workers)
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+
+# Une entrée par URL, langue et format : la limite de Django (300 entrées)
+# viderait le cache en permanence. Au-delà de CACHE_MAX_ENTRIES, 1 entrée sur
+# CACHE_CULL_FREQUENCY est supprimée
+CACHE_OPTIONS = {
+    'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=50000, cast=int),
+    'CULL_FREQUENCY': config('CACHE_CULL_FREQUENCY', default=10, cast=int),
+}
+
+if CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / 'cache')),
+            'OPTIONS': CACHE_OPTIONS,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'portfolio',
+            'OPTIONS': CACHE_OPTIONS,
+        }
+    }
+
+# Cache des réponses de l'API publique (invalidé à chaque modification)
+API_CACHE_ENABLED = config('API_CACHE_ENABLED', default=True, cast=bool)
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=600, cast=int)
+
+# En-tête Server-Timing sur chaque réponse : temps SQL (et nombre de requêtes),
+# sérialisation, rendu, appels HTTP sortants. Coût négligeable, visible dans
+# l'onglet Réseau du navigateur
+SERVER_TIMING_ENABLED = config('SERVER_TIMING_ENABLED', default=True, cast=bool)
+
+# Métriques Prometheus sur /metrics ; la collecte doit envoyer
+# `Authorization: Bearer <METRICS_TOKEN>`. Sans jeton, /metrics n'est servi
+# qu'avec DEBUG (404 en production)
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Sitemaps : XML mis en cache jusqu'à la prochaine modification (compteurs de
+# version) et nombre d'URLs par page de section
+SITEMAP_CACHE_TIMEOUT = config('SITEMAP_CACHE_TIMEOUT', default=86400, cast=int)
+SITEMAP_PAGE_SIZE = config('SITEMAP_PAGE_SIZE', default=5000, cast=int)
+
+# Export statique de l'API publique (python manage.py export_static_api) :
+# répertoire de sortie et URL publique sous laquelle il est servi (CDN)
+STATIC_API_ROOT = config('STATIC_API_ROOT', default=str(BASE_DIR / 'static-api'))
+STATIC_API_BASE_URL = config('STATIC_API_BASE_URL', default='/')
+
+# Durée (secondes) pendant laquelle chaque worker garde SiteSettings en mémoire
+# avant de comparer sa date de mise à jour avec celle en base
+SITE_SETTINGS_CACHE_TTL = config('SITE_SETTINGS_CACHE_TTL', default=60, cast=int)
+
+# Intervalle (secondes) d'écriture en base des vues d'articles mises en tampon
+ARTICLE_VIEWS_FLUSH_INTERVAL = config('ARTICLE_VIEWS_FLUSH_INTERVAL', default=10, cast=int)
+
+# Variantes responsives des images téléversées (largeurs en pixels, formats
+# par ordre de préférence, qualité d'encodage par format)
+IMAGE_VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+IMAGE_VARIANT_FORMATS = ('avif', 'webp')
+IMAGE_VARIANT_QUALITY = {'avif': 55, 'webp': 80}
+# GIF animés : largeur maximale du WebP animé, conversion dans un thread après le commit
+IMAGE_ANIMATED_MAX_WIDTH = 960
+IMAGE_BACKGROUND_CONVERSION = config('IMAGE_BACKGROUND_CONVERSION', default=True, cast=bool)
+
 # Email configuration (pour le formulaire de contact)
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
@@ -205,6 +296,17 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 # Pour les mots de passe avec espaces, utiliser raw pour éviter les problèmes
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='', cast=str)
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@portfolio.com')
+# Délai maximal (secondes) d'une opération SMTP dans le worker d'envoi
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=10, cast=int)
+
+# Boîte d'envoi (commande `send_outbox`) : taille des lots, intervalle de
+# scrutation, durée de réservation d'un lot et reprises (délai exponentiel)
+OUTBOX_BATCH_SIZE = config('OUTBOX_BATCH_SIZE', default=20, cast=int)
+OUTBOX_POLL_INTERVAL = config('OUTBOX_POLL_INTERVAL', default=5, cast=float)
+OUTBOX_LEASE = config('OUTBOX_LEASE', default=300, cast=int)
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=8, cast=int)
+OUTBOX_RETRY_DELAY = config('OUTBOX_RETRY_DELAY', default=30, cast=int)
+OUTBOX_RETRY_MAX_DELAY = config('OUTBOX_RETRY_MAX_DELAY', default=3600, cast=int)
 
 # Debug: Afficher la configuration email (sans le mot de passe)
 if DEBUG:
@@ -218,3 +320,16 @@ if DEBUG:
 # reCAPTCHA configuration
 RECAPTCHA_SECRET_KEY = config('RECAPTCHA_SECRET_KEY', default='')
 RECAPTCHA_SITE_KEY = config('RECAPTCHA_SITE_KEY', default='')
+RECAPTCHA_VERIFY_URL = config('RECAPTCHA_VERIFY_URL', default='https://www.google.com/recaptcha/api/siteverify')
+# Délais (secondes) de connexion et de lecture vers le vérificateur
+RECAPTCHA_CONNECT_TIMEOUT = config('RECAPTCHA_CONNECT_TIMEOUT', default=2, cast=float)
+RECAPTCHA_READ_TIMEOUT = config('RECAPTCHA_READ_TIMEOUT', default=3, cast=float)
+RECAPTCHA_POOL_SIZE = config('RECAPTCHA_POOL_SIZE', default=10, cast=int)
+# Durée pendant laquelle un jeton déjà vérifié est refusé sans nouvel appel
+# (les jetons expirent après 2 minutes)
+RECAPTCHA_VERDICT_CACHE_TIMEOUT = config('RECAPTCHA_VERDICT_CACHE_TIMEOUT', default=120, cast=int)
+# Disjoncteur : échecs consécutifs avant suspension, puis durée de la suspension
+RECAPTCHA_BREAKER_THRESHOLD = config('RECAPTCHA_BREAKER_THRESHOLD', default=3, cast=int)
+RECAPTCHA_BREAKER_COOLDOWN = config('RECAPTCHA_BREAKER_COOLDOWN', default=30, cast=int)
+# Vérificateur indisponible : 'allow' accepte le message, 'deny' répond 503
+RECAPTCHA_FAILURE_POLICY = config('RECAPTCHA_FAILURE_POLICY', default='allow')
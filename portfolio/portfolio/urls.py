@@ -2,22 +2,21 @@
 URL configuration for portfolio_backend project.
 """
 from django.contrib import admin
-from django.contrib.sitemaps.views import sitemap
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
-from portfoapp.sitemaps import StaticViewSitemap, ProjectSitemap, ArticleSitemap
-
-sitemaps = {
-    'static': StaticViewSitemap,
-    'projects': ProjectSitemap,
-    'articles': ArticleSitemap,
-}
+from portfoapp.media import serve_media
+from portfoapp.metrics import metrics_view
+from portfoapp.sitemaps import sitemap_index, sitemap_section
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('portfolio/', include('portfoapp.urls')),
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    # Index des sitemaps, puis une page par section (?p= au-delà de SITEMAP_PAGE_SIZE URLs)
+    path('sitemap.xml', sitemap_index, name='sitemap-index'),
+    path('sitemap-<section>.xml', sitemap_section, name='django.contrib.sitemaps.views.sitemap'),
+    # Collecte Prometheus (METRICS_ENABLED, METRICS_TOKEN)
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Servir les fichiers statiques en développement
@@ -25,11 +24,8 @@ if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
 # Servir les fichiers média en développement ET en production
-# (nécessaire pour Render car les fichiers média sont stockés localement)
-from django.views.static import serve
-from django.urls import re_path
-
-# Servir les fichiers média même en production
+# (nécessaire pour Render car les fichiers média sont stockés localement) :
+# Range, ETag, cache immuable et délégation optionnelle au proxy
 urlpatterns += [
-    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
-]
\ No newline at end of file
+    re_path(r'^media/(?P<path>.*)$', serve_media, name='media'),
+]